@@ -1,14 +1,13 @@
-from langchain.llms import OpenAI
 from langchain.prompts import PromptTemplate
-from dotenv import load_dotenv
 import os
+import sys
 
-# 🔐 환경변수 불러오기
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.llm_client import get_llm
+from ai_core.streaming import stream_to_console
 
 # 🤖 LLM 설정
-llm = OpenAI(openai_api_key=api_key)
+llm = get_llm()
 
 # 📊 역할 프롬프트: 데이터 분석가로 행동
 prompt = PromptTemplate(
@@ -29,7 +28,7 @@ while True:
         print("분석가 AI 종료합니다 👋")
         break
     full_prompt = prompt.format(question=user_input)
-    response = llm(full_prompt)
-    print("📊 분석가 AI:", response)
+    print("📊 분석가 AI:", end=" ", flush=True)
+    response = stream_to_console(llm, full_prompt, label="analyst")  # 토큰 단위로 바로 출력
 
 #실행 명령어  python Chat_GPT_analyst.py
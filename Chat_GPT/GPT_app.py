@@ -1,13 +1,12 @@
-from langchain.llms import OpenAI
-from dotenv import load_dotenv
 import os
+import sys
 
-# 환경변수 불러오기
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.llm_client import get_llm
+from ai_core.streaming import stream_to_console
 
 # LLM 세팅
-llm = OpenAI(openai_api_key=api_key)
+llm = get_llm()
 
 # 사용자 입력
 while True:
@@ -15,8 +14,8 @@ while True:
     if user_input.lower() in ["exit", "quit"]:
         print("종료합니다.")
         break
-    response = llm(user_input)
-    print("AI 어시스턴트 ✨:", response)
+    print("AI 어시스턴트 ✨:", end=" ", flush=True)
+    response = stream_to_console(llm, user_input, label="app")  # 토큰 단위로 바로 출력
 
 ##########평상시의 CHAT GPT 와의 대화###########
 
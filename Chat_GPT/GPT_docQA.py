@@ -1,35 +1,45 @@
-from langchain.document_loaders import TextLoader
 from langchain.text_splitter import CharacterTextSplitter
-from langchain.vectorstores import FAISS
-from langchain.embeddings import OpenAIEmbeddings
 from langchain.chains import RetrievalQA
-from langchain.llms import OpenAI
-from dotenv import load_dotenv
 import os
+import sys
 
-# 🔐 API 키 불러오기
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.corpus import open_directory_corpus
+from ai_core.hashing import content_hash, file_hash
+from ai_core.index_store import load_or_build_index_from_file
+from ai_core.llm_client import get_embeddings, get_llm
 
 # 🧠 LLM + 임베딩 준비
-llm = OpenAI(openai_api_key=api_key)
-embedding = OpenAIEmbeddings(openai_api_key=api_key)
+llm = get_llm()
+embedding = get_embeddings()  # 청크 단위 임베딩 캐시
+answer_cache = AnswerCache(embedding)  # 반복 질문 답변 캐시
 
-# 📄 문서 불러오기
-loader = TextLoader("data/sample.txt", encoding='utf-8')
-documents = loader.load()
+# 📄 문서 경로: 파일이면 단일 문서, 폴더면 코퍼스 모드 (예: python Chat_GPT/GPT_docQA.py data/)
+doc_path = sys.argv[1] if len(sys.argv) > 1 else "data/sample.txt"
 
-# 📑 문서 분할
-text_splitter = CharacterTextSplitter(chunk_size=300, chunk_overlap=50)
-docs = text_splitter.split_documents(documents)
-
-# 🧠 문서 -> 벡터 저장소
-db = FAISS.from_documents(docs, embedding)
+if os.path.isdir(doc_path):
+    # 📚 폴더 전체를 하나의 인덱스로 (바뀐 파일만 추가/교체/삭제)
+    corpus = open_directory_corpus(
+        doc_path, embedding,
+        splitter_cls=CharacterTextSplitter, chunk_size=300, chunk_overlap=50,
+    )
+    print(f"📚 코퍼스 문서 {len(corpus.documents)}개 로드 완료")
+    retriever = corpus.as_retriever()
+    doc_fingerprint = content_hash(*sorted(entry["hash"] for entry in corpus.documents.values()))
+else:
+    # 📑 분할 + 🧠 벡터 저장소 (문서 해시 기준 디스크 캐시)
+    db = load_or_build_index_from_file(
+        doc_path, embedding,
+        splitter_cls=CharacterTextSplitter, chunk_size=300, chunk_overlap=50,
+    )
+    retriever = db.as_retriever()
+    doc_fingerprint = file_hash(doc_path)
 
 # 🔄 질의 응답 체인 구성
 qa = RetrievalQA.from_chain_type(
     llm=llm,
-    retriever=db.as_retriever()
+    retriever=retriever
 )
 
 # 💬 질문 루프
@@ -38,7 +48,7 @@ while True:
     if query.lower() in ["exit", "quit"]:
         print("문서 QA 종료합니다 👋")
         break
-    result = qa.run(query)
+    result = answer_cache.cached_call(lambda: qa.run(query), prompt=query, question=query, context=doc_fingerprint)
     print("📄 문서 기반 AI:", result)
 
 # 💡 답변부터 말하자면:
@@ -57,4 +67,4 @@ while True:
 
 # 문서에 거짓이 있다 → GPT도 거짓을 따라 말함 😅
 
-# 실행 명령어: python Chat_GPT_docQA.py 
\ No newline at end of file
+# 실행 명령어: python Chat_GPT_docQA.py  (폴더 코퍼스 모드: python Chat_GPT/GPT_docQA.py data/) 
\ No newline at end of file
@@ -1,28 +1,29 @@
-from langchain.document_loaders import TextLoader
 from langchain.text_splitter import CharacterTextSplitter
-from langchain.vectorstores import FAISS
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.llms import OpenAI
-from dotenv import load_dotenv
 import os
+import sys
 
-# 🔐 API 키
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.bm25 import HybridRetriever
+from ai_core.hashing import file_hash
+from ai_core.index_store import load_or_build_index_from_file
+from ai_core.llm_client import get_embeddings, get_llm
+from ai_core.streaming import stream_to_console
 
 # 모델 설정
-llm = OpenAI(openai_api_key=api_key)
-embedding = OpenAIEmbeddings(openai_api_key=api_key)
+llm = get_llm()
+embedding = get_embeddings()  # 청크 단위 임베딩 캐시
+answer_cache = AnswerCache(embedding)  # 반복 질문 답변 캐시
 
-# 문서 불러오기 및 분할
-loader = TextLoader("data/sample.txt", encoding='utf-8')
-documents = loader.load()
-text_splitter = CharacterTextSplitter(chunk_size=300, chunk_overlap=50)
-docs = text_splitter.split_documents(documents)
+# 📄 문서 불러오기 + 📑 분할 + 🧠 벡터 저장소 (문서 해시 기준 디스크 캐시)
+db = load_or_build_index_from_file(
+    "data/sample.txt", embedding,
+    splitter_cls=CharacterTextSplitter, chunk_size=300, chunk_overlap=50,
+)
 
-# 벡터 저장소
-db = FAISS.from_documents(docs, embedding)
-retriever = db.as_retriever()
+# 🔎 하이브리드 검색: FAISS 유사도 + BM25(한글 글자 n-gram / SKU 코드) 결과를 RRF 로 결합
+retriever = HybridRetriever(db, k=4)
+doc_fingerprint = file_hash("data/sample.txt")
 
 # 💬 질의 루프
 while True:
@@ -31,7 +32,7 @@ while True:
         print("AI 종료합니다 👋")
         break
 
-    # 1. 문서에서 관련 정보 찾기
+    # 1. 문서에서 관련 정보 찾기 (벡터 + 키워드)
     docs = retriever.get_relevant_documents(query)
 
     # 2. 관련 문서 내용 추출 (없으면 빈 문자열)
@@ -51,8 +52,12 @@ while True:
     [답변]
     """
 
-    # 4. GPT에 전달
-    answer = llm(prompt)
-    print("🧠 하이브리드 AI:", answer)
+    # 4. GPT에 전달 (토큰 단위로 바로 출력, 같은/유사한 질문은 캐시에서 바로 반환)
+    print("🧠 하이브리드 AI:", end=" ", flush=True)
+    answer = answer_cache.cached_call(
+        lambda: stream_to_console(llm, prompt, label="hybridQA"), prompt=prompt, question=query, context=doc_fingerprint
+    )
+    if answer_cache.last_hit:
+        print(answer)
 
 #실행 명령어 : python Chat_GPT_hybridQA.py
\ No newline at end of file
@@ -1,12 +1,15 @@
 import streamlit as st
-from langchain.llms import OpenAI
-from dotenv import load_dotenv
 import os
+import sys
 
-# 환경 변수 불러오기
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-llm = OpenAI(openai_api_key=api_key)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.llm_client import get_embeddings, get_llm
+from ai_core.streaming import write_stream
+
+# 🤖 LLM 설정
+llm = get_llm()
+answer_cache = AnswerCache(get_embeddings())  # 반복 질문 답변 캐시
 
 # 웹 UI 설정
 st.set_page_config(page_title="성주의 GPT 챗봇", page_icon="🤖")
@@ -19,10 +22,11 @@ user_input = st.text_input("질문을 입력하세요 🤔")
 # 버튼을 눌렀을 때만 실행
 if st.button("질문하기"):
     if user_input:
-        with st.spinner("생각 중...🧠"):
-            response = llm(user_input)
         st.success("✨ GPT의 답변:")
-        st.write(response)
+        # 토큰이 도착하는 대로 출력 (같은/유사한 질문은 캐시에서 바로 출력)
+        response, timing = write_stream(llm, user_input, label="webQa", answer_cache=answer_cache, question=user_input)
+        st.caption(timing.describe())
+        st.caption(answer_cache.describe_last())
     else:
         st.warning("질문을 입력해 주세요!")
 
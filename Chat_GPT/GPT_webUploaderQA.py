@@ -1,45 +1,61 @@
 import streamlit as st
-from dotenv import load_dotenv
 import os
+import sys
 
-from langchain.document_loaders import TextLoader
 from langchain.text_splitter import CharacterTextSplitter
-from langchain.vectorstores import FAISS
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.llms import OpenAI
 
-import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.corpus import CorpusIndex
+from ai_core.hashing import content_hash
+from ai_core.index_store import STREAMING_THRESHOLD_BYTES, load_or_build_index, load_or_build_streaming_index
+from ai_core.llm_client import get_embeddings, get_llm
+from ai_core.streaming import write_stream
 
-# 🔐 API Key
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-
-llm = OpenAI(openai_api_key=api_key)
-embedding = OpenAIEmbeddings(openai_api_key=api_key)
+llm = get_llm()
+embedding = get_embeddings()  # 청크 단위 임베딩 캐시
+answer_cache = AnswerCache(embedding)  # 반복 질문 답변 캐시
 
 # 🌐 웹 UI
 st.set_page_config(page_title="📎 업로드 문서 GPT", page_icon="📄")
 st.title("📎 성주의 업로드 문서 GPT 챗봇")
 st.markdown("파일을 업로드하고 질문하면, GPT가 문서 내용 기반으로 대답해줍니다!")
 
-# 📁 파일 업로드
-uploaded_file = st.file_uploader("문서를 업로드하세요 (.txt)", type=["txt"])
-
-if uploaded_file is not None:
-    # 📄 임시 파일로 저장
-    with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-        tmp_file.write(uploaded_file.read())
-        tmp_file_path = tmp_file.name
-
-    # 📑 문서 로딩 & 분할
-    loader = TextLoader(tmp_file_path, encoding='utf-8')
-    documents = loader.load()
-    text_splitter = CharacterTextSplitter(chunk_size=300, chunk_overlap=50)
-    docs = text_splitter.split_documents(documents)
-
-    # 🧠 벡터 임베딩
-    db = FAISS.from_documents(docs, embedding)
-    retriever = db.as_retriever()
+# 📁 파일 업로드 (여러 개 가능)
+uploaded_files = st.file_uploader("문서를 업로드하세요 (.txt, 여러 개 가능)", type=["txt"], accept_multiple_files=True)
+
+if uploaded_files:
+    if len(uploaded_files) == 1:
+        # 📑 문서 분할 & 🧠 벡터 임베딩 (같은 문서는 디스크 캐시에서 바로 로드)
+        uploaded_file = uploaded_files[0]
+        if uploaded_file.size > STREAMING_THRESHOLD_BYTES:
+            # 🌊 대용량 문서: 블록 단위 스트리밍 분할 → 배치 임베딩 (메모리 사용량 일정)
+            db = load_or_build_streaming_index(
+                uploaded_file, embedding, chunk_size=300, chunk_overlap=50, name=uploaded_file.name,
+            )
+        else:
+            db = load_or_build_index(
+                uploaded_file.getvalue(), embedding,
+                splitter_cls=CharacterTextSplitter, chunk_size=300, chunk_overlap=50,
+                source=uploaded_file.name,
+            )
+        retriever = db.as_retriever()
+    else:
+        # 📚 코퍼스 모드: 새로 올린/바뀐 문서만 추가하고, 빠진 문서는 인덱스에서 삭제
+        if "corpus" not in st.session_state:
+            st.session_state.corpus = CorpusIndex(embedding, splitter_cls=CharacterTextSplitter, chunk_size=300, chunk_overlap=50)
+        corpus = st.session_state.corpus
+        changes = corpus.sync((f.name, f.getvalue()) for f in uploaded_files)
+        st.caption(
+            f"📚 코퍼스 문서 {len(corpus.documents)}개 "
+            f"(추가 {len(changes['added'])} / 교체 {len(changes['replaced'])} / 삭제 {len(changes['deleted'])})"
+        )
+        retriever = corpus.as_retriever()
+    stats = embedding.stats()
+    st.caption(f"🧩 임베딩 캐시: 적중 {stats['hits']} / 신규 {stats['misses']} (저장 {stats['entries']}개)")
+
+    # 🔑 업로드 문서 지문 (같은 문서에 대한 유사 질문만 답변 재사용)
+    doc_fingerprint = content_hash(*(f.getvalue() for f in uploaded_files))
 
     # 💬 사용자 질문
     query = st.text_input("문서 기반 질문을 입력하세요 📎")
@@ -64,9 +80,13 @@ if uploaded_file is not None:
                 [답변]
                 """
 
-                response = llm(prompt)
             st.success("✅ GPT의 답변:")
-            st.write(response)
+            # 토큰이 도착하는 대로 출력 (같은/유사한 질문은 캐시에서 바로 출력)
+            response, timing = write_stream(
+                llm, prompt, label="webUploaderQA", answer_cache=answer_cache, question=query, context=doc_fingerprint
+            )
+            st.caption(timing.describe())
+            st.caption(answer_cache.describe_last())
         else:
             st.warning("질문을 입력해 주세요!")
 else:
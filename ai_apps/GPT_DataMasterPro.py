@@ -1,27 +1,28 @@
 # 📊 GPT_DataMasterPro.py - GPT 기반 엑셀 통합 분석 시스템 (EDA + 시각화 + 질문 분석)
 
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import sys
+import matplotlib
 import streamlit as st
-from dotenv import load_dotenv
 from datetime import datetime
 from io import BytesIO
-from langchain.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
-from langchain_experimental.agents import create_pandas_dataframe_agent
 
-# 🌱 환경변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.agent_pool import get_pandas_agent
+from ai_core.charts import render_chart, render_heatmap
+from ai_core.ingest import source_hash
+from ai_core.llm_client import get_chat_model
+from ai_core.profile import load_for_eda
+from ai_core.query_planner import answer_question
+from ai_core.streaming import write_stream
 
 # ✅ GPT 연결
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.2, model_name="gpt-3.5-turbo")
+llm = get_chat_model()
 
 # 🎨 한글 깨짐 방지 설정
-plt.rcParams["font.family"] = "Malgun Gothic"  # Windows용
-plt.rcParams["axes.unicode_minus"] = False
+matplotlib.rcParams["font.family"] = "Malgun Gothic"  # Windows용
+matplotlib.rcParams["axes.unicode_minus"] = False
 
 # 🌐 Streamlit 앱 기본 설정
 st.set_page_config(page_title="GPT 데이터마스터 PRO", page_icon="🧠")
@@ -32,7 +33,9 @@ st.markdown("엑셀 파일을 업로드하면 자동 분석 + 질문 기반 인
 uploaded_file = st.file_uploader("📤 엑셀 파일 업로드", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df, profile = load_for_eda(uploaded_file)  # 📊 통계/상관행렬은 업로드당 한 번만 (큰 파일은 청크 스트리밍 + 표본 행)
+    if profile.approximate:
+        st.caption(profile.note)
 
     st.subheader("📋 데이터 미리보기")
     st.dataframe(df.head())
@@ -44,27 +47,16 @@ if uploaded_file:
 
     if st.button("📈 분석 및 보고서 생성"):
         # ✅ 시각화
-        fig, ax = plt.subplots()
-        if chart_type == "바 차트":
-            sns.barplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "선 차트":
-            sns.lineplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "원형 차트":
-            grouped = df.groupby(x_col)[y_col].sum()
-            ax.pie(grouped, labels=grouped.index, autopct="%1.1f%%")
-            ax.set_ylabel("")
-        st.pyplot(fig)
+        st.image(render_chart(df, source_hash(uploaded_file), chart_type, x=x_col, y=y_col))  # 같은 선택이면 캐시된 그림
 
         # ✅ 일변량 EDA
         st.subheader("📊 일변량 EDA")
-        st.dataframe(df.describe(include="all"))
+        st.dataframe(profile.annotate(profile.describe))
 
         # ✅ 다변량 EDA
         st.subheader("🔗 다변량 EDA (상관관계 히트맵)")
-        corr = df.corr(numeric_only=True)
-        fig_corr, ax_corr = plt.subplots()
-        sns.heatmap(corr, annot=True, cmap="Blues", ax=ax_corr)
-        st.pyplot(fig_corr)
+        corr = profile.corr
+        st.image(render_heatmap(corr, source_hash(uploaded_file) + ":corr", annot=True, cmap="Blues"))
 
         # ✅ GPT 인사이트 요약
         prompt = PromptTemplate(
@@ -79,14 +71,19 @@ if uploaded_file:
             이 정보를 바탕으로 유의미한 인사이트를 핵심만 간결하게 요약해줘.
             """
         ).format(x=x_col, y=y_col, type=chart_type)
-        explanation = llm.predict(prompt)
+        # 토큰 단위로 화면에 먼저 보여주고, 같은 내용을 보고서에 저장
+        st.markdown("🧠 **시각화 인사이트**")
+        explanation, timing = write_stream(llm, prompt, label="DataMasterPro:chart")
+        st.caption(timing.describe())
 
         # ✅ 상관관계 해석
         corr_prompt = f"""
-        다음은 데이터의 상관관계 행렬이야:\n{corr.to_string()}\n
+        다음은 데이터의 상관관계 행렬이야:\n{profile.corr_text}\n
         어떤 변수 간 관계가 강하거나 약한지 핵심 인사이트만 짧게 요약해줘.
         """
-        gpt_corr_summary = llm.predict(corr_prompt)
+        st.markdown("🔗 **상관관계 인사이트**")
+        gpt_corr_summary, timing = write_stream(llm, corr_prompt, label="DataMasterPro:corr")
+        st.caption(timing.describe())
 
         # ✅ 보고서 저장
         now = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -116,14 +113,22 @@ Y축: {y_col}
     question = st.text_input("궁금한 점을 질문하세요 (예: 가장 높은 매출 지역은?)")
 
     if st.button("🔍 GPT에게 분석 요청"):
-        agent = create_pandas_dataframe_agent(
-            llm, df,
-            verbose=False,
-            agent_type="openai-tools",
-            handle_parsing_errors=True,
-            allow_dangerous_code=True
-        )
-        answer = agent.run(question)
-        st.info(answer)
+        def run_agent():
+            # 🤖 같은 데이터의 에이전트는 풀에서 재사용 (클릭마다 새로 만들지 않음)
+            agent = get_pandas_agent(
+                df, source_hash(uploaded_file), llm,
+                verbose=False,
+                agent_type="openai-tools",
+                handle_parsing_errors=True,
+                allow_dangerous_code=True
+            )
+            return agent.run(question)
+
+        # ⚡ 합계/평균/그룹별 같은 집계 질문은 pandas 로 바로 계산하고, 나머지만 에이전트로
+        result = answer_question(df, question, fallback=run_agent, profile=profile)
+        st.info(result.text)
+        if result.table is not None:
+            st.dataframe(result.table)
+        st.caption(result.describe())
 
 # 실행 명령어 : streamlit run GPT_DataMasterPro.py
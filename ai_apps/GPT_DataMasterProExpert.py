@@ -4,19 +4,18 @@
 # - 프로젝트 발표자료 자동 생성기
 
 import os
+import sys
 import streamlit as st
-from dotenv import load_dotenv
-from langchain.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from datetime import datetime
 from io import BytesIO
 
-# 🌱 환경변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.llm_client import get_chat_model
+from ai_core.streaming import write_stream
 
 # 🤖 GPT 연결
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.3, model_name="gpt-3.5-turbo")
+llm = get_chat_model("report")
 
 # 🌐 Streamlit UI
 st.set_page_config(page_title="📊 발표자료 생성기", page_icon="🖼️")
@@ -48,11 +47,13 @@ if st.button("📑 발표자료 생성"):
 """
         ).format(title=project_title, goal=objective, stack=tech_stack, highlight=highlight)
 
-        slides = llm.predict(slide_prompt)
-
         st.subheader("📋 발표자료 요약 결과")
         st.markdown("슬라이드 형식 요약:")
-        st.code(slides)
+        # 생성되는 동안 토큰 단위로 보여주고, 완료되면 복사하기 쉬운 코드 블록으로 교체
+        slide_box = st.empty()
+        slides, timing = write_stream(llm, slide_prompt, label="DataMasterProExpert", container=slide_box)
+        slide_box.code(slides)
+        st.caption(timing.describe())
 
         # 📩 저장 기능
         now = datetime.now().strftime("%Y%m%d_%H%M%S")
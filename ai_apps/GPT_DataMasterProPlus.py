@@ -1,28 +1,26 @@
 # 📊 GPT_DataMasterProPlus.py - 바탕체 기반 GPT 통합 분석 시스템
 
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import sys
+import matplotlib
 import streamlit as st
-from dotenv import load_dotenv
-from datetime import datetime
 from io import BytesIO
-from fpdf import FPDF
-from langchain.chat_models import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain_experimental.agents import create_pandas_dataframe_agent
 
-# 🌱 환경변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.agent_pool import get_pandas_agent
+from ai_core.charts import render_chart, render_heatmap
+from ai_core.ingest import source_hash
+from ai_core.job_queue import job_key, show_job, submit_job
+from ai_core.llm_client import get_chat_model
+from ai_core.profile import load_for_eda
+from ai_core.query_planner import answer_question
 
 # ✅ GPT 연결
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.2, model_name="gpt-3.5-turbo")
+llm = get_chat_model()
 
 # 🎨 한글 깨짐 방지 설정 (Matplotlib)
-plt.rcParams["font.family"] = "Malgun Gothic"
-plt.rcParams["axes.unicode_minus"] = False
+matplotlib.rcParams["font.family"] = "Malgun Gothic"
+matplotlib.rcParams["axes.unicode_minus"] = False
 
 # 🌐 Streamlit 앱 설정
 st.set_page_config(page_title="GPT 데이터마스터 PRO", page_icon="🤖")
@@ -33,7 +31,9 @@ st.markdown("엑셀 파일을 업로드하면 자동 EDA, GPT 분석, PDF 저장
 uploaded_file = st.file_uploader("📤 엑셀 파일 업로드", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df, profile = load_for_eda(uploaded_file)  # 📊 통계/상관행렬은 업로드당 한 번만 (큰 파일은 청크 스트리밍 + 표본 행)
+    if profile.approximate:
+        st.caption(profile.note)
     st.subheader("📋 데이터 미리보기")
     st.dataframe(df.head())
 
@@ -41,74 +41,47 @@ if uploaded_file:
     x_col = st.selectbox("🔠 X축 컬럼", df.columns)
     y_col = st.selectbox("🔢 Y축 컬럼", df.columns)
 
+    # 📬 인사이트 / PDF 는 백그라운드 작업으로 (화면이 멈추지 않고, 재실행해도 진행 상황 / 결과가 유지됨)
+    params = {
+        "data_key": source_hash(uploaded_file), "chart_type": chart_type, "x": x_col, "y": y_col,
+        "corr_text": profile.corr_text,
+    }
     if st.button("📈 분석 및 PDF 저장"):
+        st.session_state.report_job = submit_job("insight_pdf", params)
+
+    if st.session_state.get("report_job") == job_key("insight_pdf", params):
         # ✅ 시각화
-        fig, ax = plt.subplots()
-        if chart_type == "바 차트":
-            sns.barplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "선 차트":
-            sns.lineplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "원형 차트":
-            grouped = df.groupby(x_col)[y_col].sum()
-            ax.pie(grouped, labels=grouped.index, autopct="%1.1f%%")
-            ax.set_ylabel("")
-        st.pyplot(fig)
+        st.image(render_chart(df, source_hash(uploaded_file), chart_type, x=x_col, y=y_col))  # 같은 선택이면 캐시된 그림
 
         # ✅ 일변량 EDA
         st.subheader("📊 일변량 EDA")
-        st.dataframe(df.describe(include="all"))
+        st.dataframe(profile.annotate(profile.describe))
 
         # ✅ 다변량 EDA
         st.subheader("🔗 다변량 EDA (상관관계 히트맵)")
-        corr = df.corr(numeric_only=True)
-        fig_corr, ax_corr = plt.subplots()
-        sns.heatmap(corr, annot=True, cmap="Blues", ax=ax_corr)
-        st.pyplot(fig_corr)
-
-        # ✅ GPT 해석
-        summary_prompt = PromptTemplate(
-            input_variables=["x", "y", "type"],
-            template="""
-            너는 데이터 분석가야. 아래는 사용자 선택 정보야:
-            - 차트 종류: {type}
-            - X축: {x}
-            - Y축: {y}
-            이 정보를 바탕으로 의미 있는 인사이트를 간결하게 설명해줘.
-            """
-        ).format(x=x_col, y=y_col, type=chart_type)
-        chart_summary = llm.predict(summary_prompt)
-
-        corr_summary = llm.predict(
-            f"다음은 데이터의 상관관계 행렬이야:\n{corr.to_string()}\n요약해서 설명해줘."
-        )
-
-        # ✅ PDF 저장
-        now = datetime.now().strftime("%Y%m%d_%H%M%S")
-        pdf_path = f"GPT_Report_{now}.pdf"
+        corr = profile.corr
+        st.image(render_heatmap(corr, source_hash(uploaded_file) + ":corr", annot=True, cmap="Blues"))
 
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.add_font("batang", fname="./csv_app/fonts/batang.ttc", uni=True)
-        pdf.set_font("batang", size=12)
-
-        pdf.multi_cell(0, 10, f"[GPT 자동 보고서 생성 시간: {now}]\n\n")
-        pdf.multi_cell(0, 10, f"[시각화 정보]\n차트 유형: {chart_type}\nX축: {x_col}\nY축: {y_col}\n")
-        pdf.multi_cell(0, 10, f"[시각화 인사이트]\n{chart_summary}\n")
-        pdf.multi_cell(0, 10, f"[상관관계 인사이트]\n{corr_summary}\n")
-
-        pdf.output(pdf_path)
-        st.success("📄 PDF 보고서 저장 완료!")
-        with open(pdf_path, "rb") as f:
-            st.download_button("📥 PDF 다운로드", data=f, file_name=pdf_path)
+        # ✅ GPT 인사이트 + PDF (작업 진행률 → 끝나면 결과 / 다운로드)
+        st.subheader("🧠 GPT 인사이트")
+        show_job(st.session_state.report_job)
 
     # ✅ 사용자 질문 기반 분석
     st.subheader("💬 질문 기반 분석")
     question = st.text_input("GPT에게 분석 질문을 해보세요:")
 
     if st.button("🔍 GPT 분석 실행"):
-        agent = create_pandas_dataframe_agent(llm, df, verbose=False, allow_dangerous_code=True)
-        answer = agent.run(question)
-        st.info(answer)
+        # ⚡ 합계/평균/그룹별 같은 집계 질문은 pandas 로 바로 계산하고, 나머지만 에이전트로
+        result = answer_question(
+            df, question, profile=profile,
+            fallback=lambda: get_pandas_agent(  # 🤖 같은 데이터의 에이전트는 풀에서 재사용
+                df, source_hash(uploaded_file), llm, verbose=False, allow_dangerous_code=True
+            ).run(question),
+        )
+        st.info(result.text)
+        if result.table is not None:
+            st.dataframe(result.table)
+        st.caption(result.describe())
 
 # ✅ 실행 명령어
 # streamlit run GPT_DataMasterProPlus.py
@@ -1,58 +1,79 @@
 # 📚 GPT_DocChatRAG.py: GPT 기반 문서 분석 및 질의응답 시스템 (RAG)
 
 import os
+import sys
 import streamlit as st
-from langchain.chat_models import ChatOpenAI
-from langchain.document_loaders import TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.vectorstores import FAISS
 from langchain.chains import RetrievalQA
-from dotenv import load_dotenv
 
-# 🌱 환경 변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.corpus import CorpusIndex
+from ai_core.hashing import content_hash
+from ai_core.index_store import STREAMING_THRESHOLD_BYTES, load_or_build_index, load_or_build_streaming_index
+from ai_core.llm_client import get_chat_model, get_embeddings
 
 # 🚀 GPT 모델 로드
-gpt_model = ChatOpenAI(openai_api_key=api_key, temperature=0.2, model_name="gpt-3.5-turbo")
+gpt_model = get_chat_model()
+embeddings = get_embeddings()  # 청크 단위 임베딩 캐시
+answer_cache = AnswerCache(embeddings)  # 반복 질문 답변 캐시
 
 # 🌐 Streamlit 앱 설정
 st.set_page_config(page_title="📖 GPT 문서 분석 시스템", page_icon="📚")
 st.title("📖 GPT 문서 분석 시스템")
 st.markdown("업로드된 문서를 분석하여 GPT 기반의 정확한 답변을 제공합니다.")
 
-# 📂 파일 업로드 (TXT)
-uploaded_file = st.file_uploader("📤 분석할 문서 파일을 업로드하세요", type=["txt"])
+# 📂 파일 업로드 (TXT, 여러 개 가능)
+uploaded_files = st.file_uploader("📤 분석할 문서 파일을 업로드하세요", type=["txt"], accept_multiple_files=True)
 
-if uploaded_file:
-    # 업로드된 파일을 임시로 저장
-    temp_file_path = "temp_doc.txt"
-    with open(temp_file_path, "wb") as f:
-        f.write(uploaded_file.getvalue())
-
-    # 📄 문서 로드 (경로 문제 해결)
-    loader = TextLoader(temp_file_path, encoding='utf-8')
-    docs = loader.load()
-
-    # 📑 문서 분할
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    split_docs = text_splitter.split_documents(docs)
+if uploaded_files:
+    if len(uploaded_files) == 1:
+        # 🔍 벡터DB 생성 (문서 해시 기준 캐시 → 같은 문서는 재임베딩 없이 로드)
+        uploaded_file = uploaded_files[0]
+        if uploaded_file.size > STREAMING_THRESHOLD_BYTES:
+            # 🌊 대용량 문서: 블록 단위 스트리밍 분할 → 배치 임베딩 (메모리 사용량 일정)
+            db = load_or_build_streaming_index(
+                uploaded_file, embeddings, chunk_size=500, chunk_overlap=50, name=uploaded_file.name,
+            )
+        else:
+            db = load_or_build_index(
+                uploaded_file.getvalue(), embeddings,
+                splitter_cls=RecursiveCharacterTextSplitter, chunk_size=500, chunk_overlap=50,
+                source=uploaded_file.name,
+            )
+        retriever = db.as_retriever()
+    else:
+        # 📚 코퍼스 모드: 새로 올린/바뀐 문서만 추가하고, 빠진 문서는 인덱스에서 삭제
+        if "corpus" not in st.session_state:
+            st.session_state.corpus = CorpusIndex(
+                embeddings, splitter_cls=RecursiveCharacterTextSplitter, chunk_size=500, chunk_overlap=50
+            )
+        corpus = st.session_state.corpus
+        changes = corpus.sync((f.name, f.getvalue()) for f in uploaded_files)
+        st.caption(
+            f"📚 코퍼스 문서 {len(corpus.documents)}개 "
+            f"(추가 {len(changes['added'])} / 교체 {len(changes['replaced'])} / 삭제 {len(changes['deleted'])})"
+        )
+        retriever = corpus.as_retriever()
+    stats = embeddings.stats()
+    st.caption(f"🧩 임베딩 캐시: 적중 {stats['hits']} / 신규 {stats['misses']} (저장 {stats['entries']}개)")
 
-    # 🔍 벡터DB 생성
-    embeddings = OpenAIEmbeddings(openai_api_key=api_key)
-    db = FAISS.from_documents(split_docs, embeddings)
+    # 🔑 업로드 문서 지문 (같은 문서에 대한 같은/유사 질문은 캐시된 답변 사용)
+    doc_fingerprint = content_hash(*(f.getvalue() for f in uploaded_files))
 
     # 🗨️ 질의응답 체인 생성
-    qa = RetrievalQA.from_chain_type(llm=gpt_model, chain_type="stuff", retriever=db.as_retriever())
+    qa = RetrievalQA.from_chain_type(llm=gpt_model, chain_type="stuff", retriever=retriever)
 
     # 📌 사용자 질문 입력
     question = st.text_input("🔎 문서에 관해 궁금한 점을 입력하세요")
 
     if st.button("🧠 GPT 분석"):
         if question:
-            response = qa.run(question)
+            response = answer_cache.cached_call(
+                lambda: qa.run(question), prompt=question, question=question, context=doc_fingerprint
+            )
             st.success(response)
+            st.caption(answer_cache.describe_last())
         else:
             st.error("질문을 입력해주세요!")
 
@@ -2,18 +2,17 @@
 # 엑셀 업로드 → 질문 입력 → GPT 분석 → 분석 결과 저장까지 가능한 고급 시스템입니다.
 
 import os
-import pandas as pd
+import sys
 import streamlit as st
-from dotenv import load_dotenv
-from langchain.chat_models import ChatOpenAI
-from langchain_experimental.agents.agent_toolkits.pandas.base import create_pandas_dataframe_agent
 
-# 🌱 환경 변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.agent_pool import get_pandas_agent
+from ai_core.ingest import load_excel, source_hash
+from ai_core.llm_client import get_chat_model
+from ai_core.query_planner import answer_question
 
 # 🤖 LLM 설정
-llm = ChatOpenAI(openai_api_key=api_key, model_name="gpt-3.5-turbo", temperature=0)
+llm = get_chat_model("agent")
 
 # 🖥️ Streamlit 앱 설정
 st.set_page_config(page_title="📌 GPT 엑셀 인사이트 저장기", page_icon="📌")
@@ -24,7 +23,7 @@ st.markdown("엑셀 데이터를 분석하고 궁금한 점을 질문해보세
 uploaded_file = st.file_uploader("📁 엑셀 파일을 업로드하세요", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df = load_excel(uploaded_file)
     st.subheader("📄 데이터 미리보기")
     st.dataframe(df.head())
 
@@ -32,21 +31,23 @@ if uploaded_file:
     question = st.text_input("❓ 궁금한 점을 질문해보세요")
 
     if st.button("🔍 분석 및 인사이트 저장"):
-        # 🧠 LangChain Agent 생성
-        agent = create_pandas_dataframe_agent(llm, df, verbose=True)
-        response = agent.run(question)
+        # 🧠 집계 질문은 pandas 로 바로 계산, 나머지는 LangChain Agent
+        result = answer_question(
+            df, question,
+            fallback=lambda: get_pandas_agent(df, source_hash(uploaded_file), llm, verbose=True).run(question),
+        )
+        response = result.text
 
-        # 📎 인사이트 저장
-        insight_filename = "GPT_Insight_Result.txt"
-        with open(insight_filename, "a", encoding="utf-8") as f:
-            f.write(f"[질문]\n{question}\n[GPT 응답]\n{response}\n\n")
+        # 📎 인사이트 저장 (세션별로 메모리에 누적 → 작업 디렉터리 공용 파일을 다른 사용자와 섞어 쓰지 않음)
+        insights = st.session_state.setdefault("insights", [])
+        insights.append(f"[질문]\n{question}\n[GPT 응답]\n{response}\n\n")
 
         st.success("✅ GPT 분석 및 인사이트 저장 완료!")
         st.markdown("🧠 **GPT 응답 결과:**")
         st.info(response)
+        st.caption(result.describe())
 
-        with open(insight_filename, "rb") as f:
-            st.download_button("📥 인사이트 다운로드", f, file_name=insight_filename)
+        st.download_button("📥 인사이트 다운로드", "".join(insights).encode("utf-8"), file_name="GPT_Insight_Result.txt")
 
 # ✅ 실행 명령어 (터미널에 입력)
 # streamlit run GPT_excelInsightSaver.py
@@ -0,0 +1,4 @@
+# 📦 ai_core - 여러 GPT 앱(Chat_GPT / ai_apps / csv_app)이 함께 쓰는 공용 모듈 모음
+#
+# 앱 스크립트는 `streamlit run ai_apps/...` 처럼 저장소 루트에서 실행하며,
+# 스크립트 상단에서 저장소 루트를 sys.path 에 추가한 뒤 `from ai_core.xxx import ...` 로 사용합니다.
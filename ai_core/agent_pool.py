@@ -0,0 +1,121 @@
+# 🤖 ai_core/agent_pool.py - pandas 에이전트 재사용 풀
+#
+# "GPT 분석 실행" 을 누를 때마다 create_pandas_dataframe_agent(llm, df, ...) 를 새로 만들면
+# df.head() 를 시스템 프롬프트로 다시 직렬화하고 도구 체인도 다시 초기화합니다.
+# 여기서는 (데이터 내용 해시, 모델 설정, 에이전트 옵션) 별로 한 번 만든 에이전트를 프로세스 안에서
+# 세션과 상관없이 재사용합니다. 같은 데이터면 시스템 프롬프트(앞부분)가 매번 글자 그대로 같으므로
+# OpenAI 쪽 프롬프트 캐시도 두 번째 질문부터 적용됩니다.
+#
+# 에이전트가 만든 코드는 ai_core.sandbox 작업자 프로세스에서 실행됩니다 (AI_AGENT_SANDBOX=0 이면 앱 프로세스 안에서).
+#
+# 질문마다 걸린 시간은 .cache/metrics/agent_latency.jsonl 에 남고,
+# python -m ai_core.agent_pool 로 새로 만든 경우 / 재사용한 경우의 p50 을 비교할 수 있습니다.
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+from ai_core.paths import cache_path
+from ai_core.sandbox import sandboxed_tools
+
+POOL_SIZE = int(os.getenv("AI_AGENT_POOL_SIZE", "8"))
+USE_SANDBOX = os.getenv("AI_AGENT_SANDBOX", "1") != "0"
+LATENCY_LOG = os.path.join(cache_path("metrics"), "agent_latency.jsonl")
+
+_pool = OrderedDict()  # key -> PooledAgent
+_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+class PooledAgent:
+    """풀에 보관되는 에이전트 한 개. 같은 에이전트의 python 도구 상태(locals)를 공유하므로 실행은 한 번에 하나씩."""
+
+    def __init__(self, agent, key, build_time=0.0):
+        self.agent = agent
+        self.key = key
+        self.build_time = build_time  # 첫 질문 시간에 포함 (매번 새로 만들던 때의 비용과 비교하기 위해)
+        self.runs = 0
+        self._run_lock = threading.Lock()
+
+    def run(self, question):
+        with self._run_lock:
+            reused = self.runs > 0
+            started = time.perf_counter()
+            try:
+                return self.agent.run(question)
+            finally:
+                self.runs += 1
+                latency = time.perf_counter() - started
+                _record(self.key, reused, latency if reused else latency + self.build_time)
+
+
+def _model_key(llm):
+    # 같은 모델 / 온도면 같은 에이전트 (ChatOpenAI 는 model_name, 일부 버전은 model)
+    return (
+        type(llm).__name__,
+        getattr(llm, "model_name", None) or getattr(llm, "model", None),
+        getattr(llm, "temperature", None),
+    )
+
+
+def _record(key, reused, latency):
+    entry = {"time": time.time(), "data": key[0][:12], "reused": reused, "latency": latency}
+    with _log_lock, open(LATENCY_LOG, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def get_pandas_agent(df, data_key, llm, **options):
+    """create_pandas_dataframe_agent(llm, df, **options) 를 (data_key, 모델, options) 별로 한 번만 만듭니다.
+
+    data_key 는 업로드 내용 해시(source_hash 등) 처럼 데이터가 같으면 같은 값이어야 합니다.
+    """
+    from langchain_experimental.agents import create_pandas_dataframe_agent
+
+    key = (data_key, _model_key(llm), repr(sorted(options.items())))
+    with _lock:
+        pooled = _pool.get(key)
+        if pooled is not None:
+            _pool.move_to_end(key)
+            return pooled
+    # 얕은 복사: 생성된 코드가 df[...] = ... 로 열을 바꿔도 앱 쪽 DataFrame 은 그대로
+    started = time.perf_counter()
+    agent = create_pandas_dataframe_agent(llm, df.copy(deep=False), **options)
+    if USE_SANDBOX:
+        # 🧱 python 도구 실행을 작업자 프로세스로 (CPU / 메모리 / 시간 한도)
+        agent.tools = sandboxed_tools(agent.tools, df, data_key)
+    pooled = PooledAgent(agent, key, time.perf_counter() - started)
+    with _lock:
+        pooled = _pool.setdefault(key, pooled)
+        _pool.move_to_end(key)
+        while len(_pool) > POOL_SIZE:
+            _pool.popitem(last=False)
+    return pooled
+
+
+def clear_pool():
+    with _lock:
+        _pool.clear()
+
+
+def _p50(values):
+    values = sorted(values)
+    return values[len(values) // 2] if values else None
+
+
+def latency_summary(limit=500):
+    """최근 limit 건: 새로 만든 에이전트 첫 질문 vs 재사용 에이전트 질문의 건수 / p50 (초)."""
+    if not os.path.exists(LATENCY_LOG):
+        return {"first": {"count": 0}, "reused": {"count": 0}}
+    with open(LATENCY_LOG, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in deque(f, maxlen=limit) if line.strip()]
+    summary = {}
+    for name, reused in (("first", False), ("reused", True)):
+        latencies = [e["latency"] for e in entries if e["reused"] is reused]
+        summary[name] = {"count": len(latencies), "p50": _p50(latencies)}
+    return summary
+
+
+if __name__ == "__main__":
+    print(latency_summary())
@@ -0,0 +1,217 @@
+# 💬 ai_core/answer_cache.py - 반복 질문용 답변 캐시 (정확 일치 + 의미 유사도)
+#
+# "가장 많이 팔린 제품은?" 처럼 거의 같은 질문이 하루 종일 들어오므로 LLM 호출 앞에 캐시를 둡니다.
+#   1차: (context 지문, 정규화한 프롬프트) 해시가 같으면 그대로 반환
+#   2차: 같은 데이터/문서(context 지문)에서 핵심어(조사 / "알려줘" 같은 군말을 뗀 단어와 숫자)가 순서까지 같은
+#        질문 중 임베딩 코사인 유사도가 threshold(기본 0.98) 이상이면 반환
+#        (ada-002 는 "서울 평균 매출" / "부산 합계 매출" 처럼 핵심어만 다른 질문도 0.95 이상이 나오므로
+#         유사도만으로는 다른 질문의 답을 돌려주게 됨 → 핵심어가 같은 후보만 SQL 로 골라 numpy 로 한 번에 비교)
+# 항목은 TTL 이 지나면 무시·삭제되고, max_entries 를 넘으면 오래 안 쓴 것부터 지웁니다.
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+from ai_core.hashing import content_hash
+from ai_core.paths import cache_path
+
+DEFAULT_DB_PATH = os.path.join(cache_path("answers"), "answers.sqlite3")
+DEFAULT_TTL = 24 * 60 * 60        # 초 (하루)
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_SIMILARITY = 0.98
+
+# 핵심어 비교에서 떼는 조사 (긴 것부터) / 빼는 군말
+PARTICLES = ("에서는", "으로는", "에서", "으로", "에게", "까지", "부터", "보다", "처럼", "이랑", "하고",
+             "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만", "랑", "요")
+FILLERS = {"뭐야", "뭐지", "뭔가", "뭔가요", "뭐예요", "무엇", "무엇인가", "무엇인가요", "무엇입니까", "알려줘",
+           "알려주세요", "알려", "주세요", "줘", "좀", "인가", "인가요", "입니까", "what", "is", "are", "the",
+           "a", "an", "please", "tell", "me", "show"}
+
+
+def normalize_prompt(text):
+    """공백/대소문자/전각 문자/끝 물음표 차이를 없앤 비교용 문자열."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip("?!. ")
+
+
+def question_terms(text):
+    """의미 유사 적중을 허용할 핵심어 서명: 조사·군말을 뗀 단어와 숫자를 원래 순서대로 이은 문자열.
+
+    "서울의 평균 매출은 뭐야?" → "서울 평균 매출" (평균 / 합계, 서울 / 부산, 3 / 5 가 다르면 서명도 다름)
+    """
+    terms = []
+    for token in re.findall(r"[0-9]+(?:[.,][0-9]+)*|[a-z]+|[가-힣]+", normalize_prompt(text)):
+        if re.match(r"[가-힣]", token):
+            for particle in PARTICLES:
+                if token.endswith(particle) and len(token) > len(particle):
+                    token = token[:-len(particle)]
+                    break
+        if token not in FILLERS:
+            terms.append(token)
+    return " ".join(terms)
+
+
+class AnswerCache:
+    """LLM 답변 SQLite 캐시.
+
+    embeddings 를 주지 않으면 정확 일치(1차)만 사용합니다.
+    hits_exact / hits_semantic / misses 와 절약한 시간(saved_seconds)은 DB 에 누적되므로
+    Streamlit 재실행·여러 세션에 걸친 값을 stats() 로 확인할 수 있습니다.
+    """
+
+    def __init__(self, embeddings=None, db_path=DEFAULT_DB_PATH, ttl=DEFAULT_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES, similarity=DEFAULT_SIMILARITY):
+        self.embeddings = embeddings
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.last_hit = None  # "exact" / "semantic" / None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " key TEXT PRIMARY KEY, context TEXT NOT NULL, vector BLOB, answer TEXT NOT NULL,"
+            " elapsed REAL NOT NULL, created REAL NOT NULL, last_access REAL NOT NULL, terms TEXT)"
+        )
+        # 핵심어 서명(terms) 이전에 만든 DB: 컬럼만 추가 (예전 항목은 의미 유사 적중 대상에서 빠짐)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(answers)")}
+        if "terms" not in columns:
+            self._conn.execute("ALTER TABLE answers ADD COLUMN terms TEXT")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS metrics (name TEXT PRIMARY KEY, value REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_context ON answers(context)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_terms ON answers(context, terms)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_access ON answers(last_access)")
+        self._conn.commit()
+
+    # 🔍 조회
+    def _lookup_exact(self, key, now):
+        row = self._conn.execute(
+            "SELECT answer, elapsed FROM answers WHERE key = ? AND created > ?", (key, now - self.ttl)
+        ).fetchone()
+        if row:
+            self._conn.execute("UPDATE answers SET last_access = ? WHERE key = ?", (now, key))
+        return row
+
+    def _lookup_semantic(self, context, terms, vector, now):
+        # 핵심어가 같은 후보만 읽어 코사인 유사도를 행렬 곱 한 번으로 계산
+        query = np.asarray(vector, dtype=np.float32)
+        rows = [
+            row for row in self._conn.execute(
+                "SELECT key, vector, answer, elapsed FROM answers"
+                " WHERE context = ? AND terms = ? AND vector IS NOT NULL AND created > ?",
+                (context, terms, now - self.ttl),
+            )
+            if len(row[1]) == query.nbytes  # 임베딩 모델이 바뀌어 차원이 다른 항목은 제외
+        ]
+        if not rows:
+            return None
+        matrix = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        scores = np.divide(matrix @ query, norms, out=np.zeros(len(rows), dtype=np.float32), where=norms > 0)
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity:
+            return None
+        key, _, answer, elapsed = rows[best]
+        self._conn.execute("UPDATE answers SET last_access = ? WHERE key = ?", (now, key))
+        return answer, elapsed
+
+    def _record(self, name, saved=0.0):
+        self._conn.executemany(
+            "INSERT INTO metrics (name, value) VALUES (?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [(name, 1), ("saved_seconds", saved)],
+        )
+
+    # 🧹 정리
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM answers WHERE created <= ?", (now - self.ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM answers WHERE key IN "
+                "(SELECT key FROM answers ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    # 🚀 캐시를 거친 호출
+    def cached_call(self, compute, prompt, question=None, context=""):
+        """캐시에 답이 있으면 바로 반환하고, 없으면 compute() 로 LLM 을 호출한 뒤 저장합니다.
+
+        prompt: LLM 에 보내는 전체 프롬프트 (RAG 처럼 검색 전이면 질문) — context 와 함께 정확 일치 키
+        question: 사용자 질문 원문 (핵심어 + 의미 유사도 비교용, 없으면 2차 조회 생략)
+        context: 데이터/문서 지문 (업로드 파일 해시 등) — 같은 지문끼리만 답을 재사용
+        """
+        now = time.time()
+        context = content_hash(context)
+        key = content_hash(context, normalize_prompt(prompt))
+
+        with self._lock:
+            row = self._lookup_exact(key, now)
+            if row:
+                self._record("hits_exact", row[1])
+            self._conn.commit()
+        if row:
+            self.last_hit = "exact"
+            return row[0]
+
+        vector = terms = None
+        if self.embeddings is not None and question:
+            terms = question_terms(question)
+            vector = self.embeddings.embed_query(normalize_prompt(question))
+            with self._lock:
+                row = self._lookup_semantic(context, terms, vector, now)
+                if row:
+                    self._record("hits_semantic", row[1])
+                self._conn.commit()
+            if row:
+                self.last_hit = "semantic"
+                return row[0]
+
+        self.last_hit = None
+        start = time.perf_counter()
+        answer = compute()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (key, context, vector, answer, elapsed, created, last_access, terms)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, context, np.asarray(vector, dtype=np.float32).tobytes() if vector is not None else None,
+                 str(answer), elapsed, now, now, terms),
+            )
+            self._record("misses")
+            self._evict(now)
+            self._conn.commit()
+        return answer
+
+    # 📊 통계
+    def stats(self):
+        with self._lock:
+            values = dict(self._conn.execute("SELECT name, value FROM metrics").fetchall())
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()
+        hits_exact = int(values.get("hits_exact", 0))
+        hits_semantic = int(values.get("hits_semantic", 0))
+        misses = int(values.get("misses", 0))
+        total = hits_exact + hits_semantic + misses
+        return {
+            "hits_exact": hits_exact,
+            "hits_semantic": hits_semantic,
+            "misses": misses,
+            "hit_rate": (hits_exact + hits_semantic) / total if total else 0.0,
+            "saved_seconds": values.get("saved_seconds", 0.0),
+            "entries": entries,
+        }
+
+    def describe_last(self):
+        """Streamlit 캡션용 한 줄 요약."""
+        label = {"exact": "⚡ 캐시 적중(동일 질문)", "semantic": "⚡ 캐시 적중(유사 질문)"}.get(self.last_hit, "🧠 새로 생성")
+        stats = self.stats()
+        return (f"{label} · 적중률 {stats['hit_rate']:.0%} "
+                f"(정확 {stats['hits_exact']} / 유사 {stats['hits_semantic']} / 신규 {stats['misses']}) "
+                f"· 절약 {stats['saved_seconds']:.1f}초")
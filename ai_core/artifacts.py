@@ -0,0 +1,77 @@
+# 🗃️ ai_core/artifacts.py - 보고서 결과물(PDF 등) 콘텐츠 주소 저장소
+#
+# 보고서를 작업 디렉터리에 GPT_Report_<시각>.pdf / chart.png 로 저장했다가 다시 열어 내려받게 하면
+# 파일이 끝없이 쌓이고, 동시에 쓰는 사용자끼리 같은 chart.png 를 덮어씁니다.
+# 보고서는 메모리에서 바이트로 만들고, 나중에 다시 받아야 하는 결과물(백그라운드 작업 결과 등)만 여기에 둡니다.
+#   - 키: 내용 sha256 + 확장자 → 같은 내용은 한 번만 저장, 이름 충돌 없음
+#   - 저장: 임시 파일에 쓰고 os.replace (다른 프로세스가 반쯤 쓴 파일을 읽지 않음)
+#   - 정리: AI_ARTIFACT_DAYS(기본 7일) 동안 쓰이지 않은 파일 삭제,
+#           전체가 AI_ARTIFACT_MAX_MB(기본 500MB)를 넘으면 가장 오래 쓰이지 않은 것부터 삭제 (LRU)
+# python -m ai_core.artifacts 로 현재 용량을 보고 바로 정리할 수 있습니다.
+
+import os
+import threading
+
+from ai_core.hashing import content_hash
+from ai_core.paths import cache_entries, cache_path, prune_cache_dir
+
+ARTIFACTS_DIR = cache_path("artifacts")
+MAX_BYTES = int(os.getenv("AI_ARTIFACT_MAX_MB", "500")) * 1024 * 1024
+MAX_AGE_SECONDS = float(os.getenv("AI_ARTIFACT_DAYS", "7")) * 24 * 3600
+PRUNE_EVERY = 20  # 저장 몇 번마다 정리할지 (매번 폴더 전체를 훑지 않도록)
+
+_lock = threading.Lock()
+_puts = 0
+
+
+def _path(key):
+    return os.path.join(ARTIFACTS_DIR, os.path.basename(key))  # 키에 경로가 섞여 들어와도 저장소 밖은 읽지 않음
+
+
+def put_artifact(data, suffix=""):
+    """바이트를 저장하고 키(내용 해시 + suffix)를 돌려줍니다. 이미 있으면 사용 시각만 갱신."""
+    global _puts
+    data = bytes(data)
+    key = content_hash(data)[:32] + suffix
+    path = _path(key)
+    if os.path.exists(path):
+        os.utime(path)
+    else:
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    with _lock:
+        _puts += 1
+        due = _puts % PRUNE_EVERY == 1
+    if due:
+        prune_artifacts(keep=key)
+    return key
+
+
+def get_artifact(key):
+    """키의 바이트 (정리되어 없으면 None). 읽을 때마다 사용 시각을 갱신합니다."""
+    path = _path(key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        os.utime(path)
+        return data
+    except FileNotFoundError:
+        return None
+
+
+def artifact_exists(key):
+    return os.path.exists(_path(key))
+
+
+def prune_artifacts(max_bytes=MAX_BYTES, max_age=MAX_AGE_SECONDS, keep=None):
+    """오래된 결과물과 용량 초과분을 지웁니다. (지운 개수, 지운 바이트) 반환."""
+    return prune_cache_dir(ARTIFACTS_DIR, max_bytes, max_age, keep=keep)
+
+
+if __name__ == "__main__":
+    entries = cache_entries(ARTIFACTS_DIR)
+    print(f"🗃️ {ARTIFACTS_DIR}: {len(entries)}개, {sum(e[1] for e in entries) / 1024 / 1024:.1f}MB")
+    removed, freed = prune_artifacts()
+    print(f"정리: {removed}개, {freed / 1024 / 1024:.1f}MB")
@@ -0,0 +1,344 @@
+# 🗂️ ai_core/batch_report.py - 여러 워크북 / 시트 보고서 일괄 생성 (Streamlit 없이)
+#
+# 지점별 월간 보고서처럼 워크북 수백 개를 앱에 하나씩 올려 버튼을 누르는 대신
+#   python -m ai_core.batch_report "data/2025-05/*.xlsx" --out reports/2025-05
+# 처럼 폴더 / glob / 파일을 넘기면 시트마다 GPT_excelReportPDF.py 의 차트와
+# GPT_DataMasterProPlus_Upgrade.py 의 EDA + 전문가형 보고서를 만들어 <out>/<워크북>/<시트>.pdf 로 저장합니다.
+#   - 시트 단위 작업을 프로세스 풀(--workers, 기본 AI_BATCH_WORKERS 또는 CPU 수)에서 동시에 실행하고
+#     각 보고서의 절은 report_engine 스레드 풀(--llm-concurrency)로 동시에 생성
+#   - 끝난 시트는 <out>/manifest.jsonl 에 바로 한 줄씩 기록 → 중단 후 같은 명령을 다시 실행하면
+#     (워크북 내용 해시, 시트, 옵션)이 같고 PDF 가 남아 있는 시트는 건너뜀
+#     (실패한 시트 / 일부 절을 만들지 못한 partial 시트 / 바뀐 워크북만 다시)
+#   - 마지막에 <out>/summary.json 에 워크북별 시트 수 / 성공·일부 실패·실패 / 단계별 시간 합계를 남기고 표로 출력
+#     (실패나 일부 실패가 하나라도 있으면 종료 코드 1)
+# --no-llm 이면 API 호출 없이 차트 + 통계만으로 PDF 를 만듭니다 (데이터 / 레이아웃 확인용).
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from ai_core.charts import render_chart
+from ai_core.hashing import content_hash
+from ai_core.ingest import excel_sheet_names, source_hash
+from ai_core.llm_client import get_chat_model
+from ai_core.pdf_render import new_report, pdf_bytes, preload_fonts, resolve_fonts
+from ai_core.profile import load_for_eda
+from ai_core.report_engine import REPORT_CONCURRENCY, expert_report
+from ai_core.report_jobs import expert_pdf, format_date_axis
+
+BATCH_WORKERS = int(os.getenv("AI_BATCH_WORKERS", str(os.cpu_count() or 2)))
+MANIFEST_FILE = "manifest.jsonl"
+SUMMARY_FILE = "summary.json"
+CHART_CHOICES = ["바 차트", "선 차트", "원형 차트"]
+FINAL_STATUSES = ("done", "skipped")  # 다시 실행해도 건너뛰는 상태 (partial / failed 는 다시 시도)
+STATUSES = FINAL_STATUSES + ("partial", "failed")
+
+
+class _Timer:
+    """단계별 경과 시간 (lap 을 부를 때마다 직전 lap 이후 시간을 name 으로 기록)."""
+
+    def __init__(self):
+        self.laps = {}
+        self.started = self._last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.laps[name] = round(now - self._last, 3)
+        self._last = now
+
+    @property
+    def total(self):
+        return round(time.perf_counter() - self.started, 3)
+
+
+def find_workbooks(inputs):
+    """폴더(하위 폴더 포함) / glob / 파일 경로 → [(절대 경로, 출력 이름)] (엑셀 잠금 파일 ~$ 제외).
+
+    출력 이름은 넘긴 폴더(glob 이면 와일드카드 앞 폴더) 기준 상대 경로에서 확장자를 뗀 것이고,
+    서로 다른 입력에서 이름이 겹치면 경로 해시를 붙여 구분합니다.
+    """
+    found = {}
+    for item in inputs:
+        if os.path.isdir(item):
+            root, pattern = item, os.path.join(item, "**", "*.xlsx")
+        else:
+            root, pattern = os.path.dirname(item), item
+            while glob.has_magic(root):
+                root = os.path.dirname(root)
+        for path in glob.glob(pattern, recursive=True):
+            if path.endswith(".xlsx") and not os.path.basename(path).startswith("~$"):
+                found.setdefault(os.path.abspath(path), os.path.splitext(os.path.relpath(path, root or "."))[0])
+    workbooks, used = [], set()
+    for path, name in sorted(found.items()):
+        if name in used:
+            name = f"{name}_{content_hash(path)[:8]}"
+        used.add(name)
+        workbooks.append((path, name))
+    return workbooks
+
+
+def _safe_name(name):
+    return re.sub(r'[\\/:*?"<>|]+', "_", str(name)).strip() or "sheet"
+
+
+def plan_tasks(workbooks, options, sheets="all"):
+    """find_workbooks 결과 → (시트 작업 목록, 시트 목록을 읽지 못한 워크북 기록)."""
+    # 결과에 영향을 주는 옵션만 키에 (동시 호출 수를 바꿔도 이어서 실행)
+    content_options = {k: v for k, v in options.items() if k != "concurrency"}
+    options_key = content_hash(json.dumps(content_options, sort_keys=True, ensure_ascii=False))
+    tasks, failures = [], []
+    for path, name in workbooks:
+        try:
+            digest = source_hash(path)
+            names = excel_sheet_names(path)
+        except Exception as exc:
+            failures.append({"file": path, "sheet": None, "status": "failed", "error": f"{type(exc).__name__}: {exc}"})
+            continue
+        for sheet in names[:1] if sheets == "first" else names:
+            tasks.append({
+                "key": content_hash(name, digest, sheet, options_key)[:32],
+                "file": path,
+                "sheet": sheet,
+                "data_key": content_hash(digest, sheet),
+                "pdf": os.path.join(name, _safe_name(sheet) + ".pdf"),
+            })
+    return tasks, failures
+
+
+def pick_columns(df, profile, options):
+    """차트 X / Y (옵션에 준 컬럼이 시트에 있으면 그것, 없으면 첫 문자·날짜 컬럼 / 첫 숫자 컬럼)
+    와 산점도 쌍 (상관이 가장 강한 숫자 컬럼 둘, 없으면 None).
+    X 와 Y 가 같은 컬럼이 되면 문자 컬럼을 X 로 쓰고, 그것도 없으면 X 는 None (주 차트 생략)."""
+    numeric = profile.numeric_columns
+    x = options.get("x") if options.get("x") in df.columns else next((c for c in df.columns if c not in numeric), df.columns[0])
+    y = options.get("y") if options.get("y") in numeric else next((c for c in numeric if c != x), numeric[0])
+    if x == y:  # 같은 컬럼끼리 그린 차트는 의미가 없음
+        x = next((c for c in df.columns if c not in numeric), None)
+    corr = profile.corr.abs()
+    pairs = [
+        (corr.loc[a, b], a, b)
+        for i, a in enumerate(corr.columns) for b in corr.columns[i + 1:]
+        if pd.notna(corr.loc[a, b])
+    ]
+    scatter = max(pairs, key=lambda p: p[0])[1:] if pairs else None
+    return x, y, scatter
+
+
+def stats_pdf(title, profile, images):
+    """LLM 없이 차트 + 숫자 컬럼 요약만 담은 PDF 바이트 (--no-llm)."""
+    pdf = new_report(title)
+    pdf.paragraph(f"행 {profile.n_rows:,} · 열 {profile.n_cols}")
+    for image in images:
+        pdf.image_full(image)
+    pdf.heading("주요 통계")
+    summary = profile.numeric_describe
+    for col in summary.columns:
+        s = summary[col]
+        pdf.paragraph(f"- {col}: 평균 {s.get('mean', float('nan')):,.2f} · 최소 {s.get('min', float('nan')):,.2f}"
+                      f" · 최대 {s.get('max', float('nan')):,.2f}")
+    return pdf_bytes(pdf)
+
+
+def run_sheet(task, options, out_dir):
+    """시트 하나의 보고서를 만들어 저장하고 매니페스트 기록(dict)을 돌려줍니다 (작업자 프로세스에서 실행)."""
+    timer = _Timer()
+    record = dict(task, status="failed", error=None, rows=0, finished=None)
+    workbook = os.path.splitext(os.path.basename(task["file"]))[0]
+    try:
+        df, profile = load_for_eda(task["file"], "excel", task["sheet"])
+        timer.lap("load")
+        record["rows"] = int(profile.n_rows)
+        if df.empty or not profile.numeric_columns:
+            record.update(status="skipped", error="숫자 컬럼이 없는 시트")
+            return record
+
+        x, y, scatter = pick_columns(df, profile, options)
+        images = []
+        if x is not None:
+            df = format_date_axis(df, x)
+            images.append(render_chart(df, task["data_key"], options["chart"], x=x, y=y, rotate=45))
+        if scatter:
+            images.append(render_chart(df, task["data_key"], "scatter", x=scatter[0], y=scatter[1]))
+        timer.lap("charts")
+
+        title = f"{workbook} / {task['sheet']}"
+        if options["llm"]:
+            sx, sy = scatter or ("-", "-")
+            context = {
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                "eda": profile.numeric_describe_text,
+                "chart": options["chart"] if x is not None else "-", "x": x or "-", "y": y, "sx": sx, "sy": sy,
+                "sxy_corr": f"{profile.corr.loc[sx, sy]:.3f}" if scatter else "-",
+            }
+            report = expert_report(get_chat_model("report"), context, label=f"batch:{workbook}:{task['sheet']}",
+                                   concurrency=options["concurrency"])
+            timer.lap("llm")
+            report.title = f"{report.title} - {title}"
+            data = expert_pdf(report, images)
+            record["failed_sections"] = len(report.failed)
+            if report.failed:  # PDF 는 남기되 (⚠️ 안내 문구) 다음 실행에서 다시 생성
+                record["error"] = "생성하지 못한 절: " + ", ".join(r.section.title for r in report.failed)
+        else:
+            data = stats_pdf(title, profile, images)
+        path = os.path.join(out_dir, task["pdf"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        timer.lap("pdf")
+        record["status"] = "partial" if record.get("failed_sections") else "done"
+    except Exception as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        record["timings"] = timer.laps
+        record["seconds"] = timer.total
+        record["finished"] = datetime.now().isoformat(timespec="seconds")
+    return record
+
+
+def _init_worker():
+    # 차트 한글 라벨용 폰트 (PDF 와 같은 폰트) + PDF 폰트 파싱을 작업자마다 한 번
+    import matplotlib
+    from matplotlib import font_manager
+
+    path = resolve_fonts()[""]
+    font_manager.fontManager.addfont(path)
+    matplotlib.rcParams["font.family"] = font_manager.FontProperties(fname=path).get_name()
+    matplotlib.rcParams["axes.unicode_minus"] = False
+    preload_fonts()
+
+
+def load_manifest(out_dir):
+    """manifest.jsonl → 작업 키별 마지막 기록."""
+    records = {}
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 중단되면서 반쯤 쓴 마지막 줄
+                if record.get("key"):
+                    records[record["key"]] = record
+    return records
+
+
+def _finished(record, out_dir):
+    if record is None or record.get("status") not in FINAL_STATUSES:
+        return False
+    return record["status"] == "skipped" or os.path.exists(os.path.join(out_dir, record["pdf"]))
+
+
+def summarize(records, options, workers, elapsed):
+    """워크북별 시트 수 / 상태 / 시간 합계 (seconds 는 시트별 시간의 합이라 병렬 실행 시 전체 시간보다 큼)."""
+    files = {}
+    for r in records:
+        entry = files.setdefault(r["file"], {
+            "file": r["file"], "sheets": 0, **{s: 0 for s in STATUSES}, "resumed": 0,
+            "seconds": 0.0, "timings": {},
+        })
+        entry["sheets"] += 1
+        entry[r["status"]] += 1
+        entry["resumed"] += int(bool(r.get("resumed")))
+        entry["seconds"] = round(entry["seconds"] + r.get("seconds", 0.0), 3)
+        for name, seconds in r.get("timings", {}).items():
+            entry["timings"][name] = round(entry["timings"].get(name, 0.0) + seconds, 3)
+    totals = {s: sum(f[s] for f in files.values()) for s in ("sheets", *STATUSES, "resumed")}
+    return {
+        "finished": datetime.now().isoformat(timespec="seconds"),
+        "elapsed": round(elapsed, 1),
+        "workers": workers,
+        "options": options,
+        "totals": totals,
+        "files": list(files.values()),
+        "sheets": records,
+    }
+
+
+def run_batch(inputs, out_dir, options, workers=BATCH_WORKERS, sheets="all", force=False):
+    """inputs 의 워크북 / 시트 보고서를 만들고 요약(dict)을 돌려줍니다. 이미 끝난 시트는 건너뜁니다."""
+    started = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    previous = {} if force else load_manifest(out_dir)
+    tasks, records = plan_tasks(find_workbooks(inputs), options, sheets)
+    pending = []
+    for task in tasks:
+        if _finished(previous.get(task["key"]), out_dir):
+            records.append(dict(previous[task["key"]], resumed=True))
+        else:
+            pending.append(task)
+    print(f"🗂️ 시트 {len(tasks)}개 · 이미 완료 {len(tasks) - len(pending)}개 · 생성 {len(pending)}개 (작업자 {workers}개)")
+
+    context = multiprocessing.get_context("spawn")  # 작업자마다 깨끗한 Matplotlib / HTTP 클라이언트 상태
+    with open(os.path.join(out_dir, MANIFEST_FILE), "a", encoding="utf-8") as log, \
+            ProcessPoolExecutor(max_workers=max(workers, 1), mp_context=context, initializer=_init_worker) as pool:
+        futures = {pool.submit(run_sheet, task, options, out_dir): task for task in pending}
+        try:
+            for i, future in enumerate(as_completed(futures), 1):
+                task = futures[future]
+                try:
+                    record = future.result()
+                except Exception as exc:  # 작업자 프로세스가 죽은 경우 (메모리 부족 등)
+                    record = dict(task, status="failed", error=f"{type(exc).__name__}: {exc}")
+                log.write(json.dumps(record, ensure_ascii=False) + "\n")
+                log.flush()  # 중단되어도 여기까지 끝난 시트는 다음 실행에서 건너뜀
+                records.append(record)
+                mark = {"done": "✅", "skipped": "⏭️", "partial": "⚠️"}.get(record["status"], "❌")
+                detail = f"{record.get('seconds', 0):.1f}s" if record["status"] == "done" else record.get("error")
+                print(f"[{i}/{len(pending)}] {mark} {os.path.basename(task['file'])} / {task['sheet']} · {detail}")
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    summary = summarize(records, options, workers, time.perf_counter() - started)
+    with open(os.path.join(out_dir, SUMMARY_FILE), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def print_summary(summary):
+    for f in summary["files"]:
+        steps = " · ".join(f"{name} {seconds:.1f}s" for name, seconds in f["timings"].items())
+        print(f"{os.path.basename(f['file'])}: 시트 {f['sheets']} (완료 {f['done']}, 건너뜀 {f['skipped']}, "
+              f"일부 실패 {f['partial']}, 실패 {f['failed']}) · {f['seconds']:.1f}s [{steps}]")
+    t = summary["totals"]
+    print(f"📊 전체 {summary['elapsed']:.1f}초 · 시트 {t['sheets']} (완료 {t['done']}, 이전 실행 {t['resumed']}, "
+          f"건너뜀 {t['skipped']}, 일부 실패 {t['partial']}, 실패 {t['failed']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 엑셀 워크북 / 시트의 PDF 보고서 일괄 생성")
+    parser.add_argument("inputs", nargs="+", help="폴더 / glob / .xlsx 파일")
+    parser.add_argument("--out", required=True, help="보고서 / manifest.jsonl / summary.json 을 저장할 폴더")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="동시에 처리할 시트 수 (프로세스)")
+    parser.add_argument("--sheets", choices=["all", "first"], default="all")
+    parser.add_argument("--chart", choices=CHART_CHOICES, default=CHART_CHOICES[0])
+    parser.add_argument("--x", help="차트 X축 컬럼 (시트에 없으면 첫 문자·날짜 컬럼)")
+    parser.add_argument("--y", help="차트 Y축 컬럼 (시트에 없으면 첫 숫자 컬럼)")
+    parser.add_argument("--llm-concurrency", type=int, default=REPORT_CONCURRENCY, help="보고서 하나의 동시 LLM 호출 수")
+    parser.add_argument("--no-llm", action="store_true", help="LLM 없이 차트 + 통계만")
+    parser.add_argument("--force", action="store_true", help="이미 만든 보고서도 다시 생성")
+    args = parser.parse_args()
+
+    options = {"chart": args.chart, "x": args.x, "y": args.y, "llm": not args.no_llm, "concurrency": args.llm_concurrency}
+    try:
+        summary = run_batch(args.inputs, args.out, options, args.workers, args.sheets, args.force)
+    except KeyboardInterrupt:
+        print("⏹️ 중단됨 - 같은 명령을 다시 실행하면 끝난 시트는 건너뛰고 이어서 생성합니다.")
+        raise SystemExit(130)
+    print_summary(summary)
+    raise SystemExit(1 if summary["totals"]["failed"] or summary["totals"]["partial"] else 0)
+
+
+if __name__ == "__main__":
+    main()
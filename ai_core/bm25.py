@@ -0,0 +1,101 @@
+# 🔎 ai_core/bm25.py - 로컬 BM25 역색인 + 벡터 검색 결과 RRF 결합 (하이브리드 검색)
+#
+# 임베딩 검색은 한글 제품명이나 SKU 코드처럼 "글자 그대로" 맞아야 하는 질문을 자주 놓칩니다.
+# 청크를 한글 글자 n-gram / 영숫자 코드 단위로 색인한 BM25 결과를 FAISS 결과와
+# Reciprocal Rank Fusion 으로 합쳐서, 추가 임베딩 호출 없이 정확 일치 질의를 보완합니다.
+
+import math
+import re
+from collections import Counter, defaultdict
+
+# 영숫자 코드(AIX-100, V8 등) / 한글 단어 / 기타 단어
+_TOKEN_RE = re.compile(r"[0-9a-z][0-9a-z\-_.]*[0-9a-z]|[0-9a-z]|[가-힣]+|\w+")
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+RRF_K = 60
+
+
+def tokenize(text, ngram=2):
+    """한국어 친화 토큰화: 한글 단어는 단어 전체 + 글자 n-gram, 영숫자 코드는 통째로 + 구성 요소."""
+    tokens = []
+    for word in _TOKEN_RE.findall(text.lower()):
+        tokens.append(word)
+        if "가" <= word[0] <= "힣":
+            if len(word) > ngram:
+                tokens.extend(word[i:i + ngram] for i in range(len(word) - ngram + 1))
+        elif "-" in word or "_" in word or "." in word:
+            tokens.extend(part for part in re.split(r"[\-_.]", word) if part)
+    return tokens
+
+
+class BM25Index:
+    """Document 리스트 위의 메모리 BM25 역색인."""
+
+    def __init__(self, docs, k1=BM25_K1, b=BM25_B):
+        self.docs = list(docs)
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)  # term -> [(doc 번호, tf)]
+        self.doc_lengths = []
+        for i, doc in enumerate(self.docs):
+            counts = Counter(tokenize(doc.page_content))
+            self.doc_lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings[term].append((i, tf))
+        n = len(self.docs)
+        self.avg_length = (sum(self.doc_lengths) / n) if n else 0.0
+        self.idf = {
+            term: math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for term, posting in self.postings.items()
+        }
+
+    @classmethod
+    def from_faiss(cls, db):
+        """FAISS 벡터 저장소의 docstore 에 들어 있는 청크로 색인을 만듭니다."""
+        return cls(db.docstore.search(doc_id) for doc_id in db.index_to_docstore_id.values())
+
+    def search(self, query, k=4):
+        """[(Document, 점수)] 를 점수 내림차순으로 최대 k 개 반환합니다."""
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[i] / (self.avg_length or 1))
+                scores[i] += idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.docs[i], score) for i, score in ranked]
+
+
+def _doc_key(doc):
+    return doc.metadata.get("chunk_id") or (doc.metadata.get("source"), doc.page_content)
+
+
+def reciprocal_rank_fusion(result_lists, k=4, rrf_k=RRF_K):
+    """여러 순위 리스트(Document 리스트)를 RRF 점수 sum(1 / (rrf_k + 순위)) 로 합칩니다."""
+    scores = defaultdict(float)
+    docs = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            key = _doc_key(doc)
+            docs.setdefault(key, doc)
+            scores[key] += 1.0 / (rrf_k + rank)
+    ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [docs[key] for key in ranked]
+
+
+class HybridRetriever:
+    """FAISS 유사도 검색 + BM25 검색 결과를 RRF 로 합친 리트리버."""
+
+    def __init__(self, db, bm25=None, k=4, fetch_k=10):
+        self.db = db
+        self.bm25 = bm25 or BM25Index.from_faiss(db)
+        self.k = k
+        self.fetch_k = fetch_k
+
+    def get_relevant_documents(self, query):
+        vector_docs = self.db.similarity_search(query, k=self.fetch_k)
+        lexical_docs = [doc for doc, _ in self.bm25.search(query, k=self.fetch_k)]
+        return reciprocal_rank_fusion([vector_docs, lexical_docs], k=self.k)
@@ -0,0 +1,273 @@
+# 🖼️ ai_core/charts.py - 차트 렌더링 캐시 (PNG/SVG 바이트)
+#
+# 앱들은 재실행마다 plt.subplots() + sns.barplot(...) 으로 같은 그림을 다시 그리고,
+# pyplot 전역 그림을 닫지 않아 오래 켜 둔 세션에서 Matplotlib 메모리가 계속 늘어납니다.
+# 여기서는 (데이터 해시, 차트 종류, x, y, 스타일) 을 키로 렌더링 결과 바이트를 보관해
+# 선택이 그대로인 재실행에서는 Matplotlib 을 아예 거치지 않고 st.image / PDF 에 바로 넣습니다.
+#   - pyplot 대신 matplotlib.figure.Figure 를 직접 만들어 전역 상태 없이 그리고 바로 버림
+#   - 메모리 LRU (개수 / 용량 한도) + .cache/charts/<키>.<형식> 디스크 캐시
+#     (디스크는 AI_CHART_DISK_DAYS(기본 14일) 동안 안 쓰인 그림과 AI_CHART_DISK_MB(기본 200MB) 초과분을 LRU 로 정리)
+#   - 큰 데이터는 ai_core.downsample 로 먼저 줄여서 그림 (바: x별 집계 + 해석적 오차 막대,
+#     선: 집계 후 LTTB / min-max, 산점도: 밀도 격자) → 그리는 시간이 행 수와 거의 무관
+
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from ai_core.downsample import aggregate, density_grid, lttb, minmax
+from ai_core.hashing import content_hash
+from ai_core.paths import cache_path, prune_cache_dir
+
+CHARTS_DIR = cache_path("charts")
+MEMORY_CACHE_SIZE = 64
+MEMORY_CACHE_BYTES = int(os.getenv("AI_CHART_CACHE_MB", "64")) * 1024 * 1024
+DISK_CACHE_BYTES = int(os.getenv("AI_CHART_DISK_MB", "200")) * 1024 * 1024
+DISK_CACHE_AGE_SECONDS = float(os.getenv("AI_CHART_DISK_DAYS", "14")) * 24 * 3600
+PRUNE_EVERY = 50  # 새 그림 몇 장마다 디스크 캐시를 정리할지 (매번 폴더 전체를 훑지 않도록)
+DPI = 100
+RENDER_VERSION = 2  # 그리는 방식이 바뀌면 올려서 예전 디스크 캐시 그림을 쓰지 않도록
+MAX_BARS = 50              # 바 차트 최대 막대 수 (행 수가 많은 x 값부터)
+MAX_PIE_SLICES = 12        # 원형 차트 최대 조각 수 (나머지는 "기타")
+MAX_LINE_POINTS = 2000     # 선 차트 최대 점 수 (선마다)
+MAX_SCATTER_POINTS = 5000  # 넘으면 산점도 대신 밀도 격자
+DENSITY_BINS = 120
+VALUE_COLUMN = "__y_mean__"  # 집계 표의 y 평균 컬럼 (x == y 로 골라도 x 컬럼과 겹치지 않게)
+MAX_CATEGORY_TICKS = 20    # 문자 x 축 눈금 최대 개수
+
+# 앱 화면의 한글 선택지 → 차트 종류
+CHART_KINDS = {"바 차트": "bar", "선 차트": "line", "원형 차트": "pie", "산점도": "scatter", "히트맵": "heatmap"}
+# seaborn / pie 로 넘기지 않고 여기서 처리하는 스타일 옵션 (downsample: 선 차트 "lttb" | "minmax")
+LAYOUT_OPTIONS = ("figsize", "title", "xlabel", "ylabel", "rotate", "downsample")
+
+_images = OrderedDict()  # 키 -> 바이트
+_lock = threading.Lock()
+_writes = 0
+
+
+def chart_key(data_key, kind, x=None, y=None, image_format="png", **style):
+    """렌더링 결과를 구분하는 키 (한글 폰트 설정이 바뀌면 다른 그림)."""
+    from matplotlib import rcParams
+
+    font = rcParams["font.family"]
+    return content_hash(RENDER_VERSION, data_key, kind, x, y, image_format, repr(sorted(style.items())), repr(font))[:32]
+
+
+def _remember(key, image):
+    with _lock:
+        _images[key] = image
+        _images.move_to_end(key)
+        total = sum(len(v) for v in _images.values())
+        while len(_images) > 1 and (len(_images) > MEMORY_CACHE_SIZE or total > MEMORY_CACHE_BYTES):
+            total -= len(_images.popitem(last=False)[1])
+
+
+def render(key, draw, image_format="png", figsize=None):
+    """key 로 캐시된 그림을 돌려주고, 없을 때만 draw(ax) 로 그려 저장합니다.
+
+    image_format 은 "png" / "svg" 등 저장 형식 (seaborn heatmap 의 fmt 와 구분).
+    반환값: 이미지 바이트 (st.image / ReportPDF.image_full 에 그대로 전달)
+    """
+    path = os.path.join(CHARTS_DIR, f"{key}.{image_format}")
+    with _lock:
+        image = _images.get(key)
+        if image is not None:
+            _images.move_to_end(key)
+    if image is None and os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                image = f.read()
+            os.utime(path)  # 사용 시각 갱신 → 자주 쓰는 그림은 정리 대상에서 뒤로
+            _remember(key, image)
+        except FileNotFoundError:  # 다른 프로세스가 방금 정리함 → 다시 그림
+            image = None
+    if image is None:
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=figsize, dpi=DPI)  # pyplot 에 등록되지 않으므로 닫을 필요 없이 참조만 끊으면 정리됨
+        ax = fig.subplots()
+        draw(ax)
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=image_format)
+        fig.clear()
+        image = buffer.getvalue()
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(image)
+        os.replace(tmp, path)
+        _remember(key, image)
+        _saved(os.path.basename(path))
+    return image
+
+
+def _saved(name):
+    # 새 그림을 PRUNE_EVERY 장 저장할 때마다 디스크 캐시 정리 (방금 저장한 그림은 남김)
+    global _writes
+    with _lock:
+        _writes += 1
+        due = _writes % PRUNE_EVERY == 1
+    if due:
+        prune_disk_cache(keep=name)
+
+
+def prune_disk_cache(max_bytes=DISK_CACHE_BYTES, max_age=DISK_CACHE_AGE_SECONDS, keep=None):
+    """오래 쓰이지 않은 그림과 용량 초과분을 .cache/charts 에서 지웁니다. (지운 개수, 지운 바이트) 반환."""
+    return prune_cache_dir(CHARTS_DIR, max_bytes, max_age, keep=keep)
+
+
+def _apply_layout(ax, title=None, xlabel=None, ylabel=None, rotate=None):
+    if title:
+        ax.set_title(title)
+    if xlabel is not None:
+        ax.set_xlabel(xlabel)
+    if ylabel is not None:
+        ax.set_ylabel(ylabel)
+    if rotate:
+        ax.tick_params(axis="x", labelrotation=rotate)
+
+
+def _is_continuous(series):
+    return (pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)) \
+        or pd.api.types.is_datetime64_any_dtype(series)
+
+
+def _draw_bar(ax, df, x, y, errorbar=("ci", 95), hue=None, **style):
+    import seaborn as sns
+
+    table = aggregate(df, x, y, hue=hue, errorbar=errorbar, value_name=VALUE_COLUMN)
+    labels = pd.unique(table[x])
+    total = len(labels)
+    if total > MAX_BARS:
+        top = set(table.groupby(x, sort=False)["count"].sum().nlargest(MAX_BARS).index)
+        labels = [v for v in labels if v in top]
+        table = table[table[x].isin(top)]
+    # 집계된 표를 그대로 그림 (seaborn 부트스트랩 없음), 오차 막대는 해석적으로 계산한 값
+    sns.barplot(data=table, x=x, y=VALUE_COLUMN, hue=hue, order=labels, errorbar=None, ax=ax, **style)
+    ax.set_ylabel(y)
+    if hue is None and table["err"].notna().any():
+        ax.errorbar(np.arange(len(table)), table[VALUE_COLUMN], yerr=table["err"], fmt="none", ecolor="#424242",
+                    linewidth=1.5)
+    if total > len(labels):
+        ax.set_xlabel(f"{x} (행 수 상위 {len(labels)}개 / 전체 {total:,}개)")
+
+
+def _draw_line(ax, df, x, y, errorbar=("ci", 95), hue=None, downsample=None, **style):
+    continuous = _is_continuous(df[x])
+    table = aggregate(df, x, y, hue=hue, errorbar=errorbar, value_name=VALUE_COLUMN)
+    labels = pd.unique(table[x]) if not continuous else None
+    groups = [(None, table)] if hue is None else list(table.groupby(hue, sort=False, observed=True))
+    for name, group in groups:
+        if continuous:
+            position = group[x].to_numpy()
+            numeric = position.astype("datetime64[ns]").astype(np.int64) \
+                if pd.api.types.is_datetime64_any_dtype(group[x]) else position.astype(float)
+        else:
+            # 문자 x 는 처음 나온 순서의 위치(0, 1, 2 ...)에 그리고 눈금 이름만 원래 값으로
+            position = numeric = pd.Index(labels).get_indexer(group[x]).astype(float)
+        values = group[VALUE_COLUMN].to_numpy(dtype=float)
+        if len(values) > MAX_LINE_POINTS:
+            kept = minmax(values, MAX_LINE_POINTS) if downsample == "minmax" \
+                else lttb(numeric, values, MAX_LINE_POINTS)
+            group, position, values = group.iloc[kept], position[kept], values[kept]
+        line, = ax.plot(position, values, label=None if name is None else str(name), **style)
+        err = group["err"].to_numpy(dtype=float)
+        if np.isfinite(err).any():
+            ax.fill_between(position, values - err, values + err, color=line.get_color(), alpha=0.2, linewidth=0)
+    if not continuous:
+        from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+        ax.xaxis.set_major_locator(MaxNLocator(MAX_CATEGORY_TICKS, integer=True))
+        ax.xaxis.set_major_formatter(FuncFormatter(
+            lambda v, _: str(labels[int(round(v))]) if 0 <= round(v) < len(labels) else ""
+        ))
+    if hue is not None:
+        ax.legend(title=hue)
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+
+
+def _draw_scatter(ax, df, x, y, hue=None, **style):
+    import seaborn as sns
+
+    if len(df) <= MAX_SCATTER_POINTS:
+        sns.scatterplot(data=df, x=x, y=y, hue=hue, ax=ax, **style)
+        return
+    if _is_continuous(df[x]) and _is_continuous(df[y]) and not pd.api.types.is_datetime64_any_dtype(df[x]) \
+            and not pd.api.types.is_datetime64_any_dtype(df[y]):
+        # 점이 겹쳐 덩어리가 되는 대신 칸별 행 수를 색으로 (hue 는 밀도 격자에서 생략)
+        from matplotlib.colors import LogNorm
+
+        counts, x_edges, y_edges = density_grid(df[x], df[y], bins=DENSITY_BINS)
+        mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), norm=LogNorm(), cmap="viridis")
+        ax.figure.colorbar(mesh, ax=ax, label="행 수")
+        ax.set_xlabel(x)
+        ax.set_ylabel(y)
+        return
+    # 문자 / 날짜 축은 밀도 격자 대신 고정 시드 무작위 표본
+    sample = df.sample(MAX_SCATTER_POINTS, random_state=0)
+    sns.scatterplot(data=sample, x=x, y=y, hue=hue, ax=ax, **style)
+
+
+def _draw_pie(ax, df, x, y=None, **style):
+    values = df.groupby(x, observed=True)[y].sum() if y is not None else df[x].value_counts()
+    if len(values) > MAX_PIE_SLICES:
+        values = values.sort_values(ascending=False)
+        rest = values.iloc[MAX_PIE_SLICES - 1:].sum()
+        values = pd.concat([values.iloc[:MAX_PIE_SLICES - 1], pd.Series({"기타": rest})])
+    ax.pie(values, labels=values.index, autopct="%1.1f%%", **style)
+    ax.set_ylabel("")
+    ax.axis("equal")
+
+
+def render_chart(df, data_key, kind, x=None, y=None, image_format="png", **style):
+    """바 / 선 / 원형 / 산점도 차트. kind 는 "bar" 같은 영문 이름 또는 "바 차트" 같은 화면 선택지.
+
+    style 의 figsize / title / xlabel / ylabel / rotate / downsample 은 레이아웃에,
+    나머지(hue, errorbar, s ...)는 그리는 함수(seaborn 또는 matplotlib)에 넘깁니다.
+    바 / 선 차트는 x별로 먼저 집계하고 errorbar 는 seaborn 과 같은 값("ci", "se", "sd", None)을 받습니다.
+    data_key 는 업로드 내용 해시처럼 df 내용이 같으면 같은 값이어야 합니다.
+    """
+    kind = CHART_KINDS.get(kind, kind)
+    layout = {k: style.pop(k) for k in LAYOUT_OPTIONS if k in style}
+    figsize = layout.pop("figsize", None)
+    key = chart_key(data_key, kind, x, y, image_format, figsize=figsize, **layout, **style)
+    downsample = layout.pop("downsample", None)
+
+    def draw(ax):
+        if kind == "bar":
+            _draw_bar(ax, df, x, y, **style)
+        elif kind == "line":
+            _draw_line(ax, df, x, y, downsample=downsample, **style)
+        elif kind == "scatter":
+            _draw_scatter(ax, df, x, y, **style)
+        elif kind == "pie":
+            _draw_pie(ax, df, x, y, **style)
+        else:
+            raise ValueError(f"지원하지 않는 차트 종류입니다: {kind}")
+        _apply_layout(ax, **layout)
+
+    return render(key, draw, image_format=image_format, figsize=figsize)
+
+
+def render_heatmap(matrix, data_key, image_format="png", **style):
+    """상관행렬 / 피벗 표 히트맵. data_key 는 matrix 내용을 구분하는 값 (예: 업로드 해시 + "corr")."""
+    layout = {k: style.pop(k) for k in LAYOUT_OPTIONS if k in style}
+    figsize = layout.pop("figsize", None)
+    key = chart_key(data_key, "heatmap", None, None, image_format, figsize=figsize, **layout, **style)
+
+    def draw(ax):
+        import seaborn as sns
+
+        sns.heatmap(matrix, ax=ax, **style)
+        _apply_layout(ax, **layout)
+
+    return render(key, draw, image_format=image_format, figsize=figsize)
+
+
+def clear_cache():
+    with _lock:
+        _images.clear()
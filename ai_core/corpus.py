@@ -0,0 +1,166 @@
+# 📚 ai_core/corpus.py - 여러 문서를 하나의 FAISS 인덱스로 관리하는 코퍼스 모드
+#
+# 문서마다 (내용 해시, 청크 ID 목록) 을 manifest 에 기록해 두고,
+# 문서 하나를 추가 / 교체 / 삭제할 때 해당 청크만 인덱스에서 넣고 빼므로
+# 파일이 수천 개여도 전체 재구축이 필요 없습니다.
+
+import fnmatch
+import json
+import os
+import shutil
+import tempfile
+
+from langchain.text_splitter import CharacterTextSplitter
+from langchain.vectorstores import FAISS
+
+from ai_core.embedding_cache import embedding_model_name
+from ai_core.embedding_pipeline import add_to_faiss
+from ai_core.hashing import content_hash
+from ai_core.index_store import split_text
+from ai_core.paths import cache_path
+
+MANIFEST_FILE = "manifest.json"
+
+
+class CorpusIndex:
+    """문서 ID(파일 이름/경로) 단위로 증분 추가·삭제가 가능한 FAISS 코퍼스.
+
+    path 를 주면 save() 시 인덱스와 manifest 를 디스크에 저장하고 다음 실행에서 이어서 씁니다.
+    path 가 None 이면 메모리에서만 유지합니다 (Streamlit 세션별 업로드 코퍼스 등).
+    """
+
+    def __init__(self, embeddings, path=None, splitter_cls=CharacterTextSplitter, chunk_size=300, chunk_overlap=50):
+        self.embeddings = embeddings
+        self.path = path
+        self.splitter_cls = splitter_cls
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.settings_key = content_hash(
+            splitter_cls.__name__, chunk_size, chunk_overlap, embedding_model_name(embeddings)
+        )
+        self.db = None
+        self.documents = {}  # doc_id -> {"hash": ..., "chunk_ids": [...]}
+        if path:
+            self._load()
+
+    # 💾 저장 / 불러오기
+    def _load(self):
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        # 분할 설정이나 임베딩 모델이 바뀌면 기존 인덱스는 쓰지 않음
+        if manifest.get("settings_key") != self.settings_key:
+            return
+        self.documents = manifest["documents"]
+        if os.path.exists(os.path.join(self.path, "index.faiss")):
+            self.db = FAISS.load_local(self.path, self.embeddings, allow_dangerous_deserialization=True)
+
+    def save(self):
+        if not self.path:
+            return
+        parent = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+        if self.db is not None:
+            self.db.save_local(tmp_dir)
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump({"settings_key": self.settings_key, "documents": self.documents}, f, ensure_ascii=False)
+        # 기존 폴더와 교체 (인덱스와 manifest 가 항상 짝이 맞도록 폴더 단위로 바꿈)
+        old_dir = None
+        if os.path.exists(self.path):
+            old_dir = tempfile.mkdtemp(dir=parent, prefix=".old-")
+            os.rmdir(old_dir)
+            os.replace(self.path, old_dir)
+        os.replace(tmp_dir, self.path)
+        if old_dir:
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    # ➕ 추가 / 교체
+    def add_document(self, doc_id, data):
+        """문서를 추가합니다. 같은 ID 가 있으면 내용이 바뀐 경우에만 교체합니다.
+
+        반환값: "added" / "replaced" / "unchanged"
+        """
+        doc_hash = content_hash(data)
+        current = self.documents.get(doc_id)
+        if current and current["hash"] == doc_hash:
+            return "unchanged"
+
+        chunks = split_text(data, self.splitter_cls, self.chunk_size, self.chunk_overlap, source=doc_id)
+        prefix = content_hash(doc_id, doc_hash)[:16]
+        chunk_ids = [f"{prefix}-{i}" for i in range(len(chunks))]
+        for chunk, chunk_id in zip(chunks, chunk_ids):
+            chunk.metadata["chunk_id"] = chunk_id
+        # 새 버전을 먼저 임베딩하고, 다 들어간 뒤에만 이전 버전을 뺌 (중간에 실패해도 이전 버전은 그대로)
+        try:
+            self.db = add_to_faiss(self.db, chunks, self.embeddings)
+        except Exception:
+            self._discard_chunks(chunk_ids)  # 일부만 들어간 새 청크가 manifest 에 없는 채로 남지 않도록
+            raise
+        if current:
+            self.delete_document(doc_id)
+        self.documents[doc_id] = {"hash": doc_hash, "chunk_ids": chunk_ids}
+        return "replaced" if current else "added"
+
+    def _discard_chunks(self, chunk_ids):
+        if self.db is None:
+            return
+        stored = set(self.db.index_to_docstore_id.values())
+        present = [chunk_id for chunk_id in chunk_ids if chunk_id in stored]
+        if present:
+            self.db.delete(present)
+
+    # ➖ 삭제
+    def delete_document(self, doc_id):
+        entry = self.documents.pop(doc_id, None)
+        if entry and entry["chunk_ids"] and self.db is not None:
+            self.db.delete(entry["chunk_ids"])
+        return entry is not None
+
+    # 🔄 폴더 / 업로드 목록과 동기화
+    def sync(self, files):
+        """(doc_id, bytes) 쌍들과 코퍼스를 맞춥니다 (없는 문서는 삭제, 바뀐 문서만 교체).
+
+        files 는 제너레이터여도 되므로 파일을 하나씩 읽어 넘기면 전체를 메모리에 올리지 않습니다.
+        반환값: {"added": [...], "replaced": [...], "deleted": [...], "unchanged": [...]}
+        """
+        result = {"added": [], "replaced": [], "deleted": [], "unchanged": []}
+        seen = set()
+        for doc_id, data in files:
+            seen.add(doc_id)
+            result[self.add_document(doc_id, data)].append(doc_id)
+        for doc_id in list(self.documents):
+            if doc_id not in seen:
+                self.delete_document(doc_id)
+                result["deleted"].append(doc_id)
+        return result
+
+    def sync_directory(self, directory, pattern="*.txt"):
+        """폴더 안의 pattern 에 맞는 파일들과 코퍼스를 맞추고, 바뀐 것이 있으면 저장합니다."""
+        result = self.sync(_iter_files(directory, pattern))
+        if result["added"] or result["replaced"] or result["deleted"]:
+            self.save()
+        return result
+
+    def as_retriever(self, **kwargs):
+        if self.db is None:
+            raise ValueError("코퍼스에 문서가 없습니다.")
+        return self.db.as_retriever(**kwargs)
+
+
+def open_directory_corpus(directory, embeddings, pattern="*.txt", **kwargs):
+    """폴더별 저장 위치(.cache/corpus/<경로 해시>)의 코퍼스를 열고 폴더 내용과 동기화합니다."""
+    path = os.path.join(cache_path("corpus"), content_hash(os.path.abspath(directory))[:16])
+    corpus = CorpusIndex(embeddings, path=path, **kwargs)
+    corpus.sync_directory(directory, pattern)
+    return corpus
+
+
+def _iter_files(directory, pattern):
+    for root, _, names in os.walk(directory):
+        for name in sorted(fnmatch.filter(names, pattern)):
+            file_path = os.path.join(root, name)
+            with open(file_path, "rb") as f:
+                yield os.path.relpath(file_path, directory), f.read()
@@ -0,0 +1,166 @@
+# 🧾 ai_core/data_context.py - 토큰 예산에 맞춘 데이터 컨텍스트 (describe()+head() 프롬프트 대체)
+#
+# df.describe(include='all').to_string() + df.head().to_string() 을 그대로 붙이면
+# 열이 많은 시트는 컨텍스트 창을 넘기고, 열이 적은 시트는 토큰을 낭비합니다.
+# 여기서는 데이터셋마다 한 번만 컬럼별 요약(스키마 + 통계)을 만들어 토큰 수를 재어 두고,
+# 질문마다 관련 있는 컬럼과 대표 행을 골라 budget 토큰 안에 맞춘 텍스트를 만듭니다.
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from ai_core.bm25 import tokenize
+from ai_core.embedding_pipeline import estimate_tokens
+from ai_core.profile import DatasetProfile, get_profile
+
+DEFAULT_BUDGET = int(os.getenv("AI_CONTEXT_TOKENS", "1500"))  # 데이터 컨텍스트에 쓸 최대 토큰
+SCHEMA_SHARE = 0.6          # 예산 중 컬럼 요약에 먼저 쓰는 비율 (나머지는 행)
+MARKER_TOKENS = 40          # "[컬럼 요약]" / 생략 안내 / 행 제목 줄 몫
+MAX_ROWS = 40               # 행 후보 최대 개수
+TOP_VALUES = 3              # 범주형 컬럼 요약에 보여줄 상위 값 개수
+VALUE_INDEX_MAX_UNIQUE = 1000  # 질문 속 값 매칭에 쓸 컬럼의 최대 고유값 수
+
+MEMORY_CACHE_SIZE = 8
+_contexts = OrderedDict()
+_lock = threading.Lock()
+
+
+def _fmt(value):
+    if isinstance(value, (float, np.floating)):
+        return f"{int(value):,}" if float(value).is_integer() else f"{value:,.2f}"
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d") if value == value.normalize() else str(value)
+    return str(value)
+
+
+class DataContext:
+    """DataFrame 하나에 대한 컬럼 요약 / 값 색인. build(question) 으로 프롬프트용 텍스트를 만듭니다."""
+
+    def __init__(self, df, name="", profile=None):
+        self.df = df
+        self.name = name
+        self.profile = profile or DatasetProfile(df)
+        self.header = f"[데이터 개요] {name + ' · ' if name else ''}{len(df):,}행 × {len(df.columns)}열"
+        self.lines = {}        # 컬럼 -> 요약 한 줄
+        self.line_tokens = {}  # 컬럼 -> 요약 토큰 수
+        self.name_tokens = {}  # 컬럼 -> 컬럼 이름 토큰 집합
+        self.values = {}       # 컬럼 -> 질문 매칭용 고유값 문자열 목록
+        self._summarize()
+        self.last_tokens = 0
+        self.last_columns = []
+
+    # 📊 컬럼 요약 (한 번만 계산, 통계는 DatasetProfile 재사용)
+    def _summarize(self):
+        df, profile = self.df, self.profile
+        missing, unique, stats = profile.missing, profile.unique, profile.numeric_describe
+
+        for col in df.columns:
+            series = df[col]
+            head = f"- {col} ({series.dtype}, 결측 {int(missing[col]):,}, 고유 {int(unique[col]):,})"
+            if col in stats.columns:
+                body = " · ".join(f"{label} {_fmt(stats.at[key, col])}"
+                                  for key, label in (("min", "최소"), ("mean", "평균"), ("max", "최대")))
+            elif pd.api.types.is_datetime64_any_dtype(series):
+                body = f"기간 {_fmt(series.min())} ~ {_fmt(series.max())}"
+            else:
+                top = profile.top_values[col].head(TOP_VALUES)
+                body = " ".join(f"{value}({count:,})" for value, count in top.items())
+                if unique[col] <= VALUE_INDEX_MAX_UNIQUE:
+                    self.values[col] = [str(v) for v in series.dropna().unique() if len(str(v)) >= 2]
+            line = f"{head}: {body}" if body else head
+            self.lines[col] = line
+            self.line_tokens[col] = estimate_tokens(line) + 1
+            self.name_tokens[col] = set(tokenize(str(col)))
+
+    # 🎯 질문 관련도
+    def _rank_columns(self, question):
+        if not question:
+            return list(self.df.columns), {}
+        q_tokens = set(tokenize(question))
+        scores, matches = {}, {}
+        for i, col in enumerate(self.df.columns):
+            score = 3.0 * len(q_tokens & self.name_tokens[col])
+            if str(col) in question:
+                score += 5.0
+            hits = [v for v in self.values.get(col, ()) if v in question]
+            if hits:
+                matches[col] = hits
+                score += 4.0 * len(hits)
+            scores[col] = (score, -i)  # 점수가 같으면 원래 순서
+        return sorted(self.df.columns, key=lambda c: scores[c], reverse=True), matches
+
+    def _candidate_rows(self, matches, max_rows):
+        df = self.df
+        picked = []
+        if matches:
+            # 질문에 나온 값과 많이 겹치는 행부터 (예: "서울" + "쏘렌토" 둘 다 맞는 행 우선)
+            score = np.zeros(len(df), dtype=np.int32)
+            for col, values in matches.items():
+                score += df[col].astype(str).isin(values).to_numpy()
+            hits = np.flatnonzero(score)
+            picked = list(hits[np.argsort(-score[hits], kind="stable")][:max_rows])
+        # 나머지는 데이터 전체에서 고르게 (앞쪽 행만 보지 않도록)
+        remaining = max_rows - len(picked)
+        if remaining > 0 and len(df):
+            spread = np.unique(np.linspace(0, len(df) - 1, num=min(remaining, len(df))).astype(int))
+            chosen = set(picked)
+            picked += [i for i in spread if i not in chosen]
+        return picked
+
+    def build(self, question="", budget=DEFAULT_BUDGET, max_rows=MAX_ROWS):
+        """question 과 관련 있는 컬럼 요약 + 대표 행을 budget 토큰 안에서 골라 텍스트로 만듭니다."""
+        ranked, matches = self._rank_columns(question)
+        used = estimate_tokens(self.header) + MARKER_TOKENS
+        schema_budget = max(int(budget * SCHEMA_SHARE), used)
+
+        columns = []
+        for col in ranked:
+            if used + self.line_tokens[col] > schema_budget and columns:
+                break
+            columns.append(col)
+            used += self.line_tokens[col]
+        omitted = len(ranked) - len(columns)
+
+        # 📋 행: 선택된 컬럼만 CSV 로, 예산이 허락하는 만큼
+        rows = self.df.iloc[self._candidate_rows(matches, max_rows)][columns]
+        csv_lines = rows.to_csv(index=False).splitlines()
+        row_lines = []
+        if csv_lines:
+            used += estimate_tokens(csv_lines[0]) + 1
+            for line in csv_lines[1:]:
+                cost = estimate_tokens(line) + 1
+                if used + cost > budget:
+                    break
+                row_lines.append(line)
+                used += cost
+
+        parts = [self.header, "[컬럼 요약]"]
+        parts += [self.lines[col] for col in columns]
+        if omitted:
+            parts.append(f"(질문과 관련이 적은 컬럼 {omitted}개 생략)")
+        if row_lines:
+            parts.append(f"[대표 행 {len(row_lines)}개 / 전체 {len(self.df):,}행]")
+            parts.append(csv_lines[0])
+            parts += row_lines
+        text = "\n".join(parts)
+        self.last_tokens = estimate_tokens(text)
+        self.last_columns = columns
+        return text
+
+
+def get_data_context(df, key, name=""):
+    """key(업로드 내용 해시 등) 별로 DataContext 를 한 번만 만들어 재사용합니다."""
+    with _lock:
+        context = _contexts.get(key)
+        if context is not None:
+            _contexts.move_to_end(key)
+            return context
+    context = DataContext(df, name=name, profile=get_profile(df, key))
+    with _lock:
+        _contexts[key] = context
+        while len(_contexts) > MEMORY_CACHE_SIZE:
+            _contexts.popitem(last=False)
+    return context
@@ -0,0 +1,109 @@
+# 📉 ai_core/downsample.py - 그리기 전에 데이터 줄이기 (집계 / 다운샘플링 / 밀도 격자)
+#
+# sns.barplot 은 모든 행으로 부트스트랩 신뢰구간(기본 1000회 재표본)을 계산하고
+# sns.lineplot / scatterplot 은 모든 점을 그리므로 100만 행 시트에서는 차트 하나에 몇 분이 걸립니다.
+# 여기서는 그리기 전에 pandas/numpy 벡터 연산으로 화면에 필요한 만큼만 남깁니다.
+#   - aggregate         : x(와 hue)별 평균 + 해석적 오차 막대 (정규분포 근사 CI / 표준오차 / 표준편차)
+#   - lttb              : 선 차트 다운샘플링 (Largest-Triangle-Three-Buckets, 모양 보존)
+#   - minmax            : 선 차트 다운샘플링 (구간별 최솟값·최댓값, 튀는 값 보존)
+#   - density_grid      : 산점도 대신 2차원 빈도 격자 (히트맵으로 그림)
+# 모두 행 수에 선형인 벡터 연산 한 번 + 출력 점 수만큼의 반복이라 그리는 시간은 행 수와 거의 무관합니다.
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+
+def errorbar_scale(errorbar):
+    """seaborn 의 errorbar 인자 → (종류, 배수). ("ci", 95) 는 표준오차 × 1.96 으로 계산합니다.
+
+    지원: None, "ci", "se", "sd" 또는 (종류, 값) 튜플. 그 밖의 값("pi" 등)은 오차 막대 없이 그립니다.
+    """
+    if errorbar is None:
+        return None, 0.0
+    kind, value = errorbar if isinstance(errorbar, tuple) else (errorbar, None)
+    if kind == "ci":
+        level = 95 if value is None else value
+        return "se", NormalDist().inv_cdf(0.5 + level / 200)
+    if kind in ("se", "sd"):
+        return kind, 1.0 if value is None else float(value)
+    return None, 0.0
+
+
+def aggregate(df, x, y, hue=None, errorbar=("ci", 95), sort=None, value_name=None):
+    """x(, hue)별 y 평균과 오차 막대 반폭(err) 표. 컬럼: x, (hue), value_name(기본 y), count, err.
+
+    sort=None 이면 seaborn 과 같은 순서 (숫자/날짜 x 는 값 순서, 문자 x 는 처음 나온 순서).
+    y 가 x / hue 와 같은 컬럼이면 평균 컬럼 이름이 겹치지 않도록 value_name 을 따로 줍니다.
+    """
+    keys = [x] if hue is None else [x, hue]
+    value_name = y if value_name is None else value_name
+    if value_name in keys:
+        raise ValueError(f"평균 컬럼 이름 {value_name!r} 이 묶는 컬럼과 겹칩니다 (value_name 을 지정하세요).")
+    if sort is None:
+        sort = pd.api.types.is_numeric_dtype(df[x]) or pd.api.types.is_datetime64_any_dtype(df[x])
+    values = pd.to_numeric(df[y], errors="coerce")
+    grouped = values.groupby([df[k] for k in keys], sort=sort, observed=True)
+    table = grouped.agg(["mean", "count", "std"]).reset_index()
+    table.columns = keys + [value_name, "count", "std"]
+    kind, scale = errorbar_scale(errorbar)
+    if kind == "se":
+        table["err"] = scale * table["std"] / np.sqrt(table["count"].clip(lower=1))
+    elif kind == "sd":
+        table["err"] = scale * table["std"]
+    else:
+        table["err"] = np.nan
+    return table.drop(columns="std")
+
+
+def lttb(x, y, n_out):
+    """LTTB 로 남길 점의 위치(index 배열). x 는 숫자(정렬됨), 처음과 끝 점은 항상 포함."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    every = (n - 2) / (n_out - 2)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = min(int((i + 1) * every) + 1, n - 1)
+        # 다음 구간 평균점 (마지막 구간은 끝 점)
+        next_end = min(int((i + 2) * every) + 1, n - 1)
+        if end < next_end:
+            avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        # 이전에 고른 점 a, 다음 구간 평균점과 만드는 삼각형이 가장 큰 점
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def minmax(y, n_out):
+    """구간마다 최솟값·최댓값 위치를 남기는 다운샘플링 (index 배열, 정렬됨)."""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    kept = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            segment = y[start:end]
+            kept.append(start + int(np.argmin(segment)))
+            kept.append(start + int(np.argmax(segment)))
+    return np.unique(kept)
+
+
+def density_grid(x, y, bins=120):
+    """산점도용 2차원 빈도 (counts, x 경계, y 경계). 결측 / 무한대 행은 제외."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = np.isfinite(x) & np.isfinite(y)
+    return np.histogram2d(x[valid], y[valid], bins=bins)
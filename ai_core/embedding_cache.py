@@ -0,0 +1,145 @@
+# 🧩 ai_core/embedding_cache.py - 청크 단위 임베딩 SQLite 캐시
+#
+# (청크 텍스트, 임베딩 모델) 해시를 키로 벡터를 저장해 두고,
+# 문서를 조금 고쳐서 다시 올리면 바뀐 청크만 실제 임베딩 API 로 보냅니다.
+
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+from langchain.embeddings.base import Embeddings
+
+from ai_core.hashing import content_hash
+from ai_core.paths import cache_path
+
+# 🗄️ 기본 캐시 파일
+DEFAULT_DB_PATH = os.path.join(cache_path("embeddings"), "embeddings.sqlite3")
+
+# 📏 기본 최대 보관 개수 (1536차원 float32 기준 약 6KB/개 → 200,000개 ≒ 1.2GB)
+DEFAULT_MAX_ENTRIES = 200_000
+
+# SQLite 변수 개수 제한을 넘지 않도록 IN (...) 조회를 나눠서 실행
+_SELECT_BATCH = 500
+
+
+def embedding_model_name(embeddings):
+    """임베딩 객체에서 모델 이름을 꺼냅니다 (캐시 키에 포함)."""
+    for attr in ("model", "model_name", "deployment"):
+        name = getattr(embeddings, attr, None)
+        if name:
+            return str(name)
+    return type(embeddings).__name__
+
+
+class CachedEmbeddings(Embeddings):
+    """다른 Embeddings 객체를 감싸 청크 임베딩을 SQLite 에 캐시합니다.
+
+    - 키: sha256(모델 이름, 텍스트)
+    - 제거 정책: max_entries 를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    - hits / misses 카운터로 캐시 효율 확인
+    """
+
+    def __init__(self, underlying, db_path=DEFAULT_DB_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.underlying = underlying
+        self.model = embedding_model_name(underlying)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings(last_access)")
+        self._conn.commit()
+
+    # 🔑 캐시 키
+    def _key(self, text, kind="doc"):
+        return content_hash(kind, self.model, text)
+
+    def _lookup(self, keys):
+        found = {}
+        for i in range(0, len(keys), _SELECT_BATCH):
+            batch = keys[i:i + _SELECT_BATCH]
+            marks = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", batch
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = array("f", blob).tolist()
+        return found
+
+    def _store(self, items):
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+            [(key, array("f", vector).tobytes(), now) for key, vector in items],
+        )
+
+    def _touch(self, keys):
+        now = time.time()
+        self._conn.executemany(
+            "UPDATE embeddings SET last_access = ? WHERE key = ?", [(now, key) for key in keys]
+        )
+
+    def _evict(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if count <= self.max_entries:
+            return
+        # 여유분 10% 까지 한 번에 정리해서 매 호출마다 삭제가 일어나지 않게 함
+        excess = count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (excess,),
+        )
+
+    def _embed_cached(self, texts, kind, embed_fn):
+        keys = [self._key(text, kind) for text in texts]
+        with self._lock:
+            found = self._lookup(list(dict.fromkeys(keys)))
+
+        # 캐시에 없는 텍스트만 (중복 제거 후) 실제 임베딩
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        self.hits += len(keys) - sum(1 for key in keys if key in missing)
+        self.misses += len(missing)
+
+        if missing:
+            vectors = embed_fn(list(missing.values()))
+            new_items = list(zip(missing.keys(), vectors))
+            found.update(new_items)
+
+        with self._lock:
+            if missing:
+                self._store(new_items)
+            self._touch([key for key in found if key not in missing])
+            self._evict()
+            self._conn.commit()
+
+        return [found[key] for key in keys]
+
+    # 🧠 Embeddings 인터페이스
+    def embed_documents(self, texts):
+        return self._embed_cached(list(texts), "doc", self.underlying.embed_documents)
+
+    def embed_query(self, text):
+        return self._embed_cached([text], "query", lambda ts: [self.underlying.embed_query(ts[0])])[0]
+
+    # 📊 캐시 통계
+    def stats(self):
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+        }
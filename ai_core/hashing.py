@@ -0,0 +1,29 @@
+# 🔑 ai_core/hashing.py - 캐시 키용 콘텐츠 해시
+
+import hashlib
+
+
+def content_hash(*parts):
+    """bytes / str / 숫자 조각들을 순서대로 이어 sha256 hex 문자열을 만듭니다."""
+    h = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, (bytes, bytearray, memoryview)):
+            part = str(part).encode("utf-8")
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
+
+def file_hash(source, block_size=1024 * 1024):
+    """파일 경로 또는 바이너리 파일 객체를 블록 단위로 읽어 sha256 hex 를 만듭니다 (전체를 메모리에 올리지 않음)."""
+    h = hashlib.sha256()
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                h.update(block)
+    else:
+        source.seek(0)
+        for block in iter(lambda: source.read(block_size), b""):
+            h.update(block)
+        source.seek(0)
+    return h.hexdigest()
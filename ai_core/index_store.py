@@ -0,0 +1,118 @@
+# 🧠 ai_core/index_store.py - 문서 내용 해시 기반 FAISS 인덱스 디스크 캐시
+#
+# 같은 문서 + 같은 분할 설정 + 같은 임베딩 모델이면 다시 임베딩하지 않고
+# 디스크에 저장해 둔 FAISS 인덱스(index.faiss + docstore)를 FAISS.load_local 로 바로 불러옵니다.
+
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+from langchain.docstore.document import Document
+from langchain.text_splitter import CharacterTextSplitter
+from langchain.vectorstores import FAISS
+
+from ai_core.embedding_cache import embedding_model_name
+from ai_core.embedding_pipeline import build_faiss_index
+from ai_core.hashing import content_hash, file_hash
+from ai_core.paths import cache_path
+from ai_core.stream_loader import iter_documents
+
+# 🗄️ 인덱스 저장 폴더
+INDEX_DIR = cache_path("faiss")
+
+# 🌊 이 크기를 넘는 파일은 통째로 읽지 않고 스트리밍 분할
+STREAMING_THRESHOLD_BYTES = 20 * 1024 * 1024
+
+# ⚡ 프로세스 내 메모리 캐시 (Streamlit 재실행마다 디스크를 다시 읽지 않도록)
+MEMORY_CACHE_SIZE = 8
+_loaded = OrderedDict()
+
+
+def index_key(data, embeddings, splitter_cls, chunk_size, chunk_overlap):
+    """파일 바이트 + 분할 설정 + 임베딩 모델로 인덱스 캐시 키를 만듭니다."""
+    return content_hash(
+        data,
+        splitter_cls.__name__,
+        chunk_size,
+        chunk_overlap,
+        embedding_model_name(embeddings),
+    )
+
+
+def split_text(data, splitter_cls=CharacterTextSplitter, chunk_size=300, chunk_overlap=50, source=None):
+    """바이트(utf-8) 문서를 Document 청크 리스트로 분할합니다."""
+    text = data.decode("utf-8") if isinstance(data, (bytes, bytearray)) else data
+    splitter = splitter_cls(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    return splitter.split_documents([Document(page_content=text, metadata={"source": source or ""})])
+
+
+def _remember(key, db):
+    _loaded[key] = db
+    _loaded.move_to_end(key)
+    while len(_loaded) > MEMORY_CACHE_SIZE:
+        _loaded.popitem(last=False)
+    return db
+
+
+def _load_or_build(key, embeddings, build):
+    # 1️⃣ 메모리 캐시
+    if key in _loaded:
+        _loaded.move_to_end(key)
+        return _loaded[key]
+
+    # 2️⃣ 디스크 캐시
+    path = os.path.join(INDEX_DIR, key)
+    if os.path.exists(os.path.join(path, "index.faiss")):
+        db = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+        return _remember(key, db)
+
+    # 3️⃣ 새로 생성 (배치 동시 임베딩) → 임시 폴더에 저장 후 이름 변경 (동시 실행 시 반쯤 쓴 인덱스 방지)
+    db = build()
+    tmp_dir = tempfile.mkdtemp(dir=INDEX_DIR, prefix=".tmp-")
+    try:
+        db.save_local(tmp_dir)
+        os.replace(tmp_dir, path)
+    except OSError:
+        # 다른 세션이 먼저 같은 키로 저장한 경우
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return _remember(key, db)
+
+
+def load_or_build_index(data, embeddings, splitter_cls=CharacterTextSplitter, chunk_size=300, chunk_overlap=50, source=None):
+    """캐시에 있으면 FAISS 인덱스를 불러오고, 없으면 분할·임베딩 후 디스크에 저장합니다.
+
+    data: 문서 원본 바이트 (업로드 파일의 getvalue() 또는 파일 읽기 결과)
+    """
+    key = index_key(data, embeddings, splitter_cls, chunk_size, chunk_overlap)
+    return _load_or_build(key, embeddings, lambda: build_faiss_index(
+        split_text(data, splitter_cls, chunk_size, chunk_overlap, source), embeddings
+    ))
+
+
+def load_or_build_streaming_index(source, embeddings, chunk_size=300, chunk_overlap=50, name=None):
+    """대용량 텍스트용: 파일을 블록 단위로 읽어 청크를 흘려보내며 인덱스를 만듭니다.
+
+    source: 파일 경로 또는 바이너리 파일 객체 (Streamlit 업로드 파일 등)
+    """
+    key = content_hash(
+        file_hash(source), "StreamingTextSplitter", chunk_size, chunk_overlap, embedding_model_name(embeddings)
+    )
+    return _load_or_build(key, embeddings, lambda: build_faiss_index(
+        iter_documents(source, chunk_size, chunk_overlap, name=name), embeddings
+    ))
+
+
+def load_or_build_index_from_file(path, embeddings, **kwargs):
+    """로컬 텍스트 파일 경로로 인덱스를 불러오거나 만듭니다 (큰 파일은 스트리밍 분할)."""
+    if os.path.getsize(path) > STREAMING_THRESHOLD_BYTES:
+        return load_or_build_streaming_index(
+            path, embeddings,
+            chunk_size=kwargs.get("chunk_size", 300),
+            chunk_overlap=kwargs.get("chunk_overlap", 50),
+            name=kwargs.get("source") or path,
+        )
+    with open(path, "rb") as f:
+        data = f.read()
+    kwargs.setdefault("source", path)
+    return load_or_build_index(data, embeddings, **kwargs)
@@ -0,0 +1,433 @@
+# 📬 ai_core/job_queue.py - SQLite 기반 로컬 작업 큐 (보고서 / PDF 생성을 백그라운드로)
+#
+# 보고서 생성을 버튼 처리 안에서 바로 하면 그동안 화면이 멈추고,
+# 중간에 재실행 / 페이지 이동이 일어나면 하던 작업이 모두 버려집니다.
+# 여기서는 작업을 .cache/jobs/jobs.sqlite3 에 넣고 작업자 프로세스들이 꺼내 실행합니다.
+#   - 작업 ID = (작업 종류, 입력 값) 해시 → 같은 입력의 작업은 한 번만 실행하고 결과를 같이 씀
+#   - 진행률 / 메시지 / 결과(JSON) 는 DB 에, 결과 PDF 는 ai_core.artifacts 에 남으므로 재실행해도 이어서 확인
+#   - 작업자가 죽어 heartbeat 가 끊긴 작업은 다시 대기열로 (최대 MAX_ATTEMPTS 번)
+#   - 작업용으로 저장한 데이터(.cache/jobs/data)는 그 데이터를 기다리는 작업이 모두 끝나면 바로 지우고,
+#     AI_JOB_DAYS(기본 7일)가 지난 끝난 작업 행과 남은 데이터 파일 / AI_JOB_DATA_MB(기본 500MB) 초과분은 정리
+#   - 화면은 show_job(job_id) 으로 진행률을 주기적으로 다시 읽고, 끝나면 결과와 다운로드 버튼 표시
+#
+# 작업자는 처음 작업을 넣을 때 앱 프로세스가 AI_JOB_WORKERS(기본 2)개를 띄웁니다.
+# AI_JOB_WORKERS=0 이면 따로 띄운 작업자만 사용합니다:
+#   python -m ai_core.job_queue --workers 4     (작업자 실행)
+#   python -m ai_core.job_queue --status        (상태별 작업 수)
+#   python -m ai_core.job_queue --prune         (오래된 작업 / 데이터 바로 정리)
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from ai_core.artifacts import artifact_exists, get_artifact
+from ai_core.hashing import content_hash
+from ai_core.paths import cache_path, prune_cache_dir
+
+JOB_WORKERS = int(os.getenv("AI_JOB_WORKERS", "2"))
+POLL_SECONDS = 0.5         # 작업자가 빈 대기열을 다시 확인하는 간격
+HEARTBEAT_SECONDS = 10     # 실행 중 작업의 생존 신호 간격
+STALE_SECONDS = 120        # 이 시간 동안 생존 신호가 없으면 작업자가 죽은 것으로 보고 다시 대기열로
+MAX_ATTEMPTS = 3
+UI_REFRESH_SECONDS = 1.0   # show_job 진행률 갱신 간격
+MAX_AGE_SECONDS = float(os.getenv("AI_JOB_DAYS", "7")) * 24 * 3600
+DATA_MAX_BYTES = int(os.getenv("AI_JOB_DATA_MB", "500")) * 1024 * 1024
+PRUNE_EVERY = 20           # 작업을 몇 번 넣을 때마다 정리할지
+
+JOBS_DIR = cache_path("jobs")
+DATA_DIR = cache_path("jobs", "data")
+DB_PATH = os.path.join(JOBS_DIR, "jobs.sqlite3")
+ACTIVE_STATUSES = ("queued", "running")
+
+# 작업 종류 → "모듈:함수" (작업자 프로세스에서 import 해서 실행)
+JOB_HANDLERS = {
+    "excel_pdf": "ai_core.report_jobs:excel_pdf_report",
+    "insight_pdf": "ai_core.report_jobs:insight_pdf_report",
+    "expert_pdf": "ai_core.report_jobs:expert_pdf_report",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    data_path TEXT,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker INTEGER,
+    created REAL,
+    started REAL,
+    finished REAL,
+    heartbeat REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+"""
+
+_lock = threading.Lock()
+_workers = []
+_schema_ready = False
+_submits = 0
+
+
+def _connect():
+    global _schema_ready
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)  # 자동 커밋, 트랜잭션은 직접 BEGIN
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout = 30000")
+    if not _schema_ready:
+        conn.execute("PRAGMA journal_mode = WAL")  # 작업자가 쓰는 동안에도 화면 쪽 읽기가 막히지 않도록
+        conn.executescript(_SCHEMA)
+        _schema_ready = True
+    return conn
+
+
+class Job:
+    """작업 한 건의 상태 (DB 한 행)."""
+
+    def __init__(self, row):
+        self.id = row["id"]
+        self.kind = row["kind"]
+        self.params = json.loads(row["params"])
+        self.status = row["status"]  # queued / running / done / failed
+        self.progress = row["progress"]
+        self.message = row["message"]
+        self.result = json.loads(row["result"]) if row["result"] else None
+        self.error = row["error"]
+        self.attempts = row["attempts"]
+        self.created = row["created"]
+        self.started = row["started"]
+        self.finished = row["finished"]
+
+    @property
+    def active(self):
+        return self.status in ACTIVE_STATUSES
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+def job_key(kind, params):
+    """작업 ID. params 는 JSON 으로 바꿀 수 있는 값이고, 데이터가 있으면 그 내용 해시(data_key)를 포함해야 합니다."""
+    return content_hash(kind, json.dumps(params, sort_keys=True, ensure_ascii=False))[:32]
+
+
+def submit_job(kind, params, df=None):
+    """작업을 대기열에 넣고 작업 ID 를 돌려줍니다.
+
+    같은 작업이 대기 중 / 실행 중 / 완료면 새로 넣지 않고 그 ID 를 그대로 돌려주고,
+    실패했거나 결과물이 정리되어 사라진 작업은 다시 대기열에 넣습니다.
+    df 는 작업을 대기열에 넣을 때만 작업자가 읽을 수 있도록 .cache/jobs/data/<data_key>.pkl 로 씁니다
+    (같은 데이터의 작업들이 같이 쓰고, 모두 끝나면 지워짐).
+    """
+    global _submits
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"알 수 없는 작업 종류입니다: {kind}")
+    job_id = job_key(kind, params)
+    data_path = os.path.join(DATA_DIR, f"{params['data_key'][:32]}.pkl") if df is not None else None
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT status, result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        queue = row is None or row["status"] == "failed" \
+            or (row["status"] == "done" and not _result_available(row["result"]))
+        if queue and data_path is not None and not os.path.exists(data_path):
+            # DB 쓰기 잠금 안에서 써야 끝나는 작업이 "기다리는 작업 없음" 으로 보고 지우는 것과 엇갈리지 않음
+            tmp = f"{data_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            df.to_pickle(tmp)
+            os.replace(tmp, data_path)
+        if row is None:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, params, data_path, status, created) VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, kind, json.dumps(params, ensure_ascii=False), data_path, now),
+            )
+        elif queue:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', progress = 0, message = '', result = NULL, error = NULL, "
+                "attempts = 0, data_path = ?, created = ?, started = NULL, finished = NULL WHERE id = ?",
+                (data_path, now, job_id),
+            )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    with _lock:
+        _submits += 1
+        due = _submits % PRUNE_EVERY == 1
+    if due:
+        prune_jobs()
+    start_workers()
+    return job_id
+
+
+def _result_available(result):
+    key = (json.loads(result) or {}).get("artifact") if result else None
+    return key is None or artifact_exists(key)
+
+
+def get_job(job_id):
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    return Job(row) if row is not None else None
+
+
+def prune_jobs(max_age=MAX_AGE_SECONDS, max_bytes=DATA_MAX_BYTES):
+    """max_age 초가 지난 끝난 작업 행과, 기다리는 작업이 없는 오래된 / 용량 초과 데이터 파일을 지웁니다.
+
+    (지운 작업 수, 지운 데이터 파일 수, 지운 바이트) 반환. 결과 PDF 는 ai_core.artifacts 가 따로 정리합니다.
+    """
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")  # 정리하는 동안 새 작업이 같은 데이터 파일을 잡지 못하도록
+        deleted = conn.execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished < ?", (time.time() - max_age,)
+        ).rowcount
+        in_use = {os.path.basename(path) for (path,) in conn.execute(
+            "SELECT data_path FROM jobs WHERE data_path IS NOT NULL AND status IN (?, ?)", ACTIVE_STATUSES
+        )}
+        removed, freed = prune_cache_dir(DATA_DIR, max_bytes, max_age, keep=in_use)
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return deleted, removed, freed
+
+
+def queue_status():
+    """상태별 작업 수."""
+    conn = _connect()
+    try:
+        return dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+    finally:
+        conn.close()
+
+
+# 🧰 작업자 쪽
+class JobContext:
+    """핸들러에 넘기는 작업 정보 + 진행률 기록."""
+
+    def __init__(self, job_id, kind, params, data_path):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.data_path = data_path
+
+    def load_data(self):
+        return pd.read_pickle(self.data_path)
+
+    def progress(self, fraction, message="", partial=None):
+        """진행률(0~1)과 메시지를 남깁니다. partial(dict)을 주면 끝나기 전에도 화면에 보여줄 중간 결과로 저장."""
+        fields = {"progress": min(max(fraction, 0.0), 1.0), "message": message, "heartbeat": time.time()}
+        if partial is not None:
+            fields["result"] = json.dumps(partial, ensure_ascii=False)
+        _update(self.id, **fields)
+
+
+def _update(job_id, **fields):
+    columns = ", ".join(f"{name} = ?" for name in fields)
+    conn = _connect()
+    try:
+        conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+    finally:
+        conn.close()
+
+
+def _finish(job, **fields):
+    """끝난 상태를 기록하고, 같은 데이터 파일을 기다리는 다른 작업이 없으면 그 파일을 지웁니다."""
+    columns = ", ".join(f"{name} = ?" for name in fields)
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job.id))
+        if job.data_path:
+            waiting = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE data_path = ? AND status IN (?, ?)", (job.data_path, *ACTIVE_STATUSES)
+            ).fetchone()[0]
+            if not waiting:
+                try:
+                    os.remove(job.data_path)
+                except FileNotFoundError:
+                    pass
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def _requeue_stale(conn):
+    # 작업자가 죽어 생존 신호가 끊긴 작업: 다시 대기열로 (시도 횟수를 넘기면 실패 처리)
+    cutoff = time.time() - STALE_SECONDS
+    conn.execute(
+        "UPDATE jobs SET status = 'failed', error = '작업자가 응답하지 않아 중단되었습니다.', finished = ? "
+        "WHERE status = 'running' AND heartbeat < ? AND attempts >= ?",
+        (time.time(), cutoff, MAX_ATTEMPTS),
+    )
+    conn.execute(
+        "UPDATE jobs SET status = 'queued', progress = 0, message = '다시 대기 중' "
+        "WHERE status = 'running' AND heartbeat < ?",
+        (cutoff,),
+    )
+
+
+def _claim():
+    """가장 오래된 대기 작업 하나를 이 작업자 것으로 표시하고 돌려줍니다 (없으면 None)."""
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        _requeue_stale(conn)
+        row = conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1").fetchone()
+        if row is not None:
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, started = ?, "
+                "heartbeat = ?, message = '시작' WHERE id = ?",
+                (os.getpid(), now, now, row["id"]),
+            )
+        conn.execute("COMMIT")
+        return row
+    finally:
+        conn.close()
+
+
+def _resolve(kind):
+    module, name = JOB_HANDLERS[kind].split(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def run_job(row):
+    """작업 한 건 실행 (핸들러가 돌려준 dict 를 결과로 저장)."""
+    job = JobContext(row["id"], row["kind"], json.loads(row["params"]), row["data_path"])
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(HEARTBEAT_SECONDS):
+            _update(job.id, heartbeat=time.time())
+
+    threading.Thread(target=beat, daemon=True).start()
+    try:
+        result = _resolve(job.kind)(job)
+        _finish(job, status="done", progress=1.0, message="완료", finished=time.time(),
+                result=json.dumps(result or {}, ensure_ascii=False))
+    except Exception as e:
+        _finish(job, status="failed", message="실패", finished=time.time(), error=f"{type(e).__name__}: {e}")
+    finally:
+        stop.set()
+
+
+def worker_loop(stop=None):
+    """대기열에서 작업을 꺼내 실행하는 작업자 루프 (stop 이벤트가 설정될 때까지)."""
+    while stop is None or not stop.is_set():
+        row = _claim()
+        if row is None:
+            time.sleep(POLL_SECONDS)
+            continue
+        run_job(row)
+
+
+def start_workers(count=None):
+    """이 프로세스가 띄운 작업자가 없으면 count(기본 AI_JOB_WORKERS)개를 띄웁니다."""
+    count = JOB_WORKERS if count is None else count
+    with _lock:
+        _workers[:] = [p for p in _workers if p.is_alive()]
+        context = multiprocessing.get_context("spawn")  # Streamlit 스레드 상태를 물려받지 않도록
+        while len(_workers) < count:
+            process = context.Process(target=worker_loop, daemon=True)
+            process.start()
+            _workers.append(process)
+
+
+def show_job(job_id):
+    """Streamlit: 작업 진행률을 보여주고, 끝나면 결과 절 / 캡션 / 다운로드 버튼을 그립니다.
+
+    st.fragment 가 있으면 이 부분만 주기적으로 다시 실행하고, 없으면 페이지 전체를 다시 실행합니다.
+    """
+    import streamlit as st
+
+    def render_sections(result):
+        for title, text in result.get("sections", []):
+            st.markdown(f"**{title}**")
+            st.write(text)
+
+    def render_result(job):
+        if job.status == "failed":
+            st.error(f"❌ 보고서 생성 실패: {job.error}")
+            return
+        result = job.result or {}
+        render_sections(result)
+        if result.get("caption"):
+            st.caption(result["caption"])
+        st.caption(f"📬 백그라운드 작업 · {job.elapsed:.1f}초")
+        data = get_artifact(result["artifact"]) if result.get("artifact") else None
+        if data is not None:
+            st.success("📄 보고서 생성 완료!")
+            name = result.get("file_name") or result["artifact"]
+            st.download_button("📥 PDF 다운로드", data=data, file_name=name, mime="application/pdf", key=f"download-{job.id}")
+
+    def render_progress(job):
+        waiting = "대기 중" if job.status == "queued" else job.message or "진행 중"
+        st.progress(job.progress, text=f"⏳ {waiting} ({job.progress:.0%})")
+        render_sections(job.result or {})  # 먼저 끝난 부분
+
+    job = get_job(job_id)
+    if job is None:
+        return None
+    if not job.active:
+        render_result(job)
+        return job
+
+    fragment = getattr(st, "fragment", None)
+    if fragment is None:
+        render_progress(job)
+        time.sleep(UI_REFRESH_SECONDS)
+        st.rerun()
+
+    @fragment(run_every=UI_REFRESH_SECONDS)
+    def poll():
+        current = get_job(job_id)
+        if current is not None and current.active:
+            render_progress(current)
+        else:
+            st.rerun()  # 끝나면(또는 정리되어 사라지면) 페이지 전체를 다시 그려 결과를 고정 표시
+
+    poll()
+    return job
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보고서 작업 큐 작업자")
+    parser.add_argument("--workers", type=int, default=max(JOB_WORKERS, 1))
+    parser.add_argument("--status", action="store_true", help="상태별 작업 수만 출력")
+    parser.add_argument("--prune", action="store_true", help="오래된 작업 / 데이터 파일 정리")
+    args = parser.parse_args()
+    if args.status or args.prune:
+        if args.prune:
+            deleted, removed, freed = prune_jobs()
+            print(f"정리: 작업 {deleted}개, 데이터 {removed}개 ({freed / 1024 / 1024:.1f}MB)")
+        print(queue_status())
+        return
+    start_workers(args.workers)
+    print(f"작업자 {args.workers}개 실행 중 ({DB_PATH}) - Ctrl+C 로 종료")
+    try:
+        while True:
+            time.sleep(1)
+            start_workers(args.workers)  # 죽은 작업자는 다시 띄움
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
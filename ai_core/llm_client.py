@@ -0,0 +1,177 @@
+# 🤖 ai_core/llm_client.py - 공용 LLM 클라이언트 + 모델 레지스트리
+#
+# 모든 앱이 ChatOpenAI / OpenAI / OpenAIEmbeddings 를 각자 만들던 것을 여기서 한 번에 관리합니다.
+#   - keep-alive 연결 풀을 가진 httpx 클라이언트 하나를 프로세스 전체가 공유 (매번 TLS 핸드셰이크 X)
+#     (langchain 래퍼에는 http_client 대신 이 풀을 쓰는 openai 클라이언트를 client / async_client 로 넘김 -
+#      community 래퍼는 http_client 하나를 OpenAI 와 AsyncOpenAI 양쪽에 넘겨 동기 httpx.Client 면 검증 오류)
+#   - 모델 이름 / temperature / 타임아웃 / 재시도 횟수는 MODEL_REGISTRY 한 곳에서 조정
+#   - ai_core 모듈은 프로세스당 한 번만 import 되므로, Streamlit 재실행 때도 같은 객체를 재사용
+#
+# 환경 변수로 덮어쓰기:
+#   AI_MODEL_<프로필>        예) AI_MODEL_CHAT=gpt-4o-mini
+#   AI_HTTP_MAX_CONNECTIONS  동시 연결 수 (기본 20)
+#   AI_HTTP_TIMEOUT          요청 타임아웃 초 (기본 60)
+
+import os
+import threading
+
+import httpx
+from dotenv import load_dotenv
+from langchain.chat_models import ChatOpenAI
+from langchain.embeddings import OpenAIEmbeddings
+from langchain.llms import OpenAI
+
+from ai_core.embedding_cache import CachedEmbeddings
+
+load_dotenv()
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("AI_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_TIMEOUT = float(os.getenv("AI_HTTP_TIMEOUT", "60"))
+MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "3"))
+
+# 📚 모델 레지스트리 (프로필 이름 → 설정)
+MODEL_REGISTRY = {
+    # 일반 분석/설명용 채팅 모델
+    "chat": {"kind": "chat", "model": "gpt-3.5-turbo", "temperature": 0.2},
+    # 보고서·발표자료처럼 문장이 긴 생성용
+    "report": {"kind": "chat", "model": "gpt-3.5-turbo", "temperature": 0.3},
+    # pandas 에이전트 등 결정적인 답이 필요한 경우
+    "agent": {"kind": "chat", "model": "gpt-3.5-turbo", "temperature": 0},
+    # 번역기 (temperature 없음 = 서버 기본값, 기존 translatol.py 와 같은 출력)
+    "translate": {"kind": "chat", "model": "gpt-3.5-turbo"},
+    # langchain OpenAI(completion) 기반 스크립트
+    "completion": {"kind": "completion", "model": "gpt-3.5-turbo-instruct", "temperature": 0.7},
+    # 문서 임베딩
+    "embedding": {"kind": "embedding", "model": "text-embedding-ada-002"},
+}
+
+_lock = threading.Lock()
+_http_client = None
+_async_http_client = None
+_instances = {}
+
+
+def _limits():
+    return httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+
+
+def get_http_client():
+    """프로세스 공용 keep-alive httpx 클라이언트."""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(timeout=HTTP_TIMEOUT, limits=_limits())
+        return _http_client
+
+
+def get_async_http_client():
+    """프로세스 공용 httpx.AsyncClient (langchain 의 ainvoke / abatch 등 비동기 호출용)."""
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None:
+            _async_http_client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=_limits())
+        return _async_http_client
+
+
+def model_config(profile, **overrides):
+    """레지스트리 설정 + 환경 변수(AI_MODEL_<프로필>) + 호출별 덮어쓰기를 합친 설정."""
+    if profile not in MODEL_REGISTRY:
+        raise KeyError(f"등록되지 않은 모델 프로필입니다: {profile}")
+    config = dict(MODEL_REGISTRY[profile])
+    env_model = os.getenv(f"AI_MODEL_{profile.upper()}")
+    if env_model:
+        config["model"] = env_model
+    config.update(overrides)
+    return config
+
+
+def _build(config):
+    common = {
+        "openai_api_key": os.getenv("OPENAI_API_KEY"),
+        "request_timeout": HTTP_TIMEOUT,
+        "max_retries": MAX_RETRIES,
+    }
+    if "temperature" in config:
+        common["temperature"] = config["temperature"]
+    client, async_client = get_openai_client(), get_async_openai_client()
+    kind = config["kind"]
+    if kind == "chat":
+        return ChatOpenAI(model_name=config["model"], client=client.chat.completions,
+                          async_client=async_client.chat.completions, **common)
+    if kind == "completion":
+        return OpenAI(model_name=config["model"], client=client.completions,
+                      async_client=async_client.completions, **common)
+    if kind == "embedding":
+        return OpenAIEmbeddings(model=config["model"], client=client.embeddings,
+                                async_client=async_client.embeddings, **common)
+    raise ValueError(f"알 수 없는 모델 종류입니다: {kind}")
+
+
+def _get(profile, **overrides):
+    config = model_config(profile, **overrides)
+    key = tuple(sorted(config.items()))
+    with _lock:
+        instance = _instances.get(key)
+    if instance is None:
+        instance = _build(config)
+        with _lock:
+            instance = _instances.setdefault(key, instance)
+    return instance
+
+
+def get_chat_model(profile="chat", **overrides):
+    """채팅 모델 (langchain ChatOpenAI). 예) get_chat_model("report")"""
+    return _get(profile, **overrides)
+
+
+def get_llm(profile="completion", **overrides):
+    """completion 모델 (langchain OpenAI)."""
+    return _get(profile, **overrides)
+
+
+def get_embeddings(profile="embedding", cached=True):
+    """임베딩 모델. cached=True 면 청크 단위 SQLite 캐시로 감싼 공용 객체를 반환합니다."""
+    embeddings = _get(profile)
+    if not cached:
+        return embeddings
+    key = ("cached", profile)
+    with _lock:
+        if key not in _instances:
+            _instances[key] = CachedEmbeddings(embeddings)
+        return _instances[key]
+
+
+def get_openai_client():
+    """공용 연결 풀을 쓰는 원본 openai 클라이언트 (langchain 래퍼 / langchain 없이 직접 호출하는 스크립트용)."""
+    from openai import OpenAI as OpenAIClient
+
+    with _lock:
+        client = _instances.get("openai_client")
+    if client is None:  # get_http_client 도 _lock 을 잡으므로 락 밖에서 생성
+        client = OpenAIClient(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=HTTP_TIMEOUT,
+            max_retries=MAX_RETRIES,
+            http_client=get_http_client(),
+        )
+        with _lock:
+            client = _instances.setdefault("openai_client", client)
+    return client
+
+
+def get_async_openai_client():
+    """공용 비동기 연결 풀을 쓰는 원본 openai.AsyncOpenAI 클라이언트."""
+    from openai import AsyncOpenAI
+
+    with _lock:
+        client = _instances.get("async_openai_client")
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=HTTP_TIMEOUT,
+            max_retries=MAX_RETRIES,
+            http_client=get_async_http_client(),
+        )
+        with _lock:
+            client = _instances.setdefault("async_openai_client", client)
+    return client
@@ -0,0 +1,78 @@
+# 📁 ai_core/paths.py - 저장소 기준 경로 및 로컬 캐시 디렉터리
+
+import os
+import shutil
+import time
+
+# 📌 저장소 루트 (ai_core 상위 폴더)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 🗄️ 캐시 루트 (환경 변수 AI_CACHE_DIR 로 변경 가능)
+CACHE_DIR = os.getenv("AI_CACHE_DIR", os.path.join(ROOT_DIR, ".cache"))
+
+
+def cache_path(*parts):
+    """CACHE_DIR 아래 하위 폴더 경로를 만들고(없으면 생성) 반환합니다."""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _tree_size(path):
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.stat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                continue
+    return size
+
+
+def cache_entries(directory):
+    """폴더 안 항목의 (마지막 사용 시각, 크기, 이름) 목록 - 오래 쓰이지 않은 것부터 (쓰는 중인 .tmp 제외).
+
+    하위 폴더는 한 항목으로 봅니다 (크기는 안의 파일 합계, 사용 시각은 폴더의 mtime).
+    """
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(".tmp"):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        size = _tree_size(path) if os.path.isdir(path) else stat.st_size
+        entries.append((stat.st_mtime, size, name))
+    return sorted(entries)
+
+
+def prune_cache_dir(directory, max_bytes, max_age, keep=None):
+    """max_age 초 동안 쓰이지 않은 항목과 max_bytes 초과분(LRU)을 지웁니다. (지운 개수, 지운 바이트) 반환.
+
+    keep 은 남길 이름 하나 또는 이름 모음 (방금 쓴 파일 / 아직 쓰는 중인 파일 등).
+    """
+    keep = {keep} if isinstance(keep, str) else set(keep or ())
+    entries = cache_entries(directory)
+    total = sum(size for _, size, _ in entries)
+    # 넘었으면 여유분 10% 까지 한 번에 정리해서 매번 삭제가 일어나지 않게 함
+    target = total if total <= max_bytes else int(max_bytes * 0.9)
+    now = time.time()
+    removed, freed = 0, 0
+    for mtime, size, name in entries:
+        expired = now - mtime > max_age
+        over = total - freed > target
+        if name in keep or not (expired or over):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except OSError:  # 이미 지워졌거나 (Windows 에서) 다른 프로세스가 열고 있음 → 다음 정리 때
+            continue
+        removed += 1
+        freed += size
+    return removed, freed
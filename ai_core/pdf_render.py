@@ -0,0 +1,235 @@
+# 🖨️ ai_core/pdf_render.py - 한글 PDF 보고서 공용 폰트 / 레이아웃
+#
+# 보고서마다 FPDF() + add_font("batang", fname="./csv_app/fonts/batang.ttc", uni=True) 를 새로 하면
+# 큰 CJK 폰트를 매번 다시 파싱(글자 폭 / cmap 계산)하고, batang.ttc 는 저장소에 없어서 바로 실패하며,
+# 최신 fpdf2 에서는 uni 인자 자체가 없어져 TypeError 가 납니다.
+# 여기서는
+#   - 쓸 폰트를 처음 한 번 확인해서(파일 존재 + 한글 글리프) 없으면 저장소의 Nanum 폰트로 대체하고
+#   - 파싱한 폰트(글자 폭 / cmap / 글리프 ID)를 프로세스당 한 번만 만들어 두었다가
+#     보고서마다 문서별 상태(서브셋 / 원본 TTFont)만 새로 붙인 복사본을 등록하고
+#     (fpdf2 내부 TTFFont 구조에 기대므로 requirements.txt 에 고정한 버전이고 속성 목록이 정확히 같을 때만,
+#      아니면 확인해 둔 폰트 경로로 보통의 add_font)
+#   - 여백 / 쪽 번호 / 제목·본문 크기를 ReportPDF 레이아웃 하나로 모든 보고서가 같이 씁니다.
+# 차트는 이미지 바이트로 바로 넣고 PDF 도 pdf_bytes() 로 메모리에서 받으므로 작업 디렉터리에 파일을 쓰지 않습니다.
+# python -m ai_core.pdf_render 로 사용 중인 폰트와 보고서 한 건 생성 시간을 확인할 수 있습니다.
+
+import copy
+import io
+import os
+import threading
+import time
+import warnings
+
+from ai_core.paths import ROOT_DIR
+
+FONTS_DIR = os.path.join(ROOT_DIR, "csv_app", "fonts")
+FONT_FAMILY = "korean"
+
+# 역할 → 후보 폰트 (앞에서부터 확인, 환경 변수로 원하는 폰트를 맨 앞에 둘 수 있음)
+FONT_CANDIDATES = {
+    "": [os.getenv("AI_PDF_FONT"), os.path.join(FONTS_DIR, "batang.ttc"),
+         os.path.join(FONTS_DIR, "NanumGothic-Regular.ttf")],
+    "B": [os.getenv("AI_PDF_FONT_BOLD"), os.path.join(FONTS_DIR, "NanumGothic-Bold.ttf")],
+}
+
+TITLE_SIZE = 16
+HEADING_SIZE = 13
+BODY_SIZE = 11
+LINE_HEIGHT = 7
+MARGIN = 15
+
+# 복사본 등록이 검증된 fpdf2 버전과 그 TTFFont 속성(__slots__) 목록 - 버전을 올리면 함께 확인해서 갱신
+FPDF_VERSION = "2.8.9"
+TTFFONT_SLOTS = frozenset((
+    "i", "type", "name", "desc", "glyph_ids", "_hbfont", "sp", "ss", "up", "ut", "cw", "ttffile", "fontkey",
+    "emphasis", "scale", "subset", "cmap", "ttfont", "missing_glyphs", "biggest_size_pt", "color_font",
+    "unicode_range", "palette_index", "is_compressed", "is_cff", "is_cid_keyed", "is_symbol", "cff_ros",
+    "collection_font_number",
+))
+
+_lock = threading.RLock()
+_fonts = None       # 스타일 → 확인된 폰트 경로
+_prototypes = {}    # 스타일 → 파싱해 둔 TTFFont
+_fast_path = None   # 복사본 등록을 써도 되는지 (처음 한 번 확인)
+
+
+def _usable(path):
+    # 파일이 있고 fontTools 로 열리며 한글('가') 글리프가 있는 폰트만 사용
+    if not path or not os.path.exists(path):
+        return False
+    try:
+        from fontTools.ttLib import TTFont
+
+        font = TTFont(path, lazy=True, fontNumber=0)
+        try:
+            return ord("가") in (font.getBestCmap() or {})
+        finally:
+            font.close()
+    except Exception:
+        return False
+
+
+def resolve_fonts():
+    """스타일별로 사용할 폰트 경로 (처음 한 번 확인, 대체되면 경고)."""
+    global _fonts
+    with _lock:
+        if _fonts is not None:
+            return _fonts
+        fonts = {}
+        for style, candidates in FONT_CANDIDATES.items():
+            candidates = [c for c in candidates if c]
+            chosen = next((c for c in candidates if _usable(c)), None)
+            if chosen is None and style:
+                chosen = fonts.get("")  # 굵은 폰트가 없으면 보통 폰트로
+            if chosen is None:
+                raise FileNotFoundError(f"한글 PDF 폰트를 찾을 수 없습니다: {candidates}")
+            if candidates and chosen != candidates[0]:
+                warnings.warn(f"PDF 폰트 {candidates[0]} 대신 {chosen} 를 사용합니다.")
+            fonts[style] = chosen
+        _fonts = fonts
+        return fonts
+
+
+def _prototype(style):
+    # 스타일별 파싱된 폰트 (프로세스당 한 번)
+    from fpdf import FPDF
+
+    with _lock:
+        proto = _prototypes.get(style)
+        if proto is None:
+            scratch = FPDF()
+            scratch.add_font(FONT_FAMILY, style, resolve_fonts()[style])
+            proto = _prototypes[style] = scratch.fonts[f"{FONT_FAMILY}{style}"]
+        return proto
+
+
+def _can_copy_fonts():
+    # 설치된 fpdf2 가 고정 버전이고 TTFFont 속성 목록이 정확히 같을 때만 복사본 등록
+    global _fast_path
+    with _lock:
+        if _fast_path is not None:
+            return _fast_path
+        try:
+            import fpdf
+            from fpdf.fonts import TTFFont
+
+            slots = set()
+            for cls in TTFFont.__mro__:
+                slots.update(getattr(cls, "__slots__", ()))
+            _fast_path = fpdf.__version__ == FPDF_VERSION and slots == TTFFONT_SLOTS
+        except (ImportError, AttributeError):
+            _fast_path = False
+        if not _fast_path:
+            warnings.warn(f"fpdf2 가 검증된 {FPDF_VERSION} 과 달라 보고서마다 PDF 폰트를 새로 등록합니다 (느림).")
+        return _fast_path
+
+
+def _register(pdf, style):
+    """pdf 에 파싱해 둔 폰트의 복사본을 등록합니다 (검증된 fpdf2 가 아니면 add_font 로)."""
+    path = resolve_fonts()[style]
+    if not _can_copy_fonts():
+        pdf.add_font(FONT_FAMILY, style, path)
+        return
+    from fontTools.ttLib import TTFont
+    from fpdf.fonts import SubsetMap
+
+    proto = _prototype(style)
+    font = copy.copy(proto)  # 글자 폭 / cmap / 글리프 ID 는 공유 (읽기 전용)
+    font.i = len(pdf.fonts) + 1
+    # 출력할 때 서브셋이 TTFont 를 제자리에서 줄이므로 문서마다 새로 (lazy 라 파일 헤더만 읽음)
+    font.ttfont = TTFont(path, recalcTimestamp=False, lazy=True, fontNumber=proto.collection_font_number)
+    font.subset = SubsetMap(font)
+    font.missing_glyphs = []
+    font.biggest_size_pt = 0
+    font._hbfont = None
+    pdf.fonts[proto.fontkey] = font
+
+
+def _new_pdf_class():
+    from fpdf import FPDF
+
+    class ReportPDF(FPDF):
+        """공용 보고서 레이아웃: A4, 여백 15mm, 쪽 번호, 제목 / 소제목 / 본문 / 이미지."""
+
+        def __init__(self, title=""):
+            super().__init__(format="A4")
+            if title:
+                self.set_title(title)
+            self.set_margins(MARGIN, MARGIN, MARGIN)
+            self.set_auto_page_break(True, margin=MARGIN)
+            for style in FONT_CANDIDATES:
+                _register(self, style)
+            self._glyphs = set(self.fonts[FONT_FAMILY].cmap)
+            self.set_font(FONT_FAMILY, size=BODY_SIZE)
+
+        def footer(self):
+            self.set_y(-MARGIN + 3)
+            self.set_font(FONT_FAMILY, size=8)
+            self.cell(0, 5, f"- {self.page_no()} -", align="C")
+
+        def printable(self, text):
+            """폰트에 없는 글자(이모지 등)는 빼고 출력 (빈 네모 / 누락 경고 방지)."""
+            return "".join(c for c in str(text) if c in "\n\t" or ord(c) in self._glyphs).strip(" ")
+
+        def heading(self, text, level=1):
+            """level 0 = 보고서 제목, 1 = 절 제목."""
+            size = TITLE_SIZE if level == 0 else HEADING_SIZE
+            self.ln(0 if level == 0 else 2)
+            self.set_font(FONT_FAMILY, "B", size)
+            self.multi_cell(0, size * 0.6, self.printable(text), new_x="LMARGIN", new_y="NEXT")
+            self.ln(2 if level == 0 else 0)
+
+        def paragraph(self, text, size=BODY_SIZE):
+            self.set_font(FONT_FAMILY, size=size)
+            self.multi_cell(0, LINE_HEIGHT, self.printable(text), new_x="LMARGIN", new_y="NEXT")
+
+        def image_full(self, image):
+            """본문 폭에 맞춘 이미지 (파일 경로 또는 render_chart 가 돌려준 바이트)."""
+            if isinstance(image, (bytes, bytearray)):
+                image = io.BytesIO(image)
+            self.ln(3)
+            self.image(image, x=self.l_margin, w=self.epw)
+
+    return ReportPDF
+
+
+_report_class = None
+
+
+def new_report(title=""):
+    """빈 보고서 PDF (폰트 등록 + 첫 페이지 + 제목). 이후 heading / paragraph / image_full / output."""
+    global _report_class
+    if _report_class is None:
+        _report_class = _new_pdf_class()
+    pdf = _report_class(title)
+    pdf.add_page()
+    if title:
+        pdf.heading(title, level=0)
+    return pdf
+
+
+def pdf_bytes(pdf):
+    """완성된 PDF 를 파일 없이 바이트로 (st.download_button / put_artifact 에 그대로 전달)."""
+    return bytes(pdf.output())
+
+
+def preload_fonts():
+    """폰트 확인 + 파싱을 미리 해 둡니다 (작업자 시작 시 첫 보고서가 느려지지 않도록)."""
+    fonts = resolve_fonts()
+    if _can_copy_fonts():
+        for style in FONT_CANDIDATES:
+            _prototype(style)
+    return fonts
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    print(preload_fonts(), f"(확인 + 파싱 {time.perf_counter() - started:.2f}s)")
+    body = "매출은 전년 대비 12% 증가했고 서울·부산 지역 판매량이 가장 높았습니다. " * 200
+    for i in range(3):
+        started = time.perf_counter()
+        pdf = new_report("📘 테스트 보고서")
+        pdf.heading("1. 📊 데이터 개요")
+        pdf.paragraph(body)
+        pdf_bytes(pdf)
+        print(f"보고서 {i + 1}: {time.perf_counter() - started:.3f}s")
@@ -0,0 +1,317 @@
+# 📊 ai_core/profile.py - 데이터셋 프로파일 (EDA 표 / 히트맵 / GPT 프롬프트 / PDF 보고서 공용)
+#
+# describe(include="all") 와 corr(numeric_only=True) 를 버튼을 누를 때마다, 그리고 프롬프트 문자열을
+# 만들 때 또 한 번 계산하던 것을 데이터셋(업로드 내용 해시)당 한 번만 계산해 재사용합니다.
+# 숫자 컬럼 요약(describe()) 은 describe(include="all") 결과에서 잘라 쓰므로 다시 계산하지 않습니다.
+#
+# 🌊 스트리밍 프로파일: DataFrame 하나로 올리기엔 너무 큰 파일은 청크 단위로 읽으며
+# ai_core.sketches 의 병합 가능한 스케치로 같은 모양의 프로파일(describe / missing / unique / corr / top_values)을
+# 만듭니다. 근사값(분위수, 고유값 수, 상위 값 빈도)에는 annotate() 로 오차 범위를 함께 표시합니다.
+
+import os
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from ai_core.hashing import content_hash
+from ai_core.ingest import iter_csv_chunks, iter_excel_chunks, load_csv, load_excel, source_hash, source_size
+from ai_core.sketches import BottomKSample, HyperLogLog, KLLSketch, PairwiseCorrelation, RunningMoments, TopK
+
+TOP_K = 5
+NUMERIC_STATS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+DESCRIBE_ROWS = ["count", "unique", "top", "freq"] + NUMERIC_STATS[1:]
+
+# 🌊 이 크기(MB)를 넘는 업로드는 전체를 읽지 않고 스트리밍 프로파일 + 표본 행으로 분석
+STREAMING_THRESHOLD_MB = float(os.getenv("AI_STREAMING_PROFILE_MB", "50"))
+SAMPLE_ROWS = 50_000        # 미리보기 / 차트 / 에이전트용 표본 행 수
+QUANTILE_K = 200            # KLL 정확도 (순위 오차 약 ±1.3%)
+HLL_PRECISION = 14          # HyperLogLog 레지스터 2^14 개 (상대 오차 약 ±0.8%)
+TOPK_CAPACITY = 64          # 컬럼별로 추적하는 빈도 후보 수
+
+MEMORY_CACHE_SIZE = 8
+_profiles = OrderedDict()
+_lock = threading.Lock()
+
+
+class DatasetProfile:
+    """DataFrame 한 개의 컬럼별 통계 / 결측 / 고유값 수 / 상관행렬 / 상위 값."""
+
+    approximate = False
+    note = ""
+
+    def __init__(self, df, top_k=TOP_K):
+        self.n_rows, self.n_cols = df.shape
+        self.columns = list(df.columns)
+        self.numeric_columns = [
+            c for c in df.columns
+            if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])
+        ]
+        self.dtypes = df.dtypes
+        self.describe = df.describe(include="all")  # 📋 EDA 표 (전체 컬럼)
+        self.missing = df.isna().sum()
+        self.unique = df.nunique(dropna=True)
+        self.corr = df[self.numeric_columns].corr()  # 🔥 히트맵 / 상관관계 프롬프트
+        self.top_values = {
+            col: df[col].value_counts(dropna=True).head(top_k)
+            for col in df.columns if col not in self.numeric_columns
+        }
+
+    @cached_property
+    def numeric_describe(self):
+        """df.describe() 와 같은 숫자 컬럼 요약 (describe(include="all") 에서 잘라 씀)."""
+        rows = [r for r in NUMERIC_STATS if r in self.describe.index]
+        return self.describe.loc[rows, self.numeric_columns].astype(float)
+
+    @cached_property
+    def describe_text(self):
+        return self.describe.to_string()
+
+    @cached_property
+    def numeric_describe_text(self):
+        return self.numeric_describe.to_string()
+
+    @cached_property
+    def corr_text(self):
+        return self.corr.to_string()
+
+    def corr_subset(self, columns):
+        """선택한 숫자 컬럼끼리의 상관행렬 (전체 행렬에서 잘라 씀)."""
+        columns = [c for c in columns if c in self.corr.columns]
+        return self.corr.loc[columns, columns]
+
+    def numeric_describe_subset(self, columns):
+        columns = [c for c in columns if c in self.numeric_describe.columns]
+        return self.numeric_describe[columns]
+
+    def annotate(self, table):
+        """화면 표시용 표 (정확한 프로파일은 그대로)."""
+        return table
+
+
+def _fmt(value):
+    if isinstance(value, (int, np.integer)):
+        return f"{value:,}"
+    if isinstance(value, (float, np.floating)):
+        return f"{int(value):,}" if float(value).is_integer() else f"{value:,.4g}"
+    return str(value)
+
+
+class StreamingProfile(DatasetProfile):
+    """StreamingProfiler 가 청크를 다 읽은 뒤 만든 프로파일 (DatasetProfile 과 같은 속성).
+
+    count / mean / std / min / max / 결측 / 상관행렬은 정확하고,
+    분위수(25/50/75%) · 고유값 수 · 최빈값 빈도는 근사값이라 bounds 에 오차 범위를 담습니다.
+    sample 은 균등 무작위 표본 행(미리보기 / 차트용)입니다.
+    """
+
+    approximate = True
+
+    def __init__(self, profiler, top_k=TOP_K):
+        p = profiler
+        self.n_rows, self.n_cols = p.n_rows, len(p.columns)
+        self.columns = list(p.columns)
+        self.numeric_columns = list(p.numeric_columns)
+        self.dtypes = p.dtypes
+        self.missing = pd.Series(p.missing, index=self.columns).astype(int)
+        self.unique = pd.Series({c: int(round(p.distinct[c].estimate())) for c in self.columns}, dtype=int)
+        self.corr = p.correlation.corr()
+        self.top_values = {col: p.top[col].top(top_k) for col in self.columns if col in p.top}
+        self.top_errors = {col: int(p.top[col].error) for col in p.top}
+        self.sample = p.sample.frame if p.sample.frame is not None else pd.DataFrame(columns=self.columns)
+
+        rank_error = KLLSketch(p.quantile_k).rank_error
+        unique_error = HyperLogLog(p.hll_precision).relative_error * 2  # 약 95% 신뢰 구간
+        self.bounds = {"quantile_rank": rank_error, "unique": unique_error, "freq": self.top_errors}
+
+        describe = pd.DataFrame(np.nan, index=DESCRIBE_ROWS, columns=self.columns, dtype=object)
+        moments = p.moments
+        for i, col in enumerate(self.numeric_columns):
+            q25, q50, q75 = p.quantiles[col].quantiles([0.25, 0.5, 0.75])
+            values = [moments.count[i], moments.mean[i], moments.std[i],
+                      moments.min[i] if moments.count[i] else np.nan, q25, q50, q75,
+                      moments.max[i] if moments.count[i] else np.nan]
+            describe.loc[NUMERIC_STATS, col] = values
+        for col in self.columns:
+            if col in self.numeric_columns:
+                continue
+            describe.at["count", col] = self.n_rows - self.missing[col]
+            describe.at["unique", col] = self.unique[col]
+            top = self.top_values[col]
+            if len(top):
+                describe.at["top", col] = top.index[0]
+                describe.at["freq", col] = top.iloc[0]
+            if col in p.extremes:
+                describe.at["min", col], describe.at["max", col] = p.extremes[col]
+        self.describe = describe.dropna(how="all")
+        self.note = (
+            f"🌊 대용량 모드: {self.n_rows:,}행을 청크로 읽어 계산한 프로파일입니다. "
+            f"분위수는 순위 ±{rank_error:.1%}, 고유값 수는 ±{unique_error:.1%} 오차 범위의 근사값이며 "
+            f"미리보기·차트는 무작위 표본 {len(self.sample):,}행 기준입니다."
+        )
+
+    def annotate(self, table):
+        """근사값 옆에 오차 범위를 붙인 문자열 표 (분위수 / 고유값 수 / 최빈값 빈도)."""
+        result = table.astype(object).copy()
+        for row in result.index:
+            for col in result.columns:
+                value = table.at[row, col]
+                if pd.isna(value):
+                    result.at[row, col] = ""
+                    continue
+                text = _fmt(value)
+                if row in ("25%", "50%", "75%"):
+                    text += f" (순위 ±{self.bounds['quantile_rank']:.1%})"
+                elif row == "unique":
+                    text += f" (±{self.bounds['unique']:.1%})"
+                elif row == "freq" and self.top_errors.get(col):
+                    text += f" (+{self.top_errors[col]:,} 이내)"
+                result.at[row, col] = text
+        return result
+
+    @cached_property
+    def describe_text(self):
+        return self.annotate(self.describe).to_string()
+
+    @cached_property
+    def numeric_describe_text(self):
+        return self.annotate(self.numeric_describe).to_string()
+
+
+class StreamingProfiler:
+    """청크를 update() 로 넣으면 컬럼별 스케치를 갱신하고, profile() 로 StreamingProfile 을 만듭니다.
+
+    컬럼 구성과 숫자/날짜 컬럼 여부는 첫 청크로 정하고, 이후 청크는 같은 타입으로 맞춰 읽습니다.
+    서로 다른 파일 조각을 따로 읽은 profiler 끼리는 merge() 로 합칠 수 있습니다.
+    """
+
+    def __init__(self, quantile_k=QUANTILE_K, hll_precision=HLL_PRECISION,
+                 topk_capacity=TOPK_CAPACITY, sample_rows=SAMPLE_ROWS):
+        self.quantile_k = quantile_k
+        self.hll_precision = hll_precision
+        self.topk_capacity = topk_capacity
+        self.sample_rows = sample_rows
+        self.columns = None
+        self.n_rows = 0
+
+    def _start(self, chunk):
+        self.columns = list(chunk.columns)
+        self.dtypes = chunk.dtypes
+        self.numeric_columns = [
+            c for c in self.columns
+            if pd.api.types.is_numeric_dtype(chunk[c]) and not pd.api.types.is_bool_dtype(chunk[c])
+        ]
+        self.datetime_columns = [c for c in self.columns if pd.api.types.is_datetime64_any_dtype(chunk[c])]
+        self.missing = np.zeros(len(self.columns), dtype=np.int64)
+        self.moments = RunningMoments(self.numeric_columns)
+        self.correlation = PairwiseCorrelation(self.numeric_columns)
+        self.quantiles = {c: KLLSketch(self.quantile_k) for c in self.numeric_columns}
+        self.distinct = {c: HyperLogLog(self.hll_precision) for c in self.columns}
+        self.top = {c: TopK(self.topk_capacity) for c in self.columns if c not in self.numeric_columns}
+        self.extremes = {}
+        self.sample = BottomKSample(self.sample_rows)
+
+    def update(self, chunk):
+        if self.columns is None:
+            self._start(chunk)
+        chunk = chunk.reindex(columns=self.columns)
+        # 청크마다 타입 추론이 달라질 수 있으므로 첫 청크 기준으로 맞춤 (변환 실패 값은 결측)
+        for col in self.numeric_columns:
+            if not pd.api.types.is_numeric_dtype(chunk[col]):
+                chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
+        for col in self.datetime_columns:
+            if not pd.api.types.is_datetime64_any_dtype(chunk[col]):
+                chunk[col] = pd.to_datetime(chunk[col], errors="coerce")
+
+        self.n_rows += len(chunk)
+        self.missing += chunk.isna().sum().to_numpy()
+        self.moments.update(chunk)
+        self.correlation.update(chunk)
+        for col in self.numeric_columns:
+            self.quantiles[col].update(chunk[col].to_numpy(dtype=float, na_value=np.nan))
+        for col in self.columns:
+            self.distinct[col].update(chunk[col])
+        for col, sketch in self.top.items():
+            sketch.update(chunk[col])
+        for col in self.datetime_columns:
+            values = chunk[col].dropna()
+            if len(values):
+                low, high = self.extremes.get(col, (values.min(), values.max()))
+                self.extremes[col] = (min(low, values.min()), max(high, values.max()))
+        self.sample.update(chunk)
+        return self
+
+    def merge(self, other):
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(other.__dict__)
+            return self
+        self.n_rows += other.n_rows
+        self.missing += other.missing
+        self.moments.merge(other.moments)
+        self.correlation.merge(other.correlation)
+        for name in ("quantiles", "distinct", "top"):
+            for col, sketch in getattr(self, name).items():
+                sketch.merge(getattr(other, name)[col])
+        for col, (low, high) in other.extremes.items():
+            mine = self.extremes.get(col, (low, high))
+            self.extremes[col] = (min(mine[0], low), max(mine[1], high))
+        self.sample.merge(other.sample)
+        return self
+
+    def profile(self):
+        if self.columns is None:
+            raise ValueError("프로파일을 만들 데이터가 없습니다 (빈 파일).")
+        return StreamingProfile(self)
+
+
+def profile_chunks(chunks, **options):
+    """DataFrame 청크들을 한 번 훑어 StreamingProfile 을 만듭니다."""
+    profiler = StreamingProfiler(**options)
+    for chunk in chunks:
+        profiler.update(chunk)
+    return profiler.profile()
+
+
+def _cached(key, build):
+    with _lock:
+        profile = _profiles.get(key)
+        if profile is not None:
+            _profiles.move_to_end(key)
+            return profile
+    profile = build()
+    with _lock:
+        _profiles[key] = profile
+        while len(_profiles) > MEMORY_CACHE_SIZE:
+            _profiles.popitem(last=False)
+    return profile
+
+
+def get_profile(df, key):
+    """key(업로드 내용 해시 등) 별로 DatasetProfile 을 한 번만 계산해 재사용합니다."""
+    return _cached(key, lambda: DatasetProfile(df))
+
+
+def get_streaming_profile(source, kind="excel", sheet_name=0):
+    """파일 전체를 DataFrame 으로 올리지 않고 청크 단위로 읽어 StreamingProfile 을 만듭니다 (업로드당 한 번)."""
+    key = ("stream", source_hash(source), kind, sheet_name)
+    if kind == "excel":
+        return _cached(key, lambda: profile_chunks(iter_excel_chunks(source, sheet_name)))
+    return _cached(key, lambda: profile_chunks(iter_csv_chunks(source)))
+
+
+def load_for_eda(source, kind="excel", sheet_name=0):
+    """EDA 앱용 (DataFrame, 프로파일).
+
+    STREAMING_THRESHOLD_MB 이하는 (전체 DataFrame, 정확한 DatasetProfile),
+    넘는 파일은 (무작위 표본 DataFrame, 청크로 계산한 StreamingProfile) 을 돌려줍니다.
+    """
+    if source_size(source) > STREAMING_THRESHOLD_MB * 1024 * 1024:
+        profile = get_streaming_profile(source, kind, sheet_name)
+        return profile.sample.copy(deep=False), profile
+    df = load_excel(source, sheet_name) if kind == "excel" else load_csv(source)
+    key = source_hash(source)
+    return df, get_profile(df, key if sheet_name == 0 else content_hash(key, str(sheet_name)))
@@ -0,0 +1,317 @@
+# 🧭 ai_core/query_planner.py - 집계 질문 빠른 경로 (pandas 에이전트 앞단)
+#
+# "총 판매량은?", "지역별 평균 단가", "가장 높은 매출 지역은?" 같은 질문에 pandas 에이전트를 쓰면
+# LLM 왕복 여러 번 + 생성 코드 실행이 필요합니다. 여기서는 질문을 구조화된 집계 계획
+# (sum / mean / max / min / count / nunique + 그룹 컬럼 + 상위 N) 으로 바꿔 pandas 로 바로 계산합니다.
+#   1차: 로컬 패턴 매칭 (LLM 호출 없음)
+#   2차: 컬럼 목록을 주고 JSON 계획만 받는 LLM 호출 1회
+#   그래도 집계 질문이 아니면 fallback(에이전트) 실행
+
+import json
+import re
+import time
+
+import pandas as pd
+
+from ai_core.bm25 import tokenize
+from ai_core.llm_client import get_chat_model
+
+AGGREGATES = ("sum", "mean", "max", "min", "count", "nunique")
+AGG_LABELS = {"sum": "합계", "mean": "평균", "max": "최댓값", "min": "최솟값", "count": "건수", "nunique": "고유값 수"}
+
+# 질문 속 표현 → 집계 (앞에 있을수록 우선)
+AGG_KEYWORDS = [
+    ("mean", ("평균", "average", "mean")),
+    ("nunique", ("종류", "고유", "distinct", "unique")),
+    ("count", ("건수", "개수", "몇 건", "몇건", "몇 개", "몇개", "횟수", "count", "how many")),
+    ("sum", ("합계", "총", "합산", "누적", "전체", "sum", "total")),
+    ("max", ("최대", "최고", "max", "maximum")),
+    ("min", ("최소", "최저", "min", "minimum")),
+]
+HIGHEST = ("가장 높", "가장 많", "가장 큰", "제일 높", "제일 많", "제일 큰", "1위", "highest", "most", "best")
+LOWEST = ("가장 낮", "가장 적", "가장 작", "제일 낮", "제일 적", "제일 작", "꼴찌", "lowest", "least", "worst")
+# 집계 하나로 답할 수 없는 질문 (설명 / 원인 / 예측 등) 은 패턴 매칭하지 않음
+OPEN_ENDED = ("왜", "이유", "원인", "설명", "분석해", "추세", "트렌드", "예측", "전망", "상관", "관계", "비교",
+              "요약", "인사이트", "why", "trend", "predict", "forecast", "explain", "compare")
+# 질문 속 일상 표현 → 이런 이름이 들어간 컬럼
+COLUMN_ALIASES = {
+    "매출": ("매출", "판매금액", "금액"),
+    "팔린": ("판매량", "수량"),
+    "판매": ("판매량", "판매금액"),
+    "가격": ("단가", "가격"),
+    "수량": ("판매량", "수량"),
+}
+TOP_N_RE = re.compile(r"(상위|하위|top|bottom)\s*(\d+)|(\d+)\s*(위|개|곳|명)\s*(까지)?", re.IGNORECASE)
+GROUP_RE = re.compile(r"([0-9A-Za-z가-힣_]+)\s*별")
+# "1월", "2024년", "3분기" 같은 기간 조건은 패턴으로 처리하지 않음 (LLM 계획 / 에이전트로)
+PERIOD_RE = re.compile(r"\d+\s*(년|월|일|분기|주차)|지난|작년|올해|이번 달|최근")
+FILTER_MAX_UNIQUE = 1000  # 질문 속 값(예: "서울")을 찾아볼 컬럼의 최대 고유값 수
+MAX_GROUP_ROWS = 20  # top_n 이 없을 때 보여줄 그룹 수
+
+PLAN_PROMPT = """너는 데이터 질문을 pandas 집계 계획으로 바꾸는 도우미야.
+컬럼 목록:
+{columns}
+
+질문: {question}
+
+질문이 아래 형태의 집계 하나로 답할 수 있으면 JSON 한 개만 출력해. 설명은 쓰지 마.
+{{"agg": "sum|mean|max|min|count|nunique", "column": "집계할 컬럼 또는 null(행 개수)", "group_by": "그룹 컬럼 또는 null", "top_n": 정수 또는 null, "order": "desc|asc", "filters": {{"컬럼": "같아야 하는 값"}}}}
+기간 조건이나 여러 단계 계산이 필요하면 {{"agg": null}} 만 출력해."""
+
+
+class QueryAnswer:
+    """빠른 경로 / 에이전트 답변 한 건 (text 는 화면 표시용 문장, table 은 그룹 집계 결과)."""
+
+    def __init__(self, text, table=None, plan=None, source="agent", elapsed=0.0):
+        self.text = text
+        self.table = table
+        self.plan = plan
+        self.source = source  # "pattern" / "llm" / "agent"
+        self.elapsed = elapsed
+
+    def describe(self):
+        """Streamlit 캡션용 한 줄 요약."""
+        label = {
+            "pattern": "⚡ 집계 질문 - 패턴 인식 후 pandas 로 바로 계산",
+            "llm": "🧭 집계 질문 - LLM 계획 1회 + pandas 계산",
+            "agent": "🤖 pandas 에이전트 분석",
+        }[self.source]
+        return f"{label} · {self.elapsed:.2f}초"
+
+
+def _is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _column_scores(text, columns):
+    """컬럼별로 text 에 언급된 정도 (정확한 이름 > 별칭 > 글자 n-gram 겹침)."""
+    lowered = text.lower()
+    q_tokens = set(tokenize(text))
+    scores = {}
+    for col in columns:
+        name = str(col)
+        if name.lower() in lowered:
+            score = 10.0 + len(name)  # 긴 이름이 정확히 맞을수록 우선 ("판매금액" > "금액")
+        else:
+            score = 2.0 * len(q_tokens & set(tokenize(name)))
+        for word, targets in COLUMN_ALIASES.items():
+            if word in text and any(t in name for t in targets):
+                score += 3.0
+        if score:
+            scores[col] = score
+    return scores
+
+
+def _best(scores, candidates):
+    # 점수가 같으면 이름이 짧은 컬럼 ("제품" → 제품코드보다 제품명)
+    ranked = sorted((c for c in scores if c in candidates), key=lambda c: (-scores[c], len(str(c))))
+    return ranked[0] if ranked else None
+
+
+def _value_filters(text, df, columns):
+    """질문에 그대로 나온 범주 값 → {컬럼: [값, ...]} (예: "서울의 판매금액" → {"지역": ["서울"]})."""
+    filters = {}
+    for col in columns:
+        values = df[col].dropna()
+        if values.nunique() > FILTER_MAX_UNIQUE:
+            continue
+        hits = [v for v in map(str, values.unique()) if len(v) >= 2 and v in text]
+        if hits:
+            filters[col] = hits
+    return filters
+
+
+def _term_re(term):
+    # 영어 표현은 앞뒤가 영문자가 아닐 때만 (count ≠ country, min ≠ admin, "sum은" 은 허용)
+    if term.isascii():
+        return re.compile(rf"(?<![a-z]){re.escape(term.lower())}(?:e?s)?(?![a-z])", re.IGNORECASE)
+    return re.compile(re.escape(term), re.IGNORECASE)
+
+
+def _mentions(text, words):
+    return any(_term_re(w).search(text) for w in words)
+
+
+def _strip_columns(text, columns):
+    """질문에서 컬럼 이름을 지운 text ("총매출" 컬럼의 '총' 이 합계 표현으로 잡히지 않도록)."""
+    for name in sorted((str(c) for c in columns), key=len, reverse=True):
+        if name.strip():
+            text = _term_re(name).sub(" ", text)
+    return text
+
+
+def plan_by_pattern(question, df):
+    """질문을 로컬 규칙만으로 집계 계획(dict)으로 바꿉니다. 확실하지 않으면 None."""
+    text = question.strip()
+    # 집계 / 순위 표현은 컬럼 이름을 뺀 나머지에서만 찾음
+    lowered = _strip_columns(text, df.columns).lower()
+    if not text or _mentions(lowered, OPEN_ENDED) or PERIOD_RE.search(lowered):
+        return None
+    numeric = [c for c in df.columns if _is_numeric(df[c])]
+    categorical = [c for c in df.columns if c not in numeric]
+
+    agg = next((name for name, words in AGG_KEYWORDS if _mentions(lowered, words)), None)
+    highest = _mentions(lowered, HIGHEST)
+    lowest = _mentions(lowered, LOWEST)
+    top_n, order = None, "asc" if lowest else "desc"
+    match = TOP_N_RE.search(lowered)
+    if match and (match.group(1) or highest or lowest or match.group(5)):
+        top_n = int(match.group(2) or match.group(3))
+        if match.group(1) and match.group(1).lower() in ("하위", "bottom"):
+            order = "asc"
+
+    scores = _column_scores(text, df.columns)
+    group_by = None
+    group_match = GROUP_RE.search(text)
+    if group_match:
+        group_by = _best(_column_scores(group_match.group(1), df.columns), categorical) \
+            or _best(_column_scores(group_match.group(1), df.columns), list(df.columns))
+        if group_by is None:
+            return None
+    elif (highest or lowest or top_n) and categorical:
+        # "가장 높은 매출 지역은?" → 지역으로 묶어 매출 합계가 가장 큰 그룹
+        group_by = _best(scores, categorical)
+
+    column = _best(scores, [c for c in numeric if c != group_by])
+    if group_by is not None:
+        if agg in (None, "max", "min") and (highest or lowest or top_n):
+            agg = "sum" if column is not None else "count"
+        if agg is None:
+            return None
+        if top_n is None and (highest or lowest):
+            top_n = 1
+    else:
+        if agg is None and (highest or lowest):
+            agg = "min" if lowest else "max"
+        if agg is None:
+            return None
+    if agg in ("sum", "mean", "max", "min") and column is None:
+        return None
+    if agg == "nunique":
+        column = _best(scores, [c for c in df.columns if c != group_by])
+        if column is None:
+            return None
+    if agg == "count" and column is not None and str(column) not in text:
+        column = None  # "판매 건수" 는 컬럼 값 개수가 아니라 행 개수
+    filters = _value_filters(text, df, [c for c in categorical if c != group_by])
+    return {"agg": agg, "column": column, "group_by": group_by, "top_n": top_n, "order": order, "filters": filters}
+
+
+def _parse_plan(text, df):
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if not match:
+        return None
+    try:
+        plan = json.loads(match.group(0))
+    except ValueError:
+        return None
+    agg = plan.get("agg")
+    if agg not in AGGREGATES:
+        return None
+    columns = {str(c): c for c in df.columns}
+    column = plan.get("column")
+    group_by = plan.get("group_by")
+    if column is not None and str(column) not in columns:
+        return None
+    if group_by is not None and str(group_by) not in columns:
+        return None
+    column = columns.get(str(column)) if column is not None else None
+    group_by = columns.get(str(group_by)) if group_by is not None else None
+    if agg in ("sum", "mean", "max", "min") and (column is None or not _is_numeric(df[column])):
+        return None
+    top_n = plan.get("top_n")
+    try:
+        top_n = int(top_n) if top_n not in (None, "", "null") else None
+    except (TypeError, ValueError):
+        top_n = None
+    order = "asc" if str(plan.get("order", "desc")).lower() == "asc" else "desc"
+    filters = {}
+    for col, value in (plan.get("filters") or {}).items():
+        if str(col) not in columns:
+            return None
+        filters[columns[str(col)]] = [str(v) for v in (value if isinstance(value, list) else [value])]
+    return {"agg": agg, "column": column, "group_by": group_by, "top_n": top_n, "order": order, "filters": filters}
+
+
+def plan_with_llm(question, df, llm=None):
+    """컬럼 목록과 질문만 보내 JSON 집계 계획을 받습니다 (LLM 호출 1회). 집계 질문이 아니면 None."""
+    llm = llm or get_chat_model("agent")
+    columns = "\n".join(f"- {c} ({df[c].dtype})" for c in df.columns)
+    response = llm.invoke(PLAN_PROMPT.format(columns=columns, question=question))
+    return _parse_plan(getattr(response, "content", response), df)
+
+
+def _fmt(value):
+    if hasattr(value, "item"):  # numpy 스칼라
+        value = value.item()
+    if isinstance(value, float):
+        return f"{int(value):,}" if value.is_integer() else f"{value:,.2f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+
+def run_plan(df, plan, profile=None):
+    """집계 계획을 pandas 로 실행해 (문장, 표 또는 None) 을 돌려줍니다.
+
+    profile 이 근사(StreamingProfile) 이고 df 가 표본이면, 조건 없는 전체 집계는 파일 전체 통계로 답하고
+    나머지는 표본 기준임을 문장에 밝힙니다.
+    """
+    agg, column, group_by = plan["agg"], plan["column"], plan["group_by"]
+    top_n, ascending = plan["top_n"], plan["order"] == "asc"
+    filters = plan.get("filters") or {}
+    label = AGG_LABELS[agg]
+    sampled = profile is not None and profile.approximate
+    target = f"{column} " if column is not None else ""
+    scope = "".join(f"[{col}={', '.join(values)}] " for col, values in filters.items())
+    suffix = f" (무작위 표본 {len(df):,}행 기준)" if sampled else ""
+
+    if sampled and not filters and group_by is None and agg != "nunique" \
+            and (column is None or column in profile.numeric_columns):
+        # 표본이 아닌 파일 전체 통계 (count / mean / min / max 는 스트리밍 프로파일에서 정확)
+        if column is None:
+            value = profile.n_rows
+        else:
+            stats = profile.numeric_describe[column]
+            value = stats["mean"] * stats["count"] if agg == "sum" else stats[agg]
+        return f"{target}{label}: {_fmt(value)}", None
+
+    for col, values in filters.items():
+        df = df[df[col].astype(str).isin(values)]
+
+    if group_by is None:
+        value = len(df) if column is None else df[column].agg(agg)
+        return f"{scope}{target}{label}: {_fmt(value)}{suffix}", None
+
+    grouped = df.groupby(group_by, observed=True, dropna=True)
+    table = grouped.size() if column is None else grouped[column].agg(agg)
+    table = table.sort_values(ascending=ascending).head(top_n or MAX_GROUP_ROWS)
+    table.name = f"{target}{label}".strip()
+    if table.empty:
+        return f"{scope}{group_by}별 {target}{label}: 결과가 없습니다.{suffix}", table
+    if top_n == 1:
+        rank = "가장 낮은" if ascending else "가장 높은"
+        key, value = table.index[0], table.iloc[0]
+        return f"{scope}{target}{label} 기준 {rank} {group_by}: {key} ({_fmt(value)}){suffix}", table
+    order_text = "오름차순" if ascending else "내림차순"
+    lines = " · ".join(f"{key} {_fmt(value)}" for key, value in table.items())
+    return f"{scope}{group_by}별 {target}{label} ({order_text} {len(table)}개): {lines}{suffix}", table
+
+
+def answer_question(df, question, fallback, llm=None, profile=None, use_llm=True):
+    """집계 질문은 pandas 로 바로 계산하고, 아니면 fallback() (pandas 에이전트 등) 결과를 돌려줍니다.
+
+    fallback: 인자 없이 호출하면 답변 문자열을 돌려주는 함수
+    llm     : 2차 계획용 모델 (기본 get_chat_model("agent")), use_llm=False 면 패턴 매칭만 사용
+    """
+    started = time.perf_counter()
+    plan, source = plan_by_pattern(question, df), "pattern"
+    if plan is None and use_llm:
+        plan, source = plan_with_llm(question, df, llm), "llm"
+    if plan is not None:
+        try:
+            text, table = run_plan(df, plan, profile)
+            return QueryAnswer(text, table, plan, source, time.perf_counter() - started)
+        except (KeyError, TypeError, ValueError):
+            pass  # 계산할 수 없는 조합이면 에이전트로
+    return QueryAnswer(fallback(), source="agent", elapsed=time.perf_counter() - started)
@@ -0,0 +1,196 @@
+# 🧩 ai_core/report_engine.py - 절(section) 단위 병렬 보고서 생성
+#
+# 전문가형 보고서를 프롬프트 하나로 통째로 요청하면 전체 시간 = 모든 절 작성 시간의 합이고,
+# 중간에 한 번 실패(타임아웃 / 429)하면 보고서 전체를 잃습니다.
+# 여기서는 보고서 틀을 서로 독립적인 절 작업으로 나눠
+#   - 제한된 스레드 풀(AI_REPORT_CONCURRENCY, 기본 4)에서 동시에 생성하고
+#   - 실패한 절만 (429 면 모든 작업자가 함께 물러났다가) 다시 시도하고
+#   - 끝난 순서와 상관없이 원래 순서대로 조립한 뒤
+#   - 마지막으로 각 절 요약을 받아 짧은 결론 절을 한 번 더 생성합니다.
+# 전체 시간 ≈ 가장 느린 절 + 결론 절. 절마다 시간은 .cache/metrics/llm_latency.jsonl 에 남습니다.
+
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ai_core.embedding_pipeline import Backpressure, is_rate_limit_error
+from ai_core.streaming import StreamTiming, iter_stream
+
+REPORT_CONCURRENCY = int(os.getenv("AI_REPORT_CONCURRENCY", "4"))
+SECTION_RETRIES = 2          # 절마다 추가 시도 횟수
+RETRY_BACKOFF = 1.0          # 초 (429 가 아닌 오류의 재시도 간격, 시도마다 2배)
+CONCLUSION_DIGEST_CHARS = 600  # 결론 절에 넘기는 절별 본문 길이
+
+
+class Section:
+    """보고서의 한 절. instructions 는 context 값으로 format 되는 작성 지침입니다."""
+
+    def __init__(self, key, title, instructions):
+        self.key = key
+        self.title = title
+        self.instructions = instructions
+
+
+class SectionResult:
+    def __init__(self, section, text="", attempts=0, elapsed=0.0, error=None):
+        self.section = section
+        self.text = text
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class Report:
+    """생성된 보고서. text 는 제목 / 목차 / 절 본문을 순서대로 이어 붙인 전체 문서입니다."""
+
+    def __init__(self, title, header, results, conclusion, elapsed):
+        self.title = title
+        self.header = header
+        self.results = results        # 본문 절 (원래 순서)
+        self.conclusion = conclusion  # 결론 절 (SectionResult 또는 None)
+        self.elapsed = elapsed
+
+    @property
+    def sections(self):
+        return self.results + ([self.conclusion] if self.conclusion is not None else [])
+
+    @property
+    def failed(self):
+        return [r for r in self.sections if not r.ok]
+
+    @property
+    def text(self):
+        numbered = [f"{i}. {r.section.title}\n{r.text.strip()}" for i, r in enumerate(self.sections, 1)]
+        return "\n\n".join([self.title, self.header] + numbered)
+
+    def describe(self):
+        """Streamlit 캡션용 한 줄 요약 (전체 시간 vs 절 시간 합)."""
+        total = sum(r.elapsed for r in self.sections)
+        retried = sum(1 for r in self.sections if r.attempts > 1)
+        text = f"🧩 {len(self.sections)}개 절 · 전체 {self.elapsed:.1f}초 (절별 합계 {total:.1f}초)"
+        if retried:
+            text += f" · 재시도 {retried}개 절"
+        if self.failed:
+            text += f" · 실패 {len(self.failed)}개 절"
+        return text
+
+
+def _generate(llm, prompt, label):
+    timing = StreamTiming(label)
+    return "".join(iter_stream(llm, prompt, timing))
+
+
+def _run_section(llm, section, prompt, label, backpressure, retries):
+    started = time.perf_counter()
+    result = SectionResult(section)
+    for attempt in range(retries + 1):
+        backpressure.wait()
+        result.attempts = attempt + 1
+        try:
+            result.text = _generate(llm, prompt, f"{label}:{section.key}")
+            result.error = None
+            break
+        except Exception as exc:
+            result.error = f"{type(exc).__name__}: {exc}"
+            if attempt == retries:
+                break
+            if is_rate_limit_error(exc):
+                backpressure.pause(attempt)
+            else:
+                time.sleep(random.uniform(0, RETRY_BACKOFF * 2 ** attempt))
+    if result.error is not None:
+        result.text = f"⚠️ 이 절은 생성하지 못했습니다 ({result.error})"
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def section_prompt(section, context, preamble=""):
+    """절 하나를 쓰기 위한 프롬프트 (공통 데이터 설명 + 이 절의 지침만)."""
+    return (
+        f"{preamble}\n\n"
+        f"너는 전문가형 분석 보고서 중 '{section.title}' 절만 작성하는 데이터 분석가야.\n"
+        f"절 제목과 다른 절 내용은 쓰지 말고 이 절의 본문만 작성해.\n\n"
+        f"[작성 지침]\n{section.instructions.format(**context)}"
+    ).strip()
+
+
+def conclusion_prompt(section, results, context, preamble=""):
+    digest = "\n\n".join(
+        f"[{r.section.title}]\n{r.text.strip()[:CONCLUSION_DIGEST_CHARS]}" for r in results if r.ok
+    )
+    return (
+        f"{preamble}\n\n"
+        f"아래는 보고서의 각 절 내용이야.\n\n{digest}\n\n"
+        f"이 내용을 바탕으로 '{section.title}' 절만 간결하게 작성해.\n\n"
+        f"[작성 지침]\n{section.instructions.format(**context)}"
+    ).strip()
+
+
+def generate_report(llm, sections, context, conclusion=None, title="", header="", preamble="",
+                    label="report", concurrency=REPORT_CONCURRENCY, retries=SECTION_RETRIES, on_section=None):
+    """sections 를 동시에 생성하고 순서대로 조립한 뒤 conclusion 절을 마지막에 생성합니다.
+
+    context     : 절 지침의 {이름} 자리에 들어갈 값 (dict)
+    preamble    : 모든 절 프롬프트 앞에 붙는 공통 데이터 설명
+    on_section  : 절이 끝날 때마다 호출하는 함수 (SectionResult). 호출한 스레드에서 실행되므로 st.* 사용 가능
+    """
+    started = time.perf_counter()
+    backpressure = Backpressure()
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        pending = {
+            pool.submit(_run_section, llm, s, section_prompt(s, context, preamble), label, backpressure, retries): s.key
+            for s in sections
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                results[pending.pop(future)] = result
+                if on_section is not None:
+                    on_section(result)
+    ordered = [results[s.key] for s in sections]
+    final = None
+    if conclusion is not None:
+        prompt = conclusion_prompt(conclusion, ordered, context, preamble)
+        final = _run_section(llm, conclusion, prompt, label, backpressure, retries)
+        if on_section is not None:
+            on_section(final)
+    return Report(title, header, ordered, final, time.perf_counter() - started)
+
+
+# 📘 전문가형 분석 보고서 (GPT_DataMasterProPlus_Upgrade.py)
+EXPERT_PREAMBLE = """[데이터 정보]
+- 주요 통계값 요약:
+{eda}
+- 시각화: {chart} (X축: {x}, Y축: {y})
+- 산점도 비교 항목: {sx} vs {sy} (상관계수: {sxy_corr})"""
+
+EXPERT_SECTIONS = [
+    Section("overview", "📊 데이터 개요", "- 주요 통계값을 근거로 데이터의 규모·분포·특이값을 요약"),
+    Section("visualization", "📈 시각화 분석", "- {chart} 에서 X축 {x} 에 따른 {y} 의 패턴과 눈에 띄는 구간 해석"),
+    Section("relationship", "🔗 관계 분석 (산점도)", "- {sx} 와 {sy} 의 상관 및 경향성 해석"),
+    Section("insights", "💡 인사이트 요약", "- 주요 수치 또는 경향성 기반 핵심 요약 (3~5개 항목)"),
+    Section("forecast", "🔮 미래 예측 분석", "- 트렌드 기반 향후 전망 예측\n- 중요 KPI 예측 또는 변화 예상"),
+    Section("strategy", "🛠 개선 방안 및 전략", "- 실무자가 바로 적용 가능한 전략 제시\n- 개선 포인트, 주의사항 포함"),
+]
+
+EXPERT_CONCLUSION = Section("conclusion", "📌 결론 요약", "- 전체 요약 및 의사결정 지원 포인트를 5줄 이내로 정리")
+
+
+def expert_report(llm, context, label="expert_report", **kwargs):
+    """전문가형 보고서 (타이틀 / 목차 + 6개 절 병렬 + 결론). context 에 timestamp, eda, chart, x, y, sx, sy, sxy_corr."""
+    titles = [s.title for s in EXPERT_SECTIONS + [EXPERT_CONCLUSION]]
+    header = f"- 생성일시: {context['timestamp']}\n\n📚 목차\n" + "\n".join(
+        f"   {i}. {t}" for i, t in enumerate(titles, 1)
+    )
+    return generate_report(
+        llm, EXPERT_SECTIONS, context, conclusion=EXPERT_CONCLUSION,
+        title="📘 GPT 전문가형 분석 보고서", header=header,
+        preamble=EXPERT_PREAMBLE.format(**context), label=label, **kwargs,
+    )
@@ -0,0 +1,140 @@
+# 🧾 ai_core/report_jobs.py - 작업 큐(ai_core.job_queue)에서 실행하는 보고서 / PDF 생성 핸들러
+#
+# 각 핸들러는 job(JobContext) 을 받아 job.params 로 보고서를 만들고
+# {"sections": [[제목, 본문], ...], "caption": ..., "artifact": PDF 결과물 키, "file_name": 다운로드 이름} 을 돌려줍니다.
+# PDF 는 메모리에서 만들어 ai_core.artifacts 에 내용 해시로 저장합니다 (작업 디렉터리에 파일을 쓰지 않음).
+# 작업자 프로세스에서 실행되므로 Streamlit 을 쓰지 않고, 진행 상황은 job.progress(비율, 메시지) 로 남깁니다.
+#   - excel_pdf_report    : GPT_excelReportPDF.py (차트 + GPT 분석 → PDF)
+#   - insight_pdf_report  : GPT_DataMasterProPlus.py (시각화 / 상관관계 인사이트 → PDF)
+#   - expert_pdf_report   : GPT_DataMasterProPlus_Upgrade.py (전문가형 보고서 절별 병렬 생성 → PDF)
+# format_date_axis / expert_pdf 는 일괄 생성(ai_core.batch_report)에서도 같이 씁니다.
+
+from datetime import datetime
+
+import pandas as pd
+
+from ai_core.artifacts import put_artifact
+from ai_core.charts import render_chart
+from ai_core.llm_client import get_chat_model
+from ai_core.pdf_render import new_report, pdf_bytes, preload_fonts
+from ai_core.report_engine import EXPERT_CONCLUSION, EXPERT_SECTIONS, expert_report
+from ai_core.streaming import StreamTiming, iter_stream
+
+# 작업자가 핸들러를 처음 불러올 때 한글 폰트 확인 + 파싱 (이후 보고서는 파싱된 폰트를 재사용)
+preload_fonts()
+
+CHART_PROMPT = """
+너는 데이터 분석가야. 아래는 시각화 조건이야:
+- 차트 종류: {type}
+- X축 항목: {x}
+- Y축 항목: {y}
+이 정보를 바탕으로 분석 요약을 간단히 해줘.
+"""
+
+INSIGHT_PROMPT = """
+너는 데이터 분석가야. 아래는 사용자 선택 정보야:
+- 차트 종류: {type}
+- X축: {x}
+- Y축: {y}
+이 정보를 바탕으로 의미 있는 인사이트를 간결하게 설명해줘.
+"""
+
+
+def _generate(llm, prompt, label):
+    return "".join(iter_stream(llm, prompt, StreamTiming(label)))
+
+
+def format_date_axis(df, x_col):
+    """📅 날짜 컬럼(이름에 '일' / '날짜')을 X축 라벨용 YYYY-MM-DD 문자열로 (변환 안 되면 그대로)."""
+    if '일' in x_col or '날짜' in x_col:
+        try:
+            df[x_col] = pd.to_datetime(df[x_col]).dt.strftime("%Y-%m-%d")
+        except Exception:
+            pass
+    return df
+
+
+def expert_pdf(report, images=()):
+    """전문가형 보고서(report_engine.Report) PDF 바이트. images 는 목차 아래에 넣을 차트 이미지 바이트."""
+    pdf = new_report(report.title)
+    pdf.paragraph(report.header)
+    for image in images:
+        pdf.image_full(image)
+    for i, r in enumerate(report.sections, 1):
+        pdf.heading(f"{i}. {r.section.title}")
+        pdf.paragraph(r.text.strip())
+    return pdf_bytes(pdf)
+
+
+def excel_pdf_report(job):
+    p = job.params
+    chart_type, x_col, y_col = p["chart_type"], p["x"], p["y"]
+    df = format_date_axis(job.load_data(), x_col)
+
+    job.progress(0.1, "차트 생성")
+    chart_image = render_chart(df, p["data_key"], chart_type, x=x_col, y=y_col, rotate=45)
+
+    job.progress(0.3, "GPT 분석")
+    gpt_result = _generate(get_chat_model(), CHART_PROMPT.format(x=x_col, y=y_col, type=chart_type), "excelReportPDF")
+
+    job.progress(0.9, "PDF 저장")
+    now = datetime.now().strftime("%Y%m%d_%H%M%S")
+    pdf = new_report("GPT 자동 보고서")
+    pdf.paragraph(f"생성 시간: {now}\n차트 유형: {chart_type}\nX축: {x_col}\nY축: {y_col}")
+    pdf.heading("GPT 분석 결과")
+    pdf.paragraph(gpt_result)
+    pdf.image_full(chart_image)
+    artifact = put_artifact(pdf_bytes(pdf), ".pdf")
+    return {"sections": [["🧠 GPT 분석 결과", gpt_result]], "artifact": artifact, "file_name": f"GPT_Report_{now}.pdf"}
+
+
+def insight_pdf_report(job):
+    p = job.params
+    chart_type, x_col, y_col = p["chart_type"], p["x"], p["y"]
+    llm = get_chat_model()
+
+    job.progress(0.1, "시각화 인사이트")
+    chart_summary = _generate(llm, INSIGHT_PROMPT.format(x=x_col, y=y_col, type=chart_type), "DataMasterProPlus:chart")
+    job.progress(0.5, "상관관계 인사이트")
+    corr_summary = _generate(
+        llm, f"다음은 데이터의 상관관계 행렬이야:\n{p['corr_text']}\n요약해서 설명해줘.", "DataMasterProPlus:corr"
+    )
+
+    job.progress(0.9, "PDF 저장")
+    now = datetime.now().strftime("%Y%m%d_%H%M%S")
+    pdf = new_report("GPT 자동 보고서")
+    pdf.paragraph(f"생성 시간: {now}")
+    pdf.heading("시각화 정보")
+    pdf.paragraph(f"차트 유형: {chart_type}\nX축: {x_col}\nY축: {y_col}")
+    pdf.heading("시각화 인사이트")
+    pdf.paragraph(chart_summary)
+    pdf.heading("상관관계 인사이트")
+    pdf.paragraph(corr_summary)
+
+    artifact = put_artifact(pdf_bytes(pdf), ".pdf")
+    sections = [["🧠 시각화 인사이트", chart_summary], ["🔗 상관관계 인사이트", corr_summary]]
+    return {"sections": sections, "artifact": artifact, "file_name": f"GPT_Report_{now}.pdf"}
+
+
+def expert_pdf_report(job):
+    context = dict(job.params["context"], timestamp=datetime.now().strftime("%Y-%m-%d %H:%M"))
+    order = {s.key: i for i, s in enumerate(EXPERT_SECTIONS + [EXPERT_CONCLUSION])}
+    total = len(order)
+    finished = []
+
+    def on_section(result):
+        finished.append(result)
+        done = [[r.section.title, r.text] for r in sorted(finished, key=lambda r: order[r.section.key])]
+        job.progress(0.9 * len(finished) / total, f"{result.section.title} 완료 ({len(finished)}/{total})",
+                     partial={"sections": done})
+
+    job.progress(0.0, "절별 생성 시작")
+    report = expert_report(get_chat_model("report"), context, label="DataMasterProPlus_Upgrade", on_section=on_section)
+
+    job.progress(0.95, "PDF 저장")
+    return {
+        "sections": [[r.section.title, r.text] for r in report.sections],
+        "caption": report.describe(),
+        "artifact": put_artifact(expert_pdf(report), ".pdf"),
+        "file_name": f"GPT_Expert_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+    }
@@ -0,0 +1,337 @@
+# 🧱 ai_core/sandbox.py - 에이전트가 만든 pandas 코드를 별도 작업자 프로세스에서 실행
+#
+# allow_dangerous_code=True 에이전트는 생성한 코드를 Streamlit 프로세스 안에서 실행하므로
+# 폭주하는 df.apply / 카테시안 merge 하나가 CPU 를 붙잡거나 메모리를 다 써서 모든 사용자를 멈춥니다.
+# 여기서는 코드를 작업자 프로세스 풀에서 실행합니다.
+#   - DataFrame 은 .cache/sandbox/<데이터 해시>.arrow (Arrow IPC) 로 한 번 써 두고 작업자가 처음 쓸 때 읽음
+#     (쓸 때마다 사용 시각을 갱신하고, AI_SANDBOX_DAYS(기본 1일) 동안 안 쓰인 사본과
+#      AI_SANDBOX_DISK_MB(기본 1000MB) 초과분은 정리 - 정리된 사본은 다음 호출 때 다시 씀)
+#   - 호출마다 CPU 시간(RLIMIT_CPU) / 메모리(RLIMIT_AS) 한도, 부모 쪽에서 벽시계 시간 한도
+#   - 한도를 넘기거나 죽은 작업자는 종료 후 새로 띄움 (다음 호출은 새 작업자)
+# 부모(Streamlit) 쪽은 파이프로 결과를 기다리는 스레드 하나만 막히므로 다른 세션의 응답 시간은 그대로입니다.
+# resource 모듈이 없는 환경(Windows)에서는 벽시계 한도만 적용됩니다.
+#
+# ⚠️ 제한: 작업자끼리 읽기 전용 DataFrame 을 공유하지 않고, 작업자마다 자기 복사본을 가집니다
+#    (데이터 메모리 = 작업자 수 x WORKER_FRAMES 까지). Arrow 메모리 매핑에서 복사 없이 만든 프레임은
+#    배열이 읽기 전용이라 생성 코드에 흔한 df.loc[...] = ... / df.at[...] = ... 가
+#    "assignment destination is read-only" 로 실패하므로, 메모리보다 기존 에이전트 동작을 우선했습니다.
+
+import ast
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+
+from ai_core.hashing import content_hash
+from ai_core.paths import cache_path, prune_cache_dir
+
+try:
+    import resource
+except ImportError:  # Windows: CPU / 메모리 한도 없이 벽시계 한도만
+    resource = None
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:  # pyarrow 가 없으면 pickle 로 전달
+    pa = None
+
+SANDBOX_WORKERS = int(os.getenv("AI_SANDBOX_WORKERS", "2"))
+CPU_SECONDS = int(os.getenv("AI_SANDBOX_CPU_SECONDS", "20"))     # 호출당 CPU 시간
+WALL_SECONDS = float(os.getenv("AI_SANDBOX_WALL_SECONDS", "30"))  # 호출당 전체 대기 시간
+MEMORY_MB = int(os.getenv("AI_SANDBOX_MEMORY_MB", "2048"))       # 호출당 추가로 쓸 수 있는 메모리
+STARTUP_SECONDS = 10     # 새 작업자의 첫 호출에 더해 주는 시간 (프로세스 기동 + 데이터 로드)
+MAX_OUTPUT_CHARS = 8000  # 에이전트에 돌려줄 출력 최대 길이
+WORKER_FRAMES = 2        # 작업자 하나가 들고 있는 데이터셋 수 (작업자마다 복사본 → 메모리는 작업자 수만큼)
+SNAPSHOT_MAX_BYTES = int(os.getenv("AI_SANDBOX_DISK_MB", "1000")) * 1024 * 1024
+SNAPSHOT_MAX_AGE_SECONDS = float(os.getenv("AI_SANDBOX_DAYS", "1")) * 24 * 3600
+PRUNE_EVERY = 10         # 사본을 몇 개 새로 쓸 때마다 정리할지
+
+SANDBOX_DIR = cache_path("sandbox")
+
+_lock = threading.Lock()
+_sandbox = None
+_publishes = 0
+
+
+# 🧪 작업자 프로세스 쪽
+class CPUTimeExceeded(Exception):
+    pass
+
+
+def _on_cpu_limit(signum, frame):
+    raise CPUTimeExceeded("CPU 시간 한도를 넘었습니다.")
+
+
+def _address_space():
+    # 현재 가상 메모리 크기 (리눅스 /proc, 없으면 None)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _set_limits(cpu_seconds, memory_mb):
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    soft = used + cpu_seconds
+    resource.setrlimit(resource.RLIMIT_CPU, (soft if hard == resource.RLIM_INFINITY else min(soft, hard), hard))
+    current = _address_space()
+    if current is not None:
+        hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+        soft = current + memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (soft if hard == resource.RLIM_INFINITY else min(soft, hard), hard))
+
+
+def _clear_limits():
+    if resource is None:
+        return
+    for limit in (resource.RLIMIT_CPU, resource.RLIMIT_AS):
+        resource.setrlimit(limit, (resource.getrlimit(limit)[1], resource.getrlimit(limit)[1]))
+
+
+def _sanitize(code):
+    # PythonAstREPLTool 과 같은 전처리: ```python ... ``` 감싸기 / 앞뒤 공백 제거
+    code = code.strip().strip("`").strip()
+    if code.startswith("python"):
+        code = code[len("python"):]
+    return code.strip()
+
+
+def _execute(code, namespace):
+    """PythonAstREPLTool._run 과 같은 규칙: 마지막 문장이 식이면 그 값, 아니면 print 출력."""
+    tree = ast.parse(_sanitize(code))
+    exec(ast.unparse(ast.Module(tree.body[:-1], type_ignores=[])), namespace)
+    last = ast.unparse(ast.Module(tree.body[-1:], type_ignores=[]))
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        try:
+            value = eval(last, namespace)
+        except SyntaxError:
+            exec(last, namespace)
+            value = None
+    return buffer.getvalue() if value is None else str(value)
+
+
+def _load_frame(path):
+    if path.endswith(".arrow"):
+        # 메모리 매핑으로 읽어 파일 내용을 힙에 한 번 더 올리지 않음.
+        # to_pandas() 결과는 이 작업자 전용 복사본 (에이전트 코드가 df 를 고쳐 써도 되도록 쓰기 가능한 배열)
+        return feather.read_table(path, memory_map=True).to_pandas()
+    return pd.read_pickle(path)
+
+
+def _worker(conn, memory_mb):
+    import signal
+
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+    namespaces = OrderedDict()  # 데이터 키 -> 실행 변수 (df, pd, np + 에이전트가 만든 변수)
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        data_key, path, code, cpu_seconds = message
+        recycle = False
+        try:
+            namespace = namespaces.get(data_key)
+            if namespace is None:
+                namespace = {"df": _load_frame(path), "pd": pd, "np": np}
+                namespaces[data_key] = namespace
+                while len(namespaces) > WORKER_FRAMES:
+                    namespaces.popitem(last=False)
+            namespaces.move_to_end(data_key)
+            _set_limits(cpu_seconds, memory_mb)
+            try:
+                output = _execute(code, namespace)
+            finally:
+                _clear_limits()
+            reply = ("ok", output[:MAX_OUTPUT_CHARS])
+        except MemoryError:
+            reply, recycle = ("error", f"MemoryError: 메모리 한도({memory_mb}MB)를 넘었습니다."), True
+        except CPUTimeExceeded as e:
+            reply, recycle = ("error", f"CPUTimeExceeded: {e}"), True
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        try:
+            conn.send(reply)
+        except Exception:
+            conn.send(("error", "결과를 전달할 수 없습니다."))
+        if recycle:
+            return  # 한도를 넘긴 작업자는 정리하고 새로 띄움
+
+
+# 🧭 부모 프로세스 쪽
+def publish_frame(df, data_key):
+    """작업자들이 읽을 데이터 파일을 한 번만 씁니다 (이미 있으면 사용 시각만 갱신).
+
+    Arrow 로 바꿀 수 없는 컬럼(숫자/문자 섞인 object 등)이 있으면 pickle 로 씁니다.
+    """
+    base = os.path.join(SANDBOX_DIR, data_key[:32])
+    for path in (base + ".arrow", base + ".pkl"):
+        try:
+            os.utime(path)  # 쓰고 있는 사본은 오래된 것으로 정리되지 않도록
+            return path
+        except FileNotFoundError:
+            continue
+    path = _write_frame(df, base)
+    _published(os.path.basename(path))
+    return path
+
+
+def _write_frame(df, base):
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            feather.write_feather(table, base + ".arrow" + suffix, compression="uncompressed")
+            os.replace(base + ".arrow" + suffix, base + ".arrow")
+            return base + ".arrow"
+        except (pa.ArrowException, TypeError, ValueError):
+            pass
+    df.to_pickle(base + ".pkl" + suffix)
+    os.replace(base + ".pkl" + suffix, base + ".pkl")
+    return base + ".pkl"
+
+
+def _published(name):
+    # 새 사본을 PRUNE_EVERY 개 쓸 때마다 정리 (방금 쓴 사본은 남김)
+    global _publishes
+    with _lock:
+        _publishes += 1
+        due = _publishes % PRUNE_EVERY == 1
+    if due:
+        prune_snapshots(keep=name)
+
+
+def prune_snapshots(max_bytes=SNAPSHOT_MAX_BYTES, max_age=SNAPSHOT_MAX_AGE_SECONDS, keep=None):
+    """오래 쓰이지 않은 데이터 사본과 용량 초과분을 .cache/sandbox 에서 지웁니다. (지운 개수, 지운 바이트) 반환."""
+    return prune_cache_dir(SANDBOX_DIR, max_bytes, max_age, keep=keep)
+
+
+class _Worker:
+    def __init__(self, context, memory_mb):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker, args=(child, memory_mb), daemon=True)
+        self.process.start()
+        child.close()
+        self.calls = 0
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class Sandbox:
+    """작업자 프로세스 풀. run(data_key, path, code) 로 코드를 실행하고 출력 문자열을 돌려줍니다.
+
+    같은 데이터(data_key)는 항상 같은 작업자로 보내 에이전트가 만든 변수가 다음 단계까지 유지됩니다.
+    """
+
+    def __init__(self, workers=SANDBOX_WORKERS, cpu_seconds=CPU_SECONDS, wall_seconds=WALL_SECONDS,
+                 memory_mb=MEMORY_MB):
+        self.cpu_seconds = cpu_seconds
+        self.wall_seconds = wall_seconds
+        self.memory_mb = memory_mb
+        self._context = multiprocessing.get_context("spawn")  # Streamlit 스레드 상태를 물려받지 않도록
+        self._workers = [None] * max(workers, 1)
+        self._slot_locks = [threading.Lock() for _ in self._workers]
+        self.restarts = 0
+
+    def _slot(self, data_key):
+        return int(content_hash(data_key)[:8], 16) % len(self._workers)
+
+    def _worker(self, slot):
+        worker = self._workers[slot]
+        if worker is None or not worker.alive():
+            if worker is not None:
+                worker.kill()
+                self.restarts += 1
+            worker = self._workers[slot] = _Worker(self._context, self.memory_mb)
+        return worker
+
+    def _recycle(self, slot):
+        worker = self._workers[slot]
+        if worker is not None:
+            worker.kill()
+            self._workers[slot] = None
+            self.restarts += 1
+
+    def run(self, data_key, path, code, wall_seconds=None):
+        wall_seconds = wall_seconds or self.wall_seconds
+        slot = self._slot(data_key)
+        with self._slot_locks[slot]:
+            worker = self._worker(slot)
+            # 첫 호출은 작업자 기동 + 데이터 로드 시간이 더해지므로 벽시계 한도를 넉넉히
+            wait = wall_seconds + (STARTUP_SECONDS if worker.calls == 0 else 0)
+            worker.calls += 1
+            try:
+                worker.conn.send((data_key, path, code, self.cpu_seconds))
+                if not worker.conn.poll(wait):
+                    self._recycle(slot)
+                    return f"TimeoutError: 실행 시간 한도({wall_seconds:.0f}초)를 넘어 작업을 중단했습니다."
+                status, output = worker.conn.recv()
+            except (EOFError, OSError, BrokenPipeError):
+                self._recycle(slot)
+                return "WorkerError: 작업자 프로세스가 한도(CPU/메모리)를 넘어 종료되었습니다."
+            if status == "error" and output.startswith(("MemoryError", "CPUTimeExceeded")):
+                self._recycle(slot)
+            return output
+
+    def close(self):
+        for slot in range(len(self._workers)):
+            worker = self._workers[slot]
+            if worker is not None:
+                try:
+                    worker.conn.send(None)
+                except (OSError, BrokenPipeError):
+                    pass
+                worker.kill()
+                self._workers[slot] = None
+
+
+def get_sandbox():
+    """프로세스 공용 Sandbox (처음 호출할 때 만들고 작업자는 첫 실행 때 띄움)."""
+    global _sandbox
+    with _lock:
+        if _sandbox is None:
+            _sandbox = Sandbox()
+        return _sandbox
+
+
+def sandboxed_tools(tools, df, data_key, sandbox=None):
+    """에이전트 도구 목록의 PythonAstREPLTool 을 샌드박스에서 실행하는 도구로 바꿉니다."""
+    from langchain_experimental.tools.python.tool import PythonAstREPLTool
+
+    sandbox = sandbox or get_sandbox()
+    publish_frame(df, data_key)
+
+    class SandboxedPythonTool(PythonAstREPLTool):
+        def _run(self, query, run_manager=None):
+            # 호출마다 사용 시각 갱신 (정리되어 사라졌으면 다시 씀)
+            return sandbox.run(data_key, publish_frame(df, data_key), query)
+
+        async def _arun(self, query, run_manager=None):
+            return self._run(query)
+
+    return [
+        SandboxedPythonTool(name=tool.name, description=tool.description)
+        if isinstance(tool, PythonAstREPLTool) else tool
+        for tool in tools
+    ]
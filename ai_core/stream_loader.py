@@ -0,0 +1,113 @@
+# 🌊 ai_core/stream_loader.py - 대용량 텍스트 파일용 스트리밍 로더 + 분할기
+#
+# TextLoader(...).load() 는 파일 전체를 문자열 하나로 읽고, 분할기는 모든 청크를 한꺼번에 만듭니다.
+# 여기서는 파일을 블록 단위(선택적으로 mmap)로 읽으며 청크를 하나씩 내보내므로,
+# embedding_pipeline.add_to_faiss 에 바로 흘려보내면 파일 크기와 상관없이 메모리 사용량이 거의 일정합니다.
+
+import codecs
+import mmap
+
+from langchain.docstore.document import Document
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024  # 1MB
+
+# 청크 경계로 우선 사용할 구분자 (앞쪽일수록 우선)
+SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+def _iter_raw_blocks(source, block_size, use_mmap):
+    # 경로 문자열 → 파일 열기 (mmap 선택 가능) / 파일 객체 → 그대로 읽기
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            if use_mmap:
+                try:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # 빈 파일은 mmap 불가
+                    return
+                with mapped:
+                    for start in range(0, len(mapped), block_size):
+                        yield mapped[start:start + block_size]
+                return
+            yield from iter(lambda: f.read(block_size), b"")
+    else:
+        source.seek(0)
+        yield from iter(lambda: source.read(block_size), b"")
+
+
+def iter_text_blocks(source, block_size=DEFAULT_BLOCK_SIZE, encoding="utf-8", use_mmap=False):
+    """파일 경로 또는 바이너리 파일 객체를 텍스트 블록 단위로 읽습니다.
+
+    증분 디코더를 쓰므로 블록 경계에서 한글(멀티바이트) 문자가 잘려도 깨지지 않습니다.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for raw in _iter_raw_blocks(source, block_size, use_mmap):
+        text = decoder.decode(raw)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _find_cut(text, chunk_size):
+    # chunk_size 안에서 가장 뒤쪽 구분자 위치에서 자르고, 없으면 chunk_size 에서 강제로 자름
+    window = text[:chunk_size]
+    for sep in SEPARATORS:
+        pos = window.rfind(sep)
+        if pos > 0:
+            return pos + len(sep)
+    return len(window)
+
+
+def _next_start(text, cut, chunk_overlap):
+    # 다음 청크 시작점: 겹침 구간 안에서 단어 경계로 맞춤
+    start = max(cut - chunk_overlap, 0)
+    if start == 0 or chunk_overlap == 0:
+        return cut
+    space = text.find(" ", start, cut)
+    if space != -1:
+        start = space + 1
+    return start if start < cut else cut
+
+
+def iter_chunks(blocks, chunk_size=300, chunk_overlap=50):
+    """텍스트 블록 이터러블을 (시작 오프셋, 청크) 로 나눠 내보냅니다.
+
+    블록 경계와 상관없이 chunk_overlap 만큼 앞 청크와 겹치도록 이어 붙입니다.
+    버퍼에는 항상 최대 (블록 1개 + chunk_size) 정도만 남습니다.
+    """
+    if chunk_overlap >= chunk_size:
+        raise ValueError("chunk_overlap 은 chunk_size 보다 작아야 합니다.")
+    buffer, offset = "", 0
+
+    def drain(final):
+        nonlocal buffer, offset
+        # 매 청크마다 문자열을 잘라내지 않고 pos 만 옮긴 뒤, 마지막에 한 번만 버퍼를 줄임
+        pos = 0
+        # final 이 아니면 다음 블록과 이어질 수 있으므로 chunk_size 보다 많이 남았을 때만 자름
+        while len(buffer) - pos > chunk_size or (final and pos < len(buffer)):
+            window = buffer[pos:pos + chunk_size]
+            cut = _find_cut(window, chunk_size)
+            raw = window[:cut]
+            chunk = raw.strip()
+            if chunk:
+                yield offset + pos + len(raw) - len(raw.lstrip()), chunk
+            if pos + cut >= len(buffer):
+                pos = len(buffer)
+                break
+            pos += _next_start(window, cut, chunk_overlap)
+        buffer = buffer[pos:]
+        offset += pos
+
+    for block in blocks:
+        buffer += block
+        yield from drain(final=False)
+    yield from drain(final=True)
+
+
+def iter_documents(source, chunk_size=300, chunk_overlap=50, name=None, **block_kwargs):
+    """대용량 텍스트를 Document 청크 제너레이터로 만듭니다 (metadata: source, start_index)."""
+    if name is None:
+        name = source if isinstance(source, str) else getattr(source, "name", "")
+    for start, chunk in iter_chunks(iter_text_blocks(source, **block_kwargs), chunk_size, chunk_overlap):
+        yield Document(page_content=chunk, metadata={"source": name, "start_index": start})
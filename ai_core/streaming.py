@@ -0,0 +1,143 @@
+# ⏱️ ai_core/streaming.py - 토큰 스트리밍 출력 + 첫 토큰 지연(TTFT) / 전체 지연 기록
+#
+# llm.predict(...) / llm(...) 은 답변이 전부 만들어질 때까지 화면에 아무것도 나오지 않습니다.
+# 여기서는 llm.stream(...) 으로 토큰이 도착하는 대로 st.write_stream / print 로 내보내고,
+# 요청마다 첫 토큰까지 걸린 시간과 전체 시간을 .cache/metrics/llm_latency.jsonl 에 한 줄씩 남깁니다.
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from ai_core.paths import cache_path
+
+LATENCY_LOG = os.path.join(cache_path("metrics"), "llm_latency.jsonl")
+
+_log_lock = threading.Lock()
+
+
+class StreamTiming:
+    """스트리밍 한 번의 시간 기록 (초 단위)."""
+
+    def __init__(self, label=""):
+        self.label = label
+        self.started = time.perf_counter()
+        self.first_token = None
+        self.finished = None
+        self.chars = 0
+        self.cached = False
+
+    @property
+    def ttft(self):
+        return None if self.first_token is None else self.first_token - self.started
+
+    @property
+    def total(self):
+        return None if self.finished is None else self.finished - self.started
+
+    def describe(self):
+        """Streamlit 캡션용 한 줄 요약."""
+        if self.cached:
+            return f"⚡ 캐시 응답 · {self.total or 0:.2f}초"
+        ttft = f"{self.ttft:.2f}초" if self.ttft is not None else "-"
+        return f"⏱️ 첫 토큰 {ttft} · 전체 {self.total or 0:.1f}초 · {self.chars:,}자"
+
+
+def _chunk_text(chunk):
+    # ChatOpenAI 는 메시지 청크(.content), OpenAI(completion) 는 문자열을 내보냄
+    return chunk if isinstance(chunk, str) else getattr(chunk, "content", "") or ""
+
+
+def _record(timing):
+    entry = {
+        "time": time.time(),
+        "label": timing.label,
+        "ttft": timing.ttft,
+        "total": timing.total,
+        "chars": timing.chars,
+        "cached": timing.cached,
+    }
+    with _log_lock, open(LATENCY_LOG, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def iter_stream(llm, prompt, timing=None):
+    """llm.stream(prompt) 의 텍스트 조각을 내보내며 timing 에 TTFT / 전체 시간을 기록합니다."""
+    timing = timing or StreamTiming()
+    try:
+        for chunk in llm.stream(prompt):
+            text = _chunk_text(chunk)
+            if not text:
+                continue
+            if timing.first_token is None:
+                timing.first_token = time.perf_counter()
+            timing.chars += len(text)
+            yield text
+    finally:
+        timing.finished = time.perf_counter()
+        _record(timing)
+
+
+def stream_to_console(llm, prompt, label=""):
+    """터미널 스크립트용: 토큰을 바로 print 하고 전체 답변을 반환합니다."""
+    timing = StreamTiming(label)
+    parts = []
+    for text in iter_stream(llm, prompt, timing):
+        print(text, end="", flush=True)
+        parts.append(text)
+    print()
+    return "".join(parts)
+
+
+def write_stream(llm, prompt, label="", container=None, answer_cache=None, question=None, context=""):
+    """Streamlit 화면에 토큰을 흘려 쓰고 (전체 답변, StreamTiming) 을 반환합니다.
+
+    answer_cache 를 주면 캐시에 있는 답은 바로 출력하고, 없을 때만 스트리밍 후 저장합니다.
+    container 로 st.empty() / st.container() 등 출력 위치를 지정할 수 있습니다.
+    """
+    import streamlit as st
+
+    target = container or st
+    timing = StreamTiming(label)
+
+    def compute():
+        return target.write_stream(iter_stream(llm, prompt, timing))
+
+    if answer_cache is None:
+        answer = compute()
+    else:
+        answer = answer_cache.cached_call(compute, prompt=prompt, question=question, context=context)
+        if answer_cache.last_hit:
+            target.write(answer)
+            timing.cached = True
+            timing.finished = time.perf_counter()
+            _record(timing)
+    # write_stream 은 문자열이 아닌 조각이 섞이면 리스트를 돌려주므로 문자열로 맞춤
+    if not isinstance(answer, str):
+        answer = "".join(str(part) for part in answer)
+    return answer, timing
+
+
+def latency_summary(limit=500):
+    """최근 limit 건의 (비캐시) 스트리밍 기록 요약: 건수, 평균/최대 TTFT, 평균 전체 시간."""
+    if not os.path.exists(LATENCY_LOG):
+        return {"count": 0}
+    with open(LATENCY_LOG, encoding="utf-8") as f:
+        lines = deque(f, maxlen=limit)
+    entries = [json.loads(line) for line in lines if line.strip()]
+    entries = [e for e in entries if not e.get("cached") and e.get("ttft") is not None]
+    if not entries:
+        return {"count": 0}
+    ttfts = [e["ttft"] for e in entries]
+    totals = [e["total"] for e in entries]
+    return {
+        "count": len(entries),
+        "ttft_avg": sum(ttfts) / len(ttfts),
+        "ttft_max": max(ttfts),
+        "total_avg": sum(totals) / len(totals),
+    }
+
+
+if __name__ == "__main__":
+    print(latency_summary())
@@ -4,22 +4,25 @@
 # 💬 사용자 질문 응답	추가 질문 시 GPT가 데이터 기반 답변
 
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import matplotlib
-from dotenv import load_dotenv
-from langchain_community.llms import OpenAI
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.charts import render_chart
+from ai_core.data_context import get_data_context
+from ai_core.ingest import load_csv, source_hash
+from ai_core.llm_client import get_embeddings, get_llm
+from ai_core.streaming import write_stream
 
 # ✅ 한글 폰트 설정
 matplotlib.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+matplotlib.rcParams['axes.unicode_minus'] = False
 
-# 🔐 API 키 로딩
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-llm = OpenAI(openai_api_key=api_key)
+# 🤖 GPT 모델 설정
+llm = get_llm()
+answer_cache = AnswerCache(get_embeddings())  # 반복 질문 답변 캐시
 
 # 🌐 페이지 설정
 st.set_page_config(page_title="CSV 통합 GPT 분석기", page_icon="🧠")
@@ -30,37 +33,33 @@ st.markdown("CSV를 업로드하면 그래프도 그리고 GPT가 설명도 해
 uploaded_file = st.file_uploader("CSV 파일을 업로드하세요", type=["csv"])
 
 if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
+    df = load_csv(uploaded_file)
+    data_fingerprint = source_hash(uploaded_file)
+    data_context = get_data_context(df, data_fingerprint, name=uploaded_file.name)  # 질문별 토큰 예산 컨텍스트
 
     st.subheader("📄 데이터 미리보기")
     st.dataframe(df)
 
     # 📊 자동 시각화
     st.subheader("📈 단가 vs 판매량 산점도")
-    fig, ax = plt.subplots()
-    sns.scatterplot(data=df, x="단가", y="판매량", hue="제품명", s=100, ax=ax)
-    plt.title("제품별 단가 vs 판매량")
-    st.pyplot(fig)
+    st.image(render_chart(df, data_fingerprint, "scatter", x="단가", y="판매량",
+                          hue="제품명", s=100, title="제품별 단가 vs 판매량"))  # 같은 파일이면 캐시된 그림
 
     # 🧠 GPT 자동 해석
     st.subheader("📌 GPT의 해석 결과")
-    description = df.describe(include='all').to_string()
-    head_data = df.head().to_string()
-
     auto_prompt = f"""
     아래는 제품 판매 데이터입니다.
-    [데이터 요약]
-    {description}
-
-    [데이터 미리보기]
-    {head_data}
+    [데이터]
+    {data_context.build("단가와 판매량의 관계, 제품별 특징")}
 
     단가와 판매량의 관계를 분석하고, 제품별 특징을 알려줘.
     """
-    with st.spinner("GPT가 자동 해석 중..."):
-        auto_response = llm(auto_prompt)
     st.success("✅ 자동 해석 결과:")
-    st.write(auto_response)
+    # 토큰 단위로 출력하고, 재실행마다 같은 프롬프트가 다시 나가지 않도록 캐시 사용
+    auto_response, auto_timing = write_stream(
+        llm, auto_prompt, label="csvHybrid:auto", answer_cache=answer_cache, context=data_fingerprint
+    )
+    st.caption(auto_timing.describe())
 
     # 💬 사용자 질문 입력
     st.subheader("💬 궁금한 걸 GPT에게 물어보세요!")
@@ -71,21 +70,21 @@ if uploaded_file is not None:
             full_prompt = f"""
             아래는 제품 판매 데이터입니다.
 
-            [데이터 요약]
-            {description}
-
-            [데이터 미리보기]
-            {head_data}
+            [데이터]
+            {data_context.build(user_question)}
 
             사용자 질문:
             {user_question}
 
             데이터 기반으로 정리해서 설명해줘.
             """
-            with st.spinner("GPT가 생각 중입니다..."):
-                answer = llm(full_prompt)
             st.success("💬 GPT의 답변:")
-            st.write(answer)
+            answer, timing = write_stream(
+                llm, full_prompt, label="csvHybrid", answer_cache=answer_cache,
+                question=user_question, context=data_fingerprint,
+            )
+            st.caption(timing.describe())
+            st.caption(answer_cache.describe_last())
         else:
             st.warning("질문을 입력해 주세요.")
 else:
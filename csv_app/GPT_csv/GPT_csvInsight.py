@@ -1,23 +1,26 @@
 ##문서를 참고해서 GPT가 그래프를 그려주고 해석해줌줌
 
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import matplotlib
-from dotenv import load_dotenv
-from langchain_community.llms import OpenAI
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.charts import render_chart
+from ai_core.data_context import get_data_context
+from ai_core.ingest import load_csv, source_hash
+from ai_core.llm_client import get_llm
+from ai_core.streaming import write_stream
 import io
 
 # ✅ 한글 깨짐 방지
 matplotlib.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+matplotlib.rcParams['axes.unicode_minus'] = False
 
-# 🔐 OpenAI API Key 불러오기
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-llm = OpenAI(openai_api_key=api_key)
+# 🤖 GPT 모델 설정
+llm = get_llm()
+answer_cache = AnswerCache()  # 같은 데이터 재실행 시 답변 재사용
 
 # 🌐 페이지 설정
 st.set_page_config(page_title="CSV 자동 분석 GPT", page_icon="📈")
@@ -28,21 +31,20 @@ st.markdown("CSV 업로드 → 자동 그래프 생성 → GPT가 그래프 해
 uploaded_file = st.file_uploader("CSV 파일을 업로드하세요", type=["csv"])
 
 if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
+    df = load_csv(uploaded_file)
     st.subheader("📄 데이터 미리보기")
     st.dataframe(df)
 
+    data_fingerprint = source_hash(uploaded_file)
+
     # 🎯 시각화: 단가 vs 판매량
     st.subheader("📊 단가 vs 판매량 산점도")
-    fig, ax = plt.subplots()
-    sns.scatterplot(data=df, x="단가", y="판매량", hue="제품명", s=100, ax=ax)
-    plt.title("제품별 단가 vs 판매량")
-    st.pyplot(fig)
+    st.image(render_chart(df, data_fingerprint, "scatter", x="단가", y="판매량",
+                          hue="제품명", s=100, title="제품별 단가 vs 판매량"))  # 같은 파일이면 캐시된 그림
 
     # 🧠 GPT에게 그래프 해석 요청
-    # 📌 그래프 요약용 데이터를 문자열로 추출
-    description_text = df.describe(include='all').to_string()
-    head_text = df.head().to_string()
+    # 📌 그래프 요약용 데이터 컨텍스트 (단가·판매량·제품 관련 컬럼 위주로 토큰 예산 안에서 선택)
+    data_context = get_data_context(df, data_fingerprint, name=uploaded_file.name)
 
     st.subheader("🧠 GPT의 그래프 해석")
 
@@ -51,20 +53,18 @@ if uploaded_file is not None:
     '단가'와 '판매량'의 관계를 중심으로 그래프를 해석해줘.
     제품별 특징도 분석해서 설명해줘.
 
-    [데이터 요약]
-    {description_text}
-
-    [데이터 미리보기]
-    {head_text}
+    [데이터]
+    {data_context.build("단가 판매량 제품명")}
 
     친절하고 분석적으로 설명해줘.
     """
 
-    with st.spinner("GPT가 그래프를 해석하는 중입니다...🧠"):
-        response = llm(gpt_prompt)
-
     st.success("✅ 해석 결과:")
-    st.write(response)
+    # 토큰 단위로 출력하고, 재실행마다 같은 프롬프트가 다시 나가지 않도록 캐시 사용
+    response, timing = write_stream(
+        llm, gpt_prompt, label="csvInsight", answer_cache=answer_cache, context=data_fingerprint
+    )
+    st.caption(timing.describe())
 
 else:
     st.info("📁 CSV 파일을 먼저 업로드해주세요.")
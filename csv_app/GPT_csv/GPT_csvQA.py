@@ -1,15 +1,19 @@
 ##CSV파일을 분석해서 질문을 할 수 있다.
 
 import streamlit as st
-import pandas as pd
-from dotenv import load_dotenv
-from langchain.llms import OpenAI
 import os
+import sys
 
-# 환경변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-llm = OpenAI(openai_api_key=api_key)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.data_context import get_data_context
+from ai_core.ingest import load_csv, source_hash
+from ai_core.llm_client import get_embeddings, get_llm
+from ai_core.streaming import write_stream
+
+# LLM 설정
+llm = get_llm()
+answer_cache = AnswerCache(get_embeddings())  # 반복 질문 답변 캐시
 
 st.set_page_config(page_title="CSV 분석 GPT", page_icon="📊")
 st.title("📊 성주의 CSV 기반 GPT 어시스턴트")
@@ -19,13 +23,13 @@ st.markdown("CSV 데이터를 업로드하고 질문하면 GPT가 답변해줘
 uploaded_file = st.file_uploader("CSV 파일을 업로드하세요", type=["csv"])
 
 if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
+    df = load_csv(uploaded_file)
     st.subheader("🔍 업로드한 데이터 미리보기")
     st.dataframe(df)
 
-    # GPT에게 넘길 CSV 요약
-    df_summary = df.describe(include='all').to_string()
-    df_head = df.head().to_string()
+    # GPT에게 넘길 데이터 컨텍스트 (컬럼 요약은 파일당 한 번만 계산, 질문마다 관련 컬럼/행만 선택)
+    data_fingerprint = source_hash(uploaded_file)
+    data_context = get_data_context(df, data_fingerprint, name=uploaded_file.name)
 
     # 질문 입력
     user_input = st.text_input("CSV에 대해 궁금한 점을 입력하세요 🤔")
@@ -35,11 +39,8 @@ if uploaded_file is not None:
             prompt = f"""
             아래는 판매 기록이 담긴 표입니다.
 
-            [데이터 요약]
-            {df_summary}
-
-            [데이터 일부 미리보기]
-            {df_head}
+            [데이터]
+            {data_context.build(user_input)}
 
             사용자의 질문:
             {user_input}
@@ -47,11 +48,13 @@ if uploaded_file is not None:
             위 표를 참고해서, 질문에 대해 정확하고 분석적으로 답변해주세요.
             """
 
-            with st.spinner("분석 중입니다...📊"):
-                response = llm(prompt)
-
             st.success("✅ GPT의 답변:")
-            st.write(response)
+            response, timing = write_stream(
+                llm, prompt, label="csvQA", answer_cache=answer_cache, question=user_input,
+                context=data_fingerprint,
+            )
+            st.caption(timing.describe())
+            st.caption(answer_cache.describe_last())
         else:
             st.warning("질문을 입력해 주세요!")
 else:
@@ -1,22 +1,25 @@
 ##CSV파일을 분석해서 그래프로 표현한다.
 
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import matplotlib
-from dotenv import load_dotenv
-from langchain.llms import OpenAI
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.charts import render_chart
+from ai_core.data_context import get_data_context
+from ai_core.ingest import load_csv, source_hash
+from ai_core.llm_client import get_embeddings, get_llm
+from ai_core.streaming import write_stream
 
 # ✅ 한글 폰트 설정 (Windows 기준)
 matplotlib.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False  # 마이너스 부호 깨짐 방지
+matplotlib.rcParams['axes.unicode_minus'] = False  # 마이너스 부호 깨짐 방지
 
-# 🌍 환경 변수 불러오기
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-llm = OpenAI(openai_api_key=api_key)
+# 🤖 GPT 모델 설정
+llm = get_llm()
+answer_cache = AnswerCache(get_embeddings())  # 반복 질문 답변 캐시
 
 # 🌐 웹 UI 설정
 st.set_page_config(page_title="CSV 시각화 GPT", page_icon="📊")
@@ -28,20 +31,18 @@ uploaded_file = st.file_uploader("CSV 파일을 업로드하세요", type=["csv"
 
 if uploaded_file is not None:
     # 🔎 데이터 읽기
-    df = pd.read_csv(uploaded_file)
+    df = load_csv(uploaded_file)
     st.subheader("📄 데이터 미리보기")
     st.dataframe(df)
 
     # 📈 시각화
     st.subheader("📊 단가 vs 판매량 산점도")
-    fig, ax = plt.subplots()
-    sns.scatterplot(data=df, x="단가", y="판매량", hue="제품명", s=100, ax=ax)
-    plt.title("제품별 단가 vs 판매량")
-    st.pyplot(fig)
+    st.image(render_chart(df, source_hash(uploaded_file), "scatter", x="단가", y="판매량",
+                          hue="제품명", s=100, title="제품별 단가 vs 판매량"))  # 같은 파일이면 캐시된 그림
 
     # 💬 GPT 질문
-    df_summary = df.describe(include='all').to_string()
-    df_head = df.head().to_string()
+    data_fingerprint = source_hash(uploaded_file)
+    data_context = get_data_context(df, data_fingerprint, name=uploaded_file.name)  # 질문별 토큰 예산 컨텍스트
     user_input = st.text_input("GPT에게 질문해보세요 🤖")
 
     if st.button("질문하기"):
@@ -49,22 +50,21 @@ if uploaded_file is not None:
             prompt = f"""
             아래는 제품 판매 기록이 담긴 데이터입니다.
 
-            [데이터 요약]
-            {df_summary}
-
-            [데이터 미리보기]
-            {df_head}
+            [데이터]
+            {data_context.build(user_input)}
 
             사용자의 질문:
             {user_input}
 
             위 데이터를 참고해서, 친절하고 분석적인 답변을 해줘.
             """
-            with st.spinner("GPT가 분석 중입니다...🧠"):
-                response = llm(prompt)
-
             st.success("✅ GPT의 답변:")
-            st.write(response)
+            response, timing = write_stream(
+                llm, prompt, label="csvViz", answer_cache=answer_cache, question=user_input,
+                context=data_fingerprint,
+            )
+            st.caption(timing.describe())
+            st.caption(answer_cache.describe_last())
         else:
             st.warning("질문을 입력해 주세요.")
 else:
@@ -1,19 +1,19 @@
 # 📊 GPT 자동 인사이트 제안 시스템 (GPT_excelInsight.py)
 # 엑셀 데이터 업로드 → GPT가 분석 방향 제안 → 선택 시 시각화 + 해석까지 수행
 
-import pandas as pd
 import streamlit as st
-from langchain.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
-from dotenv import load_dotenv
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
+import sys
 
-# 🌱 환경 변수 로드 및 GPT 모델 설정
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.2, model_name="gpt-3.5-turbo")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.charts import render_chart
+from ai_core.ingest import load_excel, source_hash
+from ai_core.llm_client import get_chat_model
+from ai_core.streaming import write_stream
+
+# 🤖 GPT 모델 설정
+llm = get_chat_model()
 
 # 🖥️ Streamlit UI 설정
 st.set_page_config(page_title="📈 GPT 자동 인사이트 분석기", page_icon="🔍")
@@ -24,7 +24,7 @@ st.markdown("엑셀 데이터를 업로드하면 GPT가 분석 방향을 추천
 uploaded_file = st.file_uploader("📁 엑셀 파일을 업로드하세요", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df = load_excel(uploaded_file)
     st.subheader("📋 데이터 미리보기")
     st.dataframe(df.head())
 
@@ -43,8 +43,8 @@ if uploaded_file:
         각각 어떤 컬럼을 분석 대상으로 쓰는지 함께 설명해줘.
         """
     )
-    gpt_recommend = llm.predict(prompt.format(columns=col_list))
-    st.info(gpt_recommend)
+    gpt_recommend, timing = write_stream(llm, prompt.format(columns=col_list), label="excelInsight:recommend")
+    st.caption(timing.describe())
 
     # 🎯 사용자 선택 후 시각화
     st.markdown("---")
@@ -55,18 +55,8 @@ if uploaded_file:
     y_col = st.selectbox("Y축 컬럼", df.columns)
 
     if st.button("📈 시각화 및 해석 실행"):
-        fig, ax = plt.subplots()
-
-        if chart_type == "바 차트":
-            sns.barplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "선 차트":
-            sns.lineplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "원형 차트":
-            grouped = df.groupby(x_col)[y_col].sum()
-            ax.pie(grouped, labels=grouped.index, autopct="%1.1f%%")
-            ax.set_ylabel("")
-
-        st.pyplot(fig)
+        # 같은 파일·차트 선택이면 다시 그리지 않고 캐시된 그림을 사용
+        st.image(render_chart(df, source_hash(uploaded_file), chart_type, x=x_col, y=y_col))
 
         # GPT 해석 출력
         explain_prompt = PromptTemplate(
@@ -80,10 +70,11 @@ if uploaded_file:
             이 데이터를 바탕으로 의미 있는 인사이트를 간결히 설명해줘.
             """
         )
-        gpt_explanation = llm.predict(explain_prompt.format(x=x_col, y=y_col, type=chart_type))
-
         st.markdown("🧠 **GPT 분석 결과:**")
-        st.success(gpt_explanation)
+        gpt_explanation, timing = write_stream(
+            llm, explain_prompt.format(x=x_col, y=y_col, type=chart_type), label="excelInsight:explain"
+        )
+        st.caption(timing.describe())
 
 # ▶ 실행 명령어
 # streamlit run csv_app/GPT_excel/GPT_excelInsight.py
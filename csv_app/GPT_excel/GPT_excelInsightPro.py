@@ -1,20 +1,20 @@
 # 📊 GPT 데이터 마스터 Pro - EDA 통합 버전
 # 엑셀 파일을 분석하여 시각화 + GPT 인사이트 + 일변량 EDA + 다변량 EDA 히트맵까지 자동 실행됩니다.
 
-import pandas as pd
-import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 import streamlit as st
-from dotenv import load_dotenv
 import os
-from langchain.chat_models import ChatOpenAI
+import sys
 from langchain.prompts import PromptTemplate
 
-# 🌱 환경 변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.2, model_name="gpt-3.5-turbo")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.charts import render_chart, render_heatmap
+from ai_core.ingest import source_hash
+from ai_core.llm_client import get_chat_model
+from ai_core.profile import load_for_eda
+from ai_core.streaming import write_stream
+
+# 🤖 GPT 모델 설정
+llm = get_chat_model()
 
 # 🖥️ Streamlit 설정
 st.set_page_config(page_title="📊 GPT 데이터 마스터 Pro", page_icon="🧠")
@@ -25,7 +25,9 @@ st.markdown("엑셀 파일을 업로드하면 시각화 + GPT 분석 + 일변량
 uploaded_file = st.file_uploader("📁 분석할 엑셀 파일을 업로드하세요", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df, profile = load_for_eda(uploaded_file)  # 📊 통계/상관행렬은 업로드당 한 번만 (큰 파일은 청크 스트리밍 + 표본 행)
+    if profile.approximate:
+        st.caption(profile.note)
     st.subheader("📋 데이터 미리보기")
     st.dataframe(df.head())
 
@@ -37,16 +39,7 @@ if uploaded_file:
     y_col = st.selectbox("Y축 컬럼", df.columns)
 
     if st.button("✅ 분석 실행"):
-        fig, ax = plt.subplots()
-        if chart_type == "바 차트":
-            sns.barplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "선 차트":
-            sns.lineplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "원형 차트":
-            df_grouped = df.groupby(x_col)[y_col].sum()
-            ax.pie(df_grouped, labels=df_grouped.index, autopct="%1.1f%%")
-            ax.set_ylabel("")
-        st.pyplot(fig)
+        st.image(render_chart(df, source_hash(uploaded_file), chart_type, x=x_col, y=y_col))  # 같은 선택이면 캐시된 그림
 
         # 🔮 GPT 시각화 인사이트
         chart_prompt = PromptTemplate(
@@ -61,24 +54,20 @@ if uploaded_file:
             이 시각화를 보고 얻을 수 있는 통찰을 간단히 요약해줘.
             """
         )
-        gpt_chart = llm.predict(chart_prompt.format(x=x_col, y=y_col, type=chart_type))
         st.markdown("🧠 **GPT 시각화 인사이트 요약**")
-        st.info(gpt_chart)
+        gpt_chart, timing = write_stream(llm, chart_prompt.format(x=x_col, y=y_col, type=chart_type), label="excelInsightPro:chart")
+        st.caption(timing.describe())
 
         # 🔍 일변량 EDA
         st.markdown("---")
         st.subheader("📊 일변량 EDA 통계 요약")
-        numeric_cols = df.select_dtypes(include=np.number).columns
-        univariate = df[numeric_cols].describe()
-        st.dataframe(univariate)
+        st.dataframe(profile.annotate(profile.numeric_describe))
 
         # 🔗 다변량 EDA
         st.markdown("---")
         st.subheader("📊 다변량 EDA (상관계수 히트맵)")
-        corr = df[numeric_cols].corr()
-        fig2, ax2 = plt.subplots()
-        sns.heatmap(corr, annot=True, cmap="coolwarm", ax=ax2)
-        st.pyplot(fig2)
+        corr = profile.corr
+        st.image(render_heatmap(corr, source_hash(uploaded_file) + ":corr", annot=True, cmap="coolwarm"))
 
         # GPT 상관관계 해석
         corr_prompt = PromptTemplate(
@@ -89,8 +78,8 @@ if uploaded_file:
             {corr}
             """
         )
-        gpt_corr = llm.predict(corr_prompt.format(corr=corr.to_string()))
         st.markdown("🧠 **GPT 상관관계 인사이트 요약**")
-        st.info(gpt_corr)
+        gpt_corr, timing = write_stream(llm, corr_prompt.format(corr=profile.corr_text), label="excelInsightPro:corr")
+        st.caption(timing.describe())
 
 #실행 명령어 : streamlit run GPT_DataMasterPro.py
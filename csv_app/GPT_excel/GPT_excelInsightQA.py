@@ -4,20 +4,19 @@
 # - 사용자가 질문 → GPT가 답변 → 인사이트 저장 및 다운로드
 
 import os
-import pandas as pd
+import sys
 import streamlit as st
-from dotenv import load_dotenv
 from datetime import datetime
 from io import StringIO
-from langchain.chat_models import ChatOpenAI
-from langchain_experimental.agents import create_pandas_dataframe_agent
 
-# 🌱 환경 변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.agent_pool import get_pandas_agent
+from ai_core.ingest import load_excel, source_hash
+from ai_core.llm_client import get_chat_model
+from ai_core.query_planner import answer_question
 
 # 🤖 GPT 모델 연결
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.2)
+llm = get_chat_model()
 
 # 🖥️ Streamlit 설정
 st.set_page_config(page_title="GPT 질문 인사이트 저장기", page_icon="💬")
@@ -32,7 +31,7 @@ if "qa_insights" not in st.session_state:
 uploaded_file = st.file_uploader("📁 엑셀 파일 업로드", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df = load_excel(uploaded_file)
     st.subheader("📋 데이터 미리보기")
     st.dataframe(df.head())
 
@@ -40,18 +39,26 @@ if uploaded_file:
     question = st.text_input("❓ GPT에게 질문하세요")
 
     if st.button("🔍 분석 실행") and question:
-        # LangChain Pandas Agent 실행
-        agent = create_pandas_dataframe_agent(
-            llm, df,
-            verbose=False,
-            agent_type="openai-tools",
-            handle_parsing_errors=True,
-            allow_dangerous_code=True
-        )
-        answer = agent.run(question)
+        # LangChain Pandas Agent 실행 (집계 질문은 pandas 로 바로 계산)
+        def run_agent():
+            # 🤖 같은 데이터의 에이전트는 풀에서 재사용 (클릭마다 새로 만들지 않음)
+            agent = get_pandas_agent(
+                df, source_hash(uploaded_file), llm,
+                verbose=False,
+                agent_type="openai-tools",
+                handle_parsing_errors=True,
+                allow_dangerous_code=True
+            )
+            return agent.run(question)
+
+        result = answer_question(df, question, fallback=run_agent)
+        answer = result.text
 
         st.markdown("### 🧠 GPT의 답변")
         st.success(answer)
+        if result.table is not None:
+            st.dataframe(result.table)
+        st.caption(result.describe())
 
         # 인사이트 저장 버튼
         if st.button("💾 이 인사이트 저장"):
@@ -5,20 +5,19 @@
 # - 텍스트 파일로 다운로드 기능
 
 import os
-import pandas as pd
+import sys
 import streamlit as st
-from dotenv import load_dotenv
 from datetime import datetime
 from io import StringIO
-from langchain.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
 
-# 🌱 환경 변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.ingest import load_excel
+from ai_core.llm_client import get_chat_model
+from ai_core.streaming import write_stream
 
 # 🤖 GPT 모델 세팅
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.2)
+llm = get_chat_model()
 
 # 📁 인사이트 저장 리스트
 insight_list = []
@@ -31,7 +30,7 @@ st.title("🧠 GPT 분석 인사이트 저장기")
 uploaded_file = st.file_uploader("엑셀 파일을 업로드하세요", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df = load_excel(uploaded_file)
     st.subheader("📋 데이터 미리보기")
     st.dataframe(df.head())
 
@@ -51,10 +50,9 @@ if uploaded_file:
             """
         ).format(x=x_col, y=y_col)
 
-        gpt_response = llm.predict(prompt)
-
         st.markdown("### 🔍 GPT 분석 결과")
-        st.success(gpt_response)
+        gpt_response, timing = write_stream(llm, prompt, label="excelInsightSaver")  # 토큰 단위로 바로 출력
+        st.caption(timing.describe())
 
         # 📝 인사이트 저장 기능
         if st.button("💾 인사이트 저장"):
@@ -4,20 +4,19 @@
 # - 인사이트 저장 + 리스트 출력 + TXT 다운로드 기능 포함
 
 import os
-import pandas as pd
+import sys
 import streamlit as st
-from dotenv import load_dotenv
 from datetime import datetime
 from io import StringIO
-from langchain.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
 
-# 🌱 환경 변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.ingest import load_excel
+from ai_core.llm_client import get_chat_model
+from ai_core.streaming import write_stream
 
 # 🤖 GPT 모델 세팅
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.2)
+llm = get_chat_model()
 
 # 🖥️ Streamlit 설정
 st.set_page_config(page_title="GPT 인사이트 저장기 Pro", page_icon="📘")
@@ -32,7 +31,7 @@ if "insights" not in st.session_state:
 uploaded_file = st.file_uploader("📁 엑셀 파일 업로드", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df = load_excel(uploaded_file)
     st.subheader("📄 데이터 미리보기")
     st.dataframe(df.head())
 
@@ -52,10 +51,9 @@ if uploaded_file:
             """
         ).format(x=x_col, y=y_col)
 
-        gpt_result = llm.predict(prompt)
-
         st.markdown("### 🧠 GPT 분석 결과")
-        st.info(gpt_result)
+        gpt_result, timing = write_stream(llm, prompt, label="excelInsightSaverPro")  # 토큰 단위로 바로 출력
+        st.caption(timing.describe())
 
         # 저장 버튼
         if st.button("💾 인사이트 저장"):
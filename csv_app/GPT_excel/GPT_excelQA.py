@@ -5,22 +5,26 @@
 # 💬 GPT가 해석까지!
 
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import matplotlib
-from dotenv import load_dotenv
-from langchain_community.llms import OpenAI
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.charts import render_chart
+from ai_core.data_context import get_data_context
+from ai_core.hashing import content_hash
+from ai_core.ingest import excel_sheet_names, load_excel, source_hash
+from ai_core.llm_client import get_llm
+from ai_core.streaming import write_stream
 
 # ✅ 한글 설정
 matplotlib.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+matplotlib.rcParams['axes.unicode_minus'] = False
 
-# 🔐 OpenAI 키 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-llm = OpenAI(openai_api_key=api_key)
+# 🤖 GPT 모델 설정
+llm = get_llm()
+answer_cache = AnswerCache()  # 같은 데이터 재실행 시 답변 재사용
 
 # 🌐 페이지 설정
 st.set_page_config(page_title="엑셀 GPT 분석기", page_icon="📊")
@@ -32,44 +36,39 @@ uploaded_file = st.file_uploader("엑셀 파일을 업로드하세요", type=["x
 
 if uploaded_file is not None:
     # 🔄 시트 목록 확인
-    xls = pd.ExcelFile(uploaded_file)
-    sheet_names = xls.sheet_names
+    sheet_names = excel_sheet_names(uploaded_file)
     sheet = st.selectbox("분석할 시트를 선택하세요", sheet_names)
 
     # ✅ 선택된 시트 읽기
-    df = pd.read_excel(uploaded_file, sheet_name=sheet)
+    df = load_excel(uploaded_file, sheet_name=sheet)
     st.subheader("📄 데이터 미리보기")
     st.dataframe(df)
 
+    data_fingerprint = content_hash(source_hash(uploaded_file), sheet)
+
     # 📊 자동 시각화 (예: 단가 vs 판매량)
     st.subheader("📈 자동 시각화 (예시)")
     if "단가" in df.columns and "판매량" in df.columns:
-        fig, ax = plt.subplots()
-        sns.scatterplot(data=df, x="단가", y="판매량", hue="제품명", s=100, ax=ax)
-        plt.title("단가 vs 판매량")
-        st.pyplot(fig)
+        st.image(render_chart(df, data_fingerprint, "scatter", x="단가", y="판매량",
+                              hue="제품명", s=100, title="단가 vs 판매량"))  # 같은 파일·시트면 캐시된 그림
 
     # 🧠 GPT 해석
     st.subheader("🧠 GPT 자동 해석")
-    describe_text = df.describe(include='all').to_string()
-    head_text = df.head().to_string()
+    data_context = get_data_context(df, data_fingerprint, name=f"{uploaded_file.name} - {sheet}")  # 토큰 예산 컨텍스트
 
     prompt = f"""
     아래는 Excel 데이터입니다.
-    [요약 통계]
-    {describe_text}
-
-    [샘플 데이터]
-    {head_text}
+    {data_context.build()}
 
     이 데이터를 분석해서 중요한 특징과 의미 있는 인사이트를 알려줘.
     """
 
-    with st.spinner("GPT가 분석 중입니다..."):
-        response = llm(prompt)
-
     st.success("✅ GPT의 분석 결과:")
-    st.write(response)
+    # 토큰 단위로 출력하고, 시트를 바꾸지 않은 재실행에서는 캐시된 해석을 그대로 사용
+    response, timing = write_stream(
+        llm, prompt, label="excelQA", answer_cache=answer_cache, context=data_fingerprint
+    )
+    st.caption(timing.describe())
 
 else:
     st.info("먼저 .xlsx 파일을 업로드해주세요.")
@@ -3,20 +3,21 @@
 # → GPT가 엑셀 내용을 읽고 자연어로 분석 결과를 답변! 🤖💬
 
 import streamlit as st
-import pandas as pd
-from dotenv import load_dotenv
 import os
-from langchain.chat_models import ChatOpenAI
+import sys
 from langchain.chains.question_answering import load_qa_chain
 from langchain.docstore.document import Document
 
-# 환경 변수 로딩
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.data_context import get_data_context
+from ai_core.ingest import load_excel, source_hash
+from ai_core.llm_client import get_chat_model, get_embeddings
 
 # GPT 모델 초기화
-llm = ChatOpenAI(openai_api_key=api_key, model_name="gpt-3.5-turbo")
+llm = get_chat_model(temperature=0.7)
 chain = load_qa_chain(llm, chain_type="stuff")
+answer_cache = AnswerCache(get_embeddings())  # 반복 질문 답변 캐시
 
 # Streamlit 설정
 st.set_page_config(page_title="📊 GPT 분석", page_icon="📈")
@@ -28,19 +29,23 @@ uploaded_file = st.file_uploader("📁 엑셀 파일 업로드", type=["xlsx"])
 question = st.text_input("🤔 궁금한 점을 입력해 주세요")
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df = load_excel(uploaded_file)
     st.dataframe(df.head())
 
-    # 💡 데이터 요약을 위해 일부 행만 텍스트로 변환
-    short_df = df.head(100)  # 필요한 만큼 조정 가능
-    full_text = short_df.to_csv(index=False)
-    doc = Document(page_content=full_text)
+    # 💡 질문과 관련 있는 컬럼 요약 + 대표 행만 토큰 예산 안에서 텍스트로 변환
+    data_fingerprint = source_hash(uploaded_file)
+    data_context = get_data_context(df, data_fingerprint, name=uploaded_file.name)
 
     if question:
+        doc = Document(page_content=data_context.build(question))
         with st.spinner("GPT가 분석 중입니다..."):
-            result = chain.run(input_documents=[doc], question=question)
+            result = answer_cache.cached_call(
+                lambda: chain.run(input_documents=[doc], question=question),
+                prompt=question, question=question, context=data_fingerprint,
+            )
             st.success("✅ GPT의 답변:")
             st.write(result)
+            st.caption(answer_cache.describe_last())
 
 # 실행 명령어 : streamlit run csv_app/Chat_GPT_excelQA_Q4.py
 
@@ -12,21 +12,22 @@
 # 5.GPT가 답변 생성 (문서 기반 추론처럼)
 
 import streamlit as st
-import pandas as pd
-from dotenv import load_dotenv
 import os
-from langchain.chat_models import ChatOpenAI
+import sys
 from langchain.prompts import PromptTemplate
 from langchain.chains.question_answering import load_qa_chain
 from langchain.docstore.document import Document
 
-# 환경변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.answer_cache import AnswerCache
+from ai_core.data_context import get_data_context
+from ai_core.ingest import load_excel, source_hash
+from ai_core.llm_client import get_chat_model, get_embeddings
 
 # GPT 모델 준비
-llm = ChatOpenAI(openai_api_key=api_key)
+llm = get_chat_model(temperature=0.7)
 chain = load_qa_chain(llm, chain_type="stuff")
+answer_cache = AnswerCache(get_embeddings())  # 반복 질문 답변 캐시
 
 # 웹 페이지 설정
 st.set_page_config(page_title="📊 엑셀 GPT 분석", page_icon="📁")
@@ -40,17 +41,22 @@ uploaded_file = st.file_uploader("엑셀 파일을 업로드하세요", type=["x
 question = st.text_input("엑셀 데이터에 대해 궁금한 점을 입력하세요 🤔")
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df = load_excel(uploaded_file)
     st.dataframe(df)
 
-    # GPT에 넘길 텍스트로 변환
-    full_text = df.to_csv(index=False)
-    doc = Document(page_content=full_text)
+    # 💡 질문과 관련 있는 컬럼 요약 + 대표 행만 토큰 예산 안에서 텍스트로 변환
+    data_fingerprint = source_hash(uploaded_file)
+    data_context = get_data_context(df, data_fingerprint, name=uploaded_file.name)
 
     if question:
+        doc = Document(page_content=data_context.build(question))
         with st.spinner("답변 생성 중... 🤖"):
-            result = chain.run(input_documents=[doc], question=question)
+            result = answer_cache.cached_call(
+                lambda: chain.run(input_documents=[doc], question=question),
+                prompt=question, question=question, context=data_fingerprint,
+            )
             st.success("GPT의 답변:")
             st.write(result)
+            st.caption(answer_cache.describe_last())
 
 # 실행 명령어 : streamlit run csv_app/Chat_GPT_excelQA_QA.py
@@ -2,22 +2,21 @@
 # GPT가 자동으로 보고서를 생성해주는 전체 시스템입니다.
 # 다른 파일과 연동될것임.
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import streamlit as st
-from langchain.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
-from dotenv import load_dotenv
 import os
-import tempfile
+import sys
 
-# 환경 변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.ingest import load_excel, source_hash
+from ai_core.llm_client import get_chat_model
+from ai_core.profile import get_profile
+from ai_core.streaming import write_stream
 
 # GPT 모델 설정
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.2, model_name="gpt-3.5-turbo")
+llm = get_chat_model()
 
 # Streamlit UI 설정
 st.set_page_config(page_title="📄 GPT 자동 보고서 생성기", page_icon="📝")
@@ -28,19 +27,20 @@ st.markdown("엑셀 데이터 업로드 후, 분석 보고서를 자동으로 
 uploaded_file = st.file_uploader("📁 엑셀 파일을 업로드하세요", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df = load_excel(uploaded_file)
+    profile = get_profile(df, source_hash(uploaded_file))  # 📊 통계/상관행렬은 업로드당 한 번만 계산
     st.subheader("📊 데이터 미리보기")
     st.dataframe(df.head())
 
     # 통계 요약
     st.markdown("---")
     st.subheader("📌 기본 통계 요약")
-    st.dataframe(df.describe(include="all"))
+    st.dataframe(profile.describe)
 
     # GPT 분석 요청
     if st.button("🧠 GPT에게 보고서 생성 요청"):
         # 데이터 요약 문자열로 구성
-        summary = df.describe(include="all").to_string()
+        summary = profile.describe_text
 
         # 프롬프트 템플릿 설정
         report_prompt = PromptTemplate(
@@ -61,21 +61,15 @@ if uploaded_file:
         )
 
         prompt = report_prompt.format(summary=summary)
-        report = llm.predict(prompt)
-
         st.markdown("---")
         st.subheader("📄 GPT 분석 보고서")
-        st.info(report)
-
-        # 보고서를 txt로 저장할 수 있도록 처리
-        with tempfile.NamedTemporaryFile(delete=False, mode="w", suffix=".txt") as tmp_file:
-            tmp_file.write(report)
-            tmp_path = tmp_file.name
-
-        with open(tmp_path, "rb") as file:
-            st.download_button(
-                label="📥 분석 보고서 다운로드 (.txt)",
-                data=file,
-                file_name="GPT_분석_보고서.txt",
-                mime="text/plain"
-            )
+        report, timing = write_stream(llm, prompt, label="excelReportGenerator")  # 토큰 단위로 바로 출력
+        st.caption(timing.describe())
+
+        # 보고서를 txt로 저장할 수 있도록 처리 (📎 임시 파일 없이 메모리에서 바로)
+        st.download_button(
+            label="📥 분석 보고서 다운로드 (.txt)",
+            data=report.encode("utf-8"),
+            file_name="GPT_분석_보고서.txt",
+            mime="text/plain"
+        )
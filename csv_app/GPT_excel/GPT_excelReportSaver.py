@@ -1,19 +1,17 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
-from langchain.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
-from dotenv import load_dotenv
 import os
+import sys
 import io
 
-# 환경 변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.charts import render_chart
+from ai_core.ingest import load_excel, source_hash
+from ai_core.llm_client import get_chat_model
+from ai_core.streaming import write_stream
 
 # GPT 모델 설정
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.2, model_name="gpt-3.5-turbo")
+llm = get_chat_model()
 
 # Streamlit 설정
 st.set_page_config(page_title="📑 GPT 자동 보고서 생성기", page_icon="📝")
@@ -24,7 +22,7 @@ st.markdown("엑셀 데이터를 기반으로 차트와 해석 내용을 보고
 uploaded_file = st.file_uploader("📁 엑셀 파일을 업로드하세요", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df = load_excel(uploaded_file)
     st.subheader("📄 데이터 미리보기")
     st.dataframe(df.head())
 
@@ -36,18 +34,8 @@ if uploaded_file:
     y_col = st.selectbox("🟣 Y축", df.columns)
 
     if st.button("📊 시각화 및 보고서 생성"):
-        fig, ax = plt.subplots()
-
-        if chart_type == "바 차트":
-            sns.barplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "선 차트":
-            sns.lineplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "원형 차트":
-            df_grouped = df.groupby(x_col)[y_col].sum()
-            ax.pie(df_grouped, labels=df_grouped.index, autopct="%1.1f%%")
-            ax.set_ylabel("")
-
-        st.pyplot(fig)
+        # 같은 파일·차트 선택이면 다시 그리지 않고 캐시된 그림을 사용
+        st.image(render_chart(df, source_hash(uploaded_file), chart_type, x=x_col, y=y_col))
 
         # GPT 해석 요청
         prompt_template = PromptTemplate(
@@ -63,10 +51,9 @@ if uploaded_file:
 """
         )
         prompt = prompt_template.format(x=x_col, y=y_col, type=chart_type)
-        interpretation = llm.predict(prompt)
-
         st.subheader("🧠 GPT 해석 결과")
-        st.info(interpretation)
+        interpretation, timing = write_stream(llm, prompt, label="excelReportSaver")  # 토큰 단위로 바로 출력
+        st.caption(timing.describe())
 
         # 보고서 저장
         st.markdown("---")
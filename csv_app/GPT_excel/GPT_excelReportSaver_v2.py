@@ -1,21 +1,19 @@
 # 📄 보고서 자동 저장 + 다운로드 개선 코드
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
-from langchain.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
-from dotenv import load_dotenv
 import os
+import sys
 from io import BytesIO
 from datetime import datetime
 
-# 🌱 환경 변수 로드
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # 📦 ai_core 공유 모듈 경로
+from ai_core.charts import render_chart
+from ai_core.ingest import load_excel, source_hash
+from ai_core.llm_client import get_chat_model
+from ai_core.streaming import write_stream
 
 # 🤖 GPT 모델 설정
-llm = ChatOpenAI(openai_api_key=api_key, temperature=0.2, model_name="gpt-3.5-turbo")
+llm = get_chat_model()
 
 # 🖥️ Streamlit UI 설정
 st.set_page_config(page_title="📊 GPT 엑셀 자동 보고서 저장기", page_icon="📥")
@@ -26,7 +24,7 @@ st.markdown("엑셀 데이터를 분석하여 GPT가 자동 보고서를 작성
 uploaded_file = st.file_uploader("📁 엑셀 파일을 업로드하세요", type=["xlsx"])
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    df = load_excel(uploaded_file)
     st.subheader("📋 데이터 미리보기")
     st.dataframe(df.head())
 
@@ -37,17 +35,8 @@ if uploaded_file:
 
     if st.button("📈 분석 및 보고서 생성"):
         # 📊 시각화
-        fig, ax = plt.subplots()
-        if chart_type == "바 차트":
-            sns.barplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "선 차트":
-            sns.lineplot(data=df, x=x_col, y=y_col, ax=ax)
-        elif chart_type == "원형 차트":
-            df_grouped = df.groupby(x_col)[y_col].sum()
-            ax.pie(df_grouped, labels=df_grouped.index, autopct="%1.1f%%")
-            ax.set_ylabel("")
-
-        st.pyplot(fig)
+        # 같은 파일·차트 선택이면 다시 그리지 않고 캐시된 그림을 사용
+        st.image(render_chart(df, source_hash(uploaded_file), chart_type, x=x_col, y=y_col))
 
         # 🔮 GPT 해석
         prompt_template = PromptTemplate(
@@ -61,7 +50,10 @@ if uploaded_file:
             """
         )
         prompt = prompt_template.format(x=x_col, y=y_col, type=chart_type)
-        gpt_result = llm.predict(prompt)
+        # 토큰 단위로 화면에 먼저 보여주고, 같은 내용을 보고서에 저장
+        st.markdown("🧠 **GPT 요약:**")
+        gpt_result, timing = write_stream(llm, prompt, label="excelReportSaver_v2")
+        st.caption(timing.describe())
 
         # 📝 보고서 저장 (줄바꿈 포함)
         now = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -86,4 +78,3 @@ Y축: {y_col}
 
         st.markdown("---")
         st.markdown(f"📎 **파일명**: `{report_filename}`")
-        st.markdown(f"🧠 **GPT 요약:** {gpt_result}")
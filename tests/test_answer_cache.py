@@ -0,0 +1,54 @@
+# 🧪 ai_core.answer_cache: 핵심어가 다른 질문은 유사도가 높아도 재사용하지 않음
+
+import sqlite3
+
+import pytest
+
+from ai_core.answer_cache import AnswerCache, question_terms
+
+
+class NearlySameEmbeddings:
+    """ada-002 처럼 짧은 한국어 질문끼리는 모두 0.99 이상으로 비슷한 벡터를 돌려주는 가짜 임베딩."""
+
+    def embed_query(self, text):
+        return [1.0, 0.0, 0.01 * (len(text) % 3)]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnswerCache(NearlySameEmbeddings(), db_path=str(tmp_path / "answers.sqlite3"))
+
+
+def _ask(cache, question, answer):
+    return cache.cached_call(lambda: answer, f"데이터 요약...\n질문: {question}", question=question, context="sales.csv")
+
+
+def test_question_terms_drop_particles_and_fillers():
+    assert question_terms("서울의 평균 매출은 뭐야?") == question_terms("서울 평균 매출 알려줘") == "서울 평균 매출"
+    assert question_terms("2023년 상위 5개 지점은?") != question_terms("2023년 상위 3개 지점은?")
+
+
+def test_different_key_terms_are_not_reused(cache):
+    assert _ask(cache, "서울 평균 매출은?", "서울 평균") == "서울 평균"
+    assert _ask(cache, "부산 평균 매출은?", "부산 평균") == "부산 평균"
+    assert _ask(cache, "서울 합계 매출은?", "서울 합계") == "서울 합계"
+    assert cache.last_hit is None
+
+    assert _ask(cache, "서울의 평균 매출은 뭐야?", "새 답") == "서울 평균"
+    assert cache.last_hit == "semantic"
+    stats = cache.stats()
+    assert (stats["hits_semantic"], stats["misses"], stats["entries"]) == (1, 3, 3)
+
+
+def test_old_database_gets_terms_column(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE answers (key TEXT PRIMARY KEY, context TEXT NOT NULL, vector BLOB, answer TEXT NOT NULL,"
+        " elapsed REAL NOT NULL, created REAL NOT NULL, last_access REAL NOT NULL)"
+    )
+    conn.commit()
+    conn.close()
+    cache = AnswerCache(NearlySameEmbeddings(), db_path=path)
+    assert _ask(cache, "서울 평균 매출은?", "서울 평균") == "서울 평균"
+    assert _ask(cache, "서울의 평균 매출은?", "새 답") == "서울 평균"
@@ -0,0 +1,70 @@
+# 🧪 ai_core.batch_report: 차트 컬럼 선택 / 일부 절 실패 시트의 이어 실행
+
+import json
+import os
+
+import pandas as pd
+
+from ai_core import batch_report
+from ai_core.batch_report import MANIFEST_FILE, _finished, load_manifest, pick_columns, plan_tasks, run_sheet, summarize
+from ai_core.paths import ROOT_DIR
+from ai_core.profile import DatasetProfile
+from ai_core.report_engine import Report, Section, SectionResult
+
+WORKBOOK = os.path.join(ROOT_DIR, "csv_app", "sample_data", "샘플)더존비즈온_2024_Q4_판매데이터.xlsx")
+OPTIONS = {"chart": "바 차트", "x": None, "y": None, "llm": True, "concurrency": 2}
+
+
+def _pick(df, **options):
+    return pick_columns(df, DatasetProfile(df), options)
+
+
+def test_pick_columns_defaults_to_text_x_and_numeric_y():
+    df = pd.DataFrame({"지점": ["서울", "부산", "대구"], "매출": [1, 2, 3], "수량": [3, 1, 2]})
+    x, y, scatter = _pick(df)
+    assert (x, y) == ("지점", "매출")
+    assert set(scatter) == {"매출", "수량"}
+
+
+def test_pick_columns_never_plots_a_column_against_itself():
+    df = pd.DataFrame({"지점": ["서울", "부산", "대구"], "매출": [1, 2, 3]})
+    assert _pick(df, x="매출")[:2] == ("지점", "매출")
+    assert _pick(df, x="매출", y="매출")[:2] == ("지점", "매출")
+
+    only_numeric = pd.DataFrame({"매출": [1, 2, 3]})
+    x, y, scatter = _pick(only_numeric)
+    assert x is None and y == "매출" and scatter is None
+
+
+def _fake_report(failed):
+    results = [SectionResult(Section("overview", "개요", ""), "요약 본문", attempts=1)]
+    if failed:
+        results.append(SectionResult(Section("trend", "추세", ""), "⚠️ 이 절은 생성하지 못했습니다", attempts=3,
+                                     error="TimeoutError: 응답 없음"))
+    return Report("전문가 보고서", "머리말", results, None, 0.1)
+
+
+def _run(tmp_path, monkeypatch, failed):
+    monkeypatch.setattr(batch_report, "get_chat_model", lambda *args, **kwargs: None)
+    monkeypatch.setattr(batch_report, "expert_report", lambda llm, context, **kwargs: _fake_report(failed))
+    tasks, failures = plan_tasks([(WORKBOOK, "sample")], OPTIONS)
+    assert tasks and not failures
+    record = run_sheet(tasks[0], OPTIONS, str(tmp_path))
+    with open(tmp_path / MANIFEST_FILE, "a", encoding="utf-8") as log:
+        log.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return tasks[0], record
+
+
+def test_sheet_with_failed_section_is_partial_and_regenerated(tmp_path, monkeypatch):
+    task, record = _run(tmp_path, monkeypatch, failed=True)
+    assert record["status"] == "partial"
+    assert record["failed_sections"] == 1 and "추세" in record["error"]
+    assert (tmp_path / task["pdf"]).exists()  # 안내 문구가 든 PDF 는 남음
+    assert not _finished(load_manifest(str(tmp_path))[task["key"]], str(tmp_path))
+
+    totals = summarize([record], OPTIONS, 1, 1.0)["totals"]
+    assert totals["partial"] == 1 and totals["done"] == 0
+
+    task, record = _run(tmp_path, monkeypatch, failed=False)  # 다시 실행해서 모든 절이 생성되면 완료
+    assert record["status"] == "done"
+    assert _finished(load_manifest(str(tmp_path))[task["key"]], str(tmp_path))
@@ -0,0 +1,24 @@
+# 🧪 ai_core.charts / downsample: 같은 컬럼을 X 와 Y 로 고른 차트
+
+import pandas as pd
+import pytest
+
+from ai_core.charts import clear_cache, render_chart
+from ai_core.downsample import aggregate
+
+DF = pd.DataFrame({"지역": ["서울", "부산", "서울", "대구", "부산"], "판매량": [1, 2, 3, 1, 2]})
+
+
+def test_aggregate_keeps_key_and_mean_columns_apart():
+    table = aggregate(DF, "판매량", "판매량", value_name="평균")
+    assert list(table.columns) == ["판매량", "평균", "count", "err"]
+    assert table["판매량"].tolist() == table["평균"].tolist() == [1, 2, 3]
+    with pytest.raises(ValueError):
+        aggregate(DF, "판매량", "판매량")
+
+
+@pytest.mark.parametrize("kind", ["바 차트", "선 차트", "원형 차트", "산점도"])
+def test_render_chart_with_same_x_and_y(kind):
+    clear_cache()
+    image = render_chart(DF, f"same-xy-{kind}", kind, x="판매량", y="판매량", image_format="svg")
+    assert image.lstrip().startswith(b"<?xml")
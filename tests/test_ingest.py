@@ -0,0 +1,48 @@
+# 🧪 ai_core.ingest: CSV 압축 로딩 dtype / 엑셀 컬럼형 캐시
+
+import io
+import os
+import time
+
+import pandas as pd
+
+from ai_core import ingest
+from ai_core.ingest import load_excel, read_csv_compact
+
+CSV = "제품명,지역,단가,판매량,할인율\n" + "".join(
+    f"노트북,{region},{1_500_000 + i},{2_000 + i},0.1\n" for i, region in enumerate(["서울", "부산", "서울", "대구"] * 25)
+)
+
+
+def test_compact_csv_keeps_arithmetic_of_read_csv():
+    df = read_csv_compact(io.BytesIO(CSV.encode()), chunk_rows=30)
+    plain = pd.read_csv(io.BytesIO(CSV.encode()))
+    revenue = df["단가"] * df["판매량"]
+    assert revenue.min() > 2**31  # int32 였다면 조용히 넘쳐 음수 / 엉뚱한 값
+    pd.testing.assert_series_equal(revenue, plain["단가"] * plain["판매량"])
+    assert (df["단가"] * df["할인율"]).equals(plain["단가"] * plain["할인율"])
+    assert df["지역"].dtype == "category" and df["지역"].cat.categories.size == 3
+
+
+def test_columnar_cache_keeps_original_column_labels(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "COLUMNAR_DIR", str(tmp_path))
+    path = str(tmp_path / "years.xlsx")
+    pd.DataFrame({"지점": ["서울", "부산"], 2023: [1, 2], 2024: [3, 4]}).to_excel(path, index=False)
+
+    first = load_excel(path)
+    ingest.clear_cache()
+    cached = load_excel(path)  # 이번에는 .arrow 에서
+    assert list(first.columns) == list(cached.columns) == ["지점", 2023, 2024]
+    assert cached[2023].tolist() == [1, 2]
+    ingest.clear_cache()
+    assert list(load_excel(path, columns=[2024, "지점"]).columns) == [2024, "지점"]
+
+
+def test_prune_columnar_removes_old_workbooks(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "COLUMNAR_DIR", str(tmp_path))
+    for name, age in (("old", 30), ("new", 0)):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "sheet.arrow").write_bytes(b"x" * 100)
+        os.utime(tmp_path / name, (time.time() - age * 24 * 3600,) * 2)
+    assert ingest.prune_columnar() == (1, 100)
+    assert os.listdir(tmp_path) == ["new"]
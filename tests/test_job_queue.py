@@ -0,0 +1,57 @@
+# 🧪 ai_core.job_queue: 작업 데이터 파일 삭제 / 오래된 작업 정리
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from ai_core import job_queue
+
+DF = pd.DataFrame({"지역": ["서울", "부산"], "판매량": [1, 2]})
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    monkeypatch.setattr(job_queue, "DB_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(job_queue, "DATA_DIR", str(data_dir))
+    monkeypatch.setattr(job_queue, "_schema_ready", False)
+    monkeypatch.setattr(job_queue, "start_workers", lambda count=None: None)
+    monkeypatch.setattr(job_queue, "_resolve", lambda kind: lambda job: {"rows": len(job.load_data())})
+    return data_dir
+
+
+def _submit(chart):
+    return job_queue.submit_job("excel_pdf", {"data_key": "k" * 40, "chart_type": chart}, df=DF)
+
+
+def test_data_file_removed_when_last_job_using_it_finishes(queue):
+    first, second = _submit("바 차트"), _submit("선 차트")
+    assert len(os.listdir(queue)) == 1  # 같은 데이터는 한 번만
+
+    job_queue.run_job(job_queue._claim())
+    assert len(os.listdir(queue)) == 1  # 두 번째 작업이 아직 기다림
+    job_queue.run_job(job_queue._claim())
+    assert os.listdir(queue) == []
+    assert job_queue.get_job(first).result == job_queue.get_job(second).result == {"rows": 2}
+
+    assert _submit("바 차트") == first  # 이미 끝난 작업은 다시 넣지 않고 데이터도 쓰지 않음
+    assert os.listdir(queue) == []
+
+
+def test_prune_jobs_drops_old_rows_and_orphaned_data(queue):
+    done = _submit("바 차트")
+    job_queue.run_job(job_queue._claim())
+    job_queue._update(done, finished=time.time() - 30 * 24 * 3600)
+    waiting = _submit("선 차트")
+    (queue / "orphan.pkl").write_bytes(b"x" * 10)
+    os.utime(queue / "orphan.pkl", (time.time() - 30 * 24 * 3600,) * 2)
+
+    deleted, removed, _ = job_queue.prune_jobs()
+    assert (deleted, removed) == (1, 1)
+    assert job_queue.get_job(done) is None
+    assert job_queue.get_job(waiting).active
+    assert os.listdir(queue) == [f"{'k' * 32}.pkl"]  # 기다리는 작업의 데이터는 용량을 넘어도 남김
+    assert job_queue.prune_jobs(max_bytes=0)[1] == 0
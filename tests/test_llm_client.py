@@ -0,0 +1,40 @@
+# 🧪 ai_core.llm_client: 모든 프로필이 실제 langchain / openai 로 만들어지고 공용 연결 풀을 쓰는지
+
+import httpx
+import pytest
+
+pytest.importorskip("langchain_community")  # 실제 langchain 이 설치된 환경에서만
+pytest.importorskip("openai")
+
+from ai_core import llm_client  # noqa: E402
+
+
+@pytest.fixture
+def fresh_clients(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(llm_client, "_instances", {})
+    monkeypatch.setattr(llm_client, "_http_client", None)
+    monkeypatch.setattr(llm_client, "_async_http_client", None)
+
+
+@pytest.mark.parametrize("profile", list(llm_client.MODEL_REGISTRY))
+def test_every_profile_builds(fresh_clients, profile):
+    model = llm_client._get(profile)
+    assert model is llm_client._get(profile)
+    assert model.client is not None and model.async_client is not None
+
+
+def test_chat_model_calls_go_through_shared_pool(fresh_clients, monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-3.5-turbo",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "안녕하세요"}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        })
+
+    monkeypatch.setattr(llm_client, "_http_client", httpx.Client(transport=httpx.MockTransport(handler)))
+    assert llm_client.get_chat_model("agent").invoke("hi").content == "안녕하세요"
+    assert len(requests) == 1 and requests[0].url.path.endswith("/chat/completions")
@@ -0,0 +1,40 @@
+# 🧪 ai_core.query_planner 패턴 경로: 집계 / 순위 표현 인식
+
+import pandas as pd
+
+from ai_core.query_planner import HIGHEST, _mentions, plan_by_pattern
+
+DF = pd.DataFrame({
+    "team": ["a", "b", "a", "c"],
+    "region": ["서울", "부산", "서울", "대구"],
+    "sales": [10, 20, 30, 40],
+    "총매출": [100, 200, 300, 400],
+})
+
+
+def test_english_keywords_need_word_boundaries():
+    assert not _mentions("which country", ["count"])
+    assert not _mentions("admin page", ["min"])
+    assert not _mentions("the meaning", ["mean"])
+    assert not _mentions("consumer summary", ["sum"])
+    assert not _mentions("almost done", HIGHEST)
+    assert _mentions("sales의 sum은?", ["sum"])
+    assert _mentions("totals per team", ["total"])
+
+
+def test_substring_words_do_not_pick_aggregate():
+    assert plan_by_pattern("total sales of the account team", DF)["agg"] == "sum"
+    assert plan_by_pattern("admin average sales", DF)["agg"] == "mean"
+    assert plan_by_pattern("sales summary", DF) is None
+    assert plan_by_pattern("meaning of sales", DF) is None
+
+
+def test_column_name_words_are_not_keywords():
+    plan = plan_by_pattern("총매출의 최대값은?", DF)
+    assert plan["agg"] == "max"
+    assert plan["column"] == "총매출"
+
+
+def test_korean_keywords_still_match():
+    plan = plan_by_pattern("region별 총 sales 는?", DF)
+    assert (plan["agg"], plan["column"], plan["group_by"]) == ("sum", "sales", "region")
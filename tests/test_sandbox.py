@@ -0,0 +1,39 @@
+# 🧪 ai_core.sandbox: 데이터 사본 정리 / 작업자 실행
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from ai_core import sandbox
+
+DF = pd.DataFrame({"지역": ["서울", "부산", "대구"], "판매량": [10, 20, 30]})
+
+
+@pytest.fixture
+def snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(sandbox, "SANDBOX_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_old_snapshots_are_pruned_and_republished(snapshots):
+    path = sandbox.publish_frame(DF, "a" * 64)
+    stale = sandbox.publish_frame(DF, "b" * 64)
+    os.utime(stale, (time.time() - 30 * 24 * 3600,) * 2)
+    os.utime(path, (time.time() - 30 * 24 * 3600,) * 2)
+    assert sandbox.publish_frame(DF, "a" * 64) == path  # 다시 쓰면 사용 시각만 갱신
+
+    assert sandbox.prune_snapshots() == (1, os.path.getsize(path))
+    assert os.listdir(snapshots) == [os.path.basename(path)]
+    assert sandbox.publish_frame(DF, "b" * 64) == stale and os.path.exists(stale)  # 정리된 사본은 다시 씀
+
+
+def test_worker_runs_code_that_writes_into_df(snapshots):
+    pool = sandbox.Sandbox(workers=1)
+    try:
+        path = sandbox.publish_frame(DF, "c" * 64)
+        assert pool.run("c" * 64, path, "df.loc[0, '판매량'] = 99\ndf['판매량'].sum()") == "149"
+        assert pool.run("c" * 64, path, "df['판매량'].max()") == "99"  # 다음 단계까지 변경이 유지됨
+    finally:
+        pool.close()
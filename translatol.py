@@ -1,11 +1,13 @@
 # translator.py (openai 최신 버전용)
 import os
-from openai import OpenAI
-from dotenv import load_dotenv
+import sys
 
-# .env 파일에서 API 키 로드
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))  # 📦 ai_core 공유 모듈 경로
+from ai_core.llm_client import get_openai_client, model_config
+
+# 공용 연결 풀을 쓰는 OpenAI 클라이언트 (.env 의 API 키 사용)
+client = get_openai_client()
+TRANSLATE_CONFIG = model_config("translate")
 
 # 입력 언어 자동 감지
 def detect_language(text):
@@ -20,8 +22,11 @@ def translate_with_gpt(text):
     dest_lang = "en" if src_lang == "ko" else "ko"
     prompt = f"다음 문장을 '{dest_lang}' 언어로 번역해줘:\n\n{text}"
 
+    # temperature 는 프로필에 있을 때만 보냄 (없으면 서버 기본값)
+    options = {"temperature": TRANSLATE_CONFIG["temperature"]} if "temperature" in TRANSLATE_CONFIG else {}
     response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
+        model=TRANSLATE_CONFIG["model"],
+        **options,
         messages=[
             {"role": "user", "content": prompt}
         ]